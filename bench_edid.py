@@ -0,0 +1,57 @@
+import sys
+import os
+import glob
+import timeit
+
+# Ensure we can find our src
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from edid import parse_edid
+
+# Expected decode results for the sample corpus: (manufacturer, model, is_internal)
+EXPECTED = {
+    "lg_27ul950_dp.bin": ("GSM", "LG HDR 4K", False),
+    "dell_u2720q_hdmi.bin": ("DEL", "DELL U2720Q", False),
+    "lgd_laptop_edp.bin": ("LGD", "LP140WF7-SPB1", True),
+    "boe_laptop_bare.bin": ("BOE", "BOE0747", True),
+    "samsung_vga_edid13.bin": ("SAM", "SyncMaster", False),
+    "benq_ew2780u_cea.bin": ("BNQ", "BenQ EW2780U", False),
+}
+
+
+def bench_edid(corpus_dir, iterations=10000):
+    paths = sorted(glob.glob(os.path.join(corpus_dir, "*.bin")))
+    if not paths:
+        print(f"No EDID samples found in {corpus_dir}")
+        return False
+
+    ok = True
+    print(f"Parsing {len(paths)} EDID samples from {corpus_dir}")
+    for path in paths:
+        name = os.path.basename(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        try:
+            info = parse_edid(data)
+        except ValueError as e:
+            print(f"  {name}: FAILED ({e})")
+            ok = False
+            continue
+
+        per_parse = timeit.timeit(lambda: parse_edid(data), number=iterations) / iterations
+        print(f"  {name}: {info['manufacturer']} '{info['model']}' serial={info['serial'] or '-'} "
+              f"internal={info['is_internal']} checksum_ok={info['checksum_ok']} "
+              f"-> {per_parse * 1e6:.1f} us/parse")
+
+        expected = EXPECTED.get(name)
+        if expected and (info['manufacturer'], info['model'], info['is_internal']) != expected:
+            print(f"    MISMATCH: expected {expected}")
+            ok = False
+
+    return ok
+
+
+if __name__ == "__main__":
+    corpus = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "samples", "edid")
+    sys.exit(0 if bench_edid(corpus) else 1)
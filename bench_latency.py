@@ -0,0 +1,362 @@
+import sys
+import os
+import argparse
+import json
+import logging
+import math
+import platform
+import shutil
+import tempfile
+import threading
+import time
+
+# Ensure we can find our src
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+# Keep the benchmark's capabilities cache and learned settle times away from the real ones
+BENCH_CACHE = tempfile.mkdtemp(prefix="kvm-bench-cache-")
+os.environ["XDG_CACHE_HOME"] = BENCH_CACHE
+os.environ["LOCALAPPDATA"] = BENCH_CACHE
+
+from ddc_linux import SET_VCP_CMD
+from ddc_emulator import EmulatedDisplaySetup, EmulatedMonitor
+from edid import build_edid
+from monitor_utils import MonitorManager
+from retry_policy import RetryPolicy
+
+CAPABILITIES = ("(prot(monitor)type(LCD)model(BENCH)cmds(01 02 03 07 0C E3 F3)"
+                "vcp(02 04 05 10 12 14(05 08 0B) 60(0F 11 12 1B) D6(01 04 05))mccs_ver(2.1))")
+SOURCES = (0x11, 0x12)  # HDMI-1 / HDMI-2
+
+
+class TimedMonitor(EmulatedMonitor):
+    """
+    Emulated monitor that timestamps every Set VCP it receives, so we can measure
+    when a switch actually reaches the display rather than when an API call returns.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.write_event = threading.Event()
+        self.last_write = None
+
+    def _handle_command(self, payload: bytes):
+        super()._handle_command(payload)
+        if payload[0] == SET_VCP_CMD:
+            self.last_write = time.perf_counter()
+            self.write_event.set()
+
+
+class ThreadSampler:
+    """
+    Samples threading.active_count() in the background to find the peak during a run.
+    """
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.peak = threading.active_count()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        # Don't count the sampler itself
+        self.peak -= 1
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, threading.active_count())
+            self._stop.wait(self.interval)
+
+
+def percentile(values, pct):
+    # Nearest-rank percentile
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(seconds):
+    """
+    Latency summary in milliseconds.
+    """
+    ms = [s * 1000.0 for s in seconds]
+    if not ms:
+        return {'count': 0, 'p50': None, 'p95': None, 'p99': None, 'mean': None, 'max': None}
+    return {
+        'count': len(ms),
+        'p50': round(percentile(ms, 50), 3),
+        'p95': round(percentile(ms, 95), 3),
+        'p99': round(percentile(ms, 99), 3),
+        'mean': round(sum(ms) / len(ms), 3),
+        'max': round(max(ms), 3),
+    }
+
+
+def report(message):
+    # Progress goes to stderr so stdout stays pure JSON
+    print(message, file=sys.stderr)
+
+
+def make_setup(root, count, args):
+    setup = EmulatedDisplaySetup(os.path.join(root, f"drm-{count}"), args.latency, args.failure_rate, args.seed)
+    for i in range(count):
+        edid = build_edid('GSM', 0x5B00 + i, i + 1, name=f"Bench {i}", interface=5)
+        monitor = TimedMonitor(edid, CAPABILITIES, {0x60: (0x0F, 0x1B), 0x10: (50, 100)},
+                               settle_time=args.settle_time)
+        setup.add_monitor(f"card0-DP-{i + 1}", 10 + i, monitor)
+    return setup
+
+
+def use_setup(setup):
+    # Fresh backend, cold capabilities cache and no learned timing, so runs don't bleed into each other
+    MonitorManager.set_backend(setup.backend())
+    MonitorManager.RETRY_POLICY = RetryPolicy()
+    MonitorManager.get_caps_cache().invalidate()
+
+
+def emulated_monitor(setup, monitor_obj):
+    return setup.buses[monitor_obj.vcp.bus]
+
+
+def next_source(setup, mon):
+    # Always the input the monitor is not on, so every switch really writes
+    current = emulated_monitor(setup, mon['monitor_obj']).vcp[0x60][0]
+    return SOURCES[1] if current == SOURCES[0] else SOURCES[0]
+
+
+def wait_settled(monitors):
+    verifier = MonitorManager.get_verifier()
+    for m in monitors:
+        verifier.wait_settled(MonitorManager._monitor_key(m['monitor_obj']), 15.0)
+
+
+def wait_verifying(mon, source, timeout=1.0):
+    # A queued switch registers its verification only after the write returned; until then
+    # wait_settled() has nothing to wait for and the next switch would hit a re-syncing monitor
+    verifier = MonitorManager.get_verifier()
+    key = MonitorManager._monitor_key(mon['monitor_obj'])
+    deadline = time.perf_counter() + timeout
+    while verifier.get_pending_target(key) != source and time.perf_counter() < deadline:
+        time.sleep(0.001)
+
+
+def bench_scan(root, counts, args):
+    results = []
+    for count in counts:
+        setup = make_setup(root, count, args)
+        use_setup(setup)
+
+        with ThreadSampler() as sampler:
+            start = time.perf_counter()
+            monitors = MonitorManager.get_connected_monitors()
+            cold = time.perf_counter() - start
+
+            warm = []
+            for _ in range(args.scan_repeats):
+                start = time.perf_counter()
+                MonitorManager.get_connected_monitors()
+                warm.append(time.perf_counter() - start)
+
+            # Periodic rescans in the tray: nothing changed, only current sources are re-read
+            incremental = []
+            for _ in range(args.scan_repeats):
+                start = time.perf_counter()
+                MonitorManager.get_connected_monitors(incremental=True)
+                incremental.append(time.perf_counter() - start)
+
+        results.append({
+            'monitors': count,
+            'found': len(monitors),
+            'cold_ms': round(cold * 1000.0, 3),
+            'warm': summarize(warm),
+            'incremental': summarize(incremental),
+            'peak_threads': sampler.peak,
+        })
+        report(f"scan: {count} monitors -> found {len(monitors)}, cold {cold * 1000:.0f} ms, "
+               f"warm p50 {results[-1]['warm']['p50']} ms, incremental p50 {results[-1]['incremental']['p50']} ms, "
+               f"peak threads {sampler.peak}")
+    return results
+
+
+def bench_set_input_source(setup, monitors, args):
+    """
+    Direct MonitorManager.set_input_source() calls: time until the call returns.
+    """
+    durations = []
+    failures = 0
+    for i in range(args.iterations):
+        mon = monitors[i % len(monitors)]
+        source = next_source(setup, mon)
+        start = time.perf_counter()
+        try:
+            MonitorManager.set_input_source(mon['monitor_obj'], source)
+            durations.append(time.perf_counter() - start)
+        except Exception:
+            failures += 1
+        wait_settled([mon])
+    return durations, failures
+
+
+def bench_hotkey(setup, monitors, args):
+    """
+    KVMApp.on_hotkey_switch() as the hotkey listener calls it: time until the Set VCP reaches the display.
+    Returns (latencies, failures). Exits if the tray module can't be loaded, rather than
+    reporting a run without the figure the regression check cares most about.
+    """
+    try:
+        import pystray  # noqa: F401
+    except Exception as e:
+        # pystray needs a desktop session (e.g. an X display) just to import
+        from bench_startup import install_null_tray
+        report(f"No system tray here ({e.__class__.__name__}); using a null tray")
+        install_null_tray()
+    try:
+        from kvm_tray import KVMApp
+    except Exception as e:
+        raise SystemExit(f"Hotkey benchmark failed: tray app unavailable: {e!r}")
+
+    # The constructor only sets up state; the scanner, hot-plug and hotkey threads start with run()
+    app = KVMApp()
+    app.monitors = monitors
+    app.first_scan_done.set()
+
+    latencies = []
+    failures = 0
+    for i in range(args.iterations):
+        mon = monitors[i % len(monitors)]
+        source = next_source(setup, mon)
+        target = emulated_monitor(setup, mon['monitor_obj'])
+        target.write_event.clear()
+
+        start = time.perf_counter()
+        app.on_hotkey_switch(mon['id'], source)
+        if target.write_event.wait(args.timeout):
+            latencies.append(target.last_write - start)
+            wait_verifying(mon, source)
+        else:
+            failures += 1
+        wait_settled([mon])
+    app.rescan_debouncer.cancel()
+    return latencies, failures
+
+
+def bench_switch(root, args):
+    setup = make_setup(root, args.switch_monitors, args)
+    use_setup(setup)
+    monitors = MonitorManager.get_connected_monitors()
+    if not monitors:
+        report("No emulated monitors detected; cannot benchmark switching")
+        return {}
+
+    with ThreadSampler() as sampler:
+        durations, api_failures = bench_set_input_source(setup, monitors, args)
+        hotkey = bench_hotkey(setup, monitors, args)
+
+    result = {
+        'monitors': len(monitors),
+        'set_input_source': dict(summarize(durations), failures=api_failures),
+        'hotkey_to_write': dict(summarize(hotkey[0]), failures=hotkey[1]),
+        'peak_threads': sampler.peak,
+    }
+    report(f"set_input_source: {result['set_input_source']}")
+    report(f"hotkey -> VCP write: {result['hotkey_to_write']}")
+    return result
+
+
+def regressions(current, baseline, tolerance):
+    """
+    Compares the latency figures that matter against a previous run.
+    Returns a list of human-readable regressions (empty if none).
+    """
+    checks = []
+    for name in ('set_input_source', 'hotkey_to_write'):
+        for stat in ('p50', 'p95'):
+            checks.append((f"switch.{name}.{stat}",
+                           (current.get('switch', {}).get(name) or {}).get(stat),
+                           (baseline.get('switch', {}).get(name) or {}).get(stat)))
+    baseline_scans = {s['monitors']: s for s in baseline.get('scan', [])}
+    for scan in current.get('scan', []):
+        old = baseline_scans.get(scan['monitors'])
+        if old:
+            checks.append((f"scan[{scan['monitors']}].warm.p50", scan['warm']['p50'], old['warm']['p50']))
+            if 'incremental' in old:
+                checks.append((f"scan[{scan['monitors']}].incremental.p50",
+                               scan['incremental']['p50'], old['incremental']['p50']))
+            checks.append((f"scan[{scan['monitors']}].cold_ms", scan['cold_ms'], old['cold_ms']))
+
+    found = []
+    for name, now, before in checks:
+        if now is None or not before:
+            continue
+        if now > before * (1 + tolerance):
+            found.append(f"{name}: {now:.1f} ms vs {before:.1f} ms baseline (+{(now / before - 1) * 100:.0f}%)")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hotkey-to-DDC latency and scan benchmarks against emulated monitors.")
+    parser.add_argument("--iterations", type=int, default=40, help="switches per benchmark (default 40)")
+    parser.add_argument("--monitors", default="1,2,4,8", help="monitor counts for the scan benchmark")
+    parser.add_argument("--switch-monitors", type=int, default=2, help="monitors used for switch benchmarks")
+    parser.add_argument("--scan-repeats", type=int, default=10, help="warm scans per monitor count")
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds added to every I2C transfer")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of I2C transfers failing with EIO")
+    parser.add_argument("--settle-time", type=float, default=0.0, help="seconds a monitor ignores DDC after a switch")
+    parser.add_argument("--seed", type=int, default=1, help="seed for injected failures")
+    parser.add_argument("--timeout", type=float, default=10.0, help="give up on a switch after this many seconds")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="previous JSON results; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (default 0.25)")
+    parser.add_argument("--verbose", action="store_true", help="show the app's own logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    counts = [int(c) for c in args.monitors.split(",") if c.strip()]
+
+    root = tempfile.mkdtemp(prefix="kvm-bench-drm-")
+    try:
+        switch = bench_switch(root, args)
+        scan = bench_scan(root, counts, args)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        shutil.rmtree(BENCH_CACHE, ignore_errors=True)
+
+    results = {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'config': {k: v for k, v in vars(args).items() if k not in ('output', 'baseline', 'verbose')},
+        },
+        'switch': switch,
+        'scan': scan,
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        found = regressions(results, baseline, args.tolerance)
+        for line in found:
+            report(f"REGRESSION {line}")
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+import sys
+import os
+import argparse
+import json
+import logging
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import types
+
+# Ensure we can find our src
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+CAPABILITIES = ("(prot(monitor)type(LCD)model(BENCH)cmds(01 02 03 07 0C E3 F3)"
+                "vcp(02 04 05 10 12 14(05 08 0B) 60(0F 11 12 1B) D6(01 04 05))mccs_ver(2.1))")
+
+
+def report(message):
+    # Progress goes to stderr so stdout stays pure JSON
+    print(message, file=sys.stderr)
+
+
+def rss_mb():
+    """
+    Resident set size of this process in MB (None if the platform can't tell).
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) / 1024.0
+        except OSError:
+            return None
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize / (1024.0 * 1024.0)
+        return None
+    try:
+        import resource
+        # Peak, not current, but close enough right after startup (bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024.0 * 1024.0)
+    except ImportError:
+        return None
+
+
+def install_null_tray():
+    """
+    Stand-in for pystray where no tray/desktop session exists (CI, SSH): run(setup) calls setup
+    like the real backends do and blocks until stop(). Only used with --headless.
+    """
+    module = types.ModuleType("pystray")
+
+    class MenuItem:
+        def __init__(self, text, action=None, *args, **kwargs):
+            self.text = text
+            self.action = action
+
+    class Menu:
+        SEPARATOR = None
+
+        def __init__(self, *items):
+            self.items = items
+
+    class Icon:
+        def __init__(self, name, icon=None, title=None, menu=None, **kwargs):
+            self.name = name
+            self.icon = icon
+            self.title = title
+            self.menu = menu
+            self.visible = False
+            self._stopped = threading.Event()
+
+        def run(self, setup=None):
+            if setup:
+                threading.Thread(target=setup, args=(self,), daemon=True).start()
+            self._stopped.wait()
+
+        def stop(self):
+            self._stopped.set()
+
+        def notify(self, message, title=None):
+            pass
+
+    module.MenuItem = MenuItem
+    module.Menu = Menu
+    module.Icon = Icon
+    sys.modules["pystray"] = module
+
+
+def child(args):
+    """
+    One app start: prints {"icon_s", "ready_s", "rss_icon_mb", "rss_ready_mb", "monitors"} as JSON.
+    Times are since the parent spawned the process, so interpreter startup and imports count.
+    """
+    started = float(os.environ["KVM_BENCH_SPAWNED"])
+    if args.headless:
+        try:
+            import pystray  # noqa: F401
+        except Exception as e:
+            report(f"No system tray here ({e.__class__.__name__}); using a null tray")
+            install_null_tray()
+
+    from kvm_tray import KVMApp
+    result = {}
+
+    class BenchApp(KVMApp):
+        def _on_icon_ready(self, icon):
+            icon.visible = True
+            result['icon_s'] = time.time() - started
+            result['rss_icon_mb'] = rss_mb()
+
+            # Emulated monitors, so "ready" means a real scan of the DDC stack finished
+            from ddc_emulator import EmulatedDisplaySetup, EmulatedMonitor
+            from edid import build_edid
+            from monitor_utils import MonitorManager
+            setup = EmulatedDisplaySetup(os.path.join(os.getcwd(), "drm"), args.latency)
+            for i in range(args.monitors):
+                edid = build_edid('GSM', 0x5B00 + i, i + 1, name=f"Bench {i}", interface=5)
+                setup.add_monitor(f"card0-DP-{i + 1}", 10 + i,
+                                  EmulatedMonitor(edid, CAPABILITIES, {0x60: (0x0F, 0x1B)}))
+            MonitorManager.set_backend(setup.backend())
+
+            super()._on_icon_ready(icon)
+            ready = self.first_scan_done.wait(args.timeout)
+            result['ready_s'] = time.time() - started if ready else None
+            result['rss_ready_mb'] = rss_mb()
+            result['monitors'] = len(self.monitors)
+            self.on_exit(icon, None)
+
+    BenchApp().run()
+    print(json.dumps(result))
+    return 0
+
+
+def spawn(args, workdir):
+    env = dict(os.environ)
+    env["XDG_CACHE_HOME"] = os.path.join(workdir, "cache")
+    env["XDG_RUNTIME_DIR"] = os.path.join(workdir, "run")
+    env["LOCALAPPDATA"] = env["XDG_CACHE_HOME"]
+    os.makedirs(env["XDG_RUNTIME_DIR"], mode=0o700, exist_ok=True)
+    command = [sys.executable, os.path.abspath(__file__), "--child",
+               "--monitors", str(args.monitors), "--latency", str(args.latency), "--timeout", str(args.timeout)]
+    if args.headless:
+        command.append("--headless")
+    if args.verbose:
+        command.append("--verbose")
+
+    env["KVM_BENCH_SPAWNED"] = repr(time.time())
+    proc = subprocess.run(command, cwd=workdir, env=env, stdout=subprocess.PIPE, timeout=args.timeout + 30)
+    if proc.returncode != 0:
+        raise RuntimeError(f"app exited with code {proc.returncode}")
+    return json.loads(proc.stdout.decode('utf-8').strip().splitlines()[-1])
+
+
+def summarize(values, scale=1.0):
+    values = [v * scale for v in values if v is not None]
+    if not values:
+        return {'count': 0, 'median': None, 'min': None, 'max': None}
+    return {
+        'count': len(values),
+        'median': round(statistics.median(values), 1),
+        'min': round(min(values), 1),
+        'max': round(max(values), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-to-icon and memory footprint of the tray app at startup.")
+    parser.add_argument("--runs", type=int, default=5, help="app starts to measure (default 5)")
+    parser.add_argument("--monitors", type=int, default=2, help="emulated monitors to scan")
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds added to every I2C transfer")
+    parser.add_argument("--timeout", type=float, default=30.0, help="give up on a start after this many seconds")
+    parser.add_argument("--target-ms", type=float, default=500.0, help="median time-to-icon budget (default 500)")
+    parser.add_argument("--target-mb", type=float, default=60.0, help="median RSS budget once ready (default 60)")
+    parser.add_argument("--headless", action="store_true", help="use a null tray if no system tray is available")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--verbose", action="store_true", help="show the app's own logging")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.child:
+        return child(args)
+
+    runs = []
+    for i in range(args.runs):
+        # A fresh working directory per start: default hotkeys/scenes files, cold caches
+        workdir = tempfile.mkdtemp(prefix="kvm-bench-startup-")
+        try:
+            run = spawn(args, workdir)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        report(f"run {i + 1}: icon {run['icon_s'] * 1000:.0f} ms, "
+               f"ready {run['ready_s'] * 1000 if run['ready_s'] is not None else float('nan'):.0f} ms, "
+               f"RSS {run['rss_ready_mb'] or 0:.1f} MB")
+        runs.append(run)
+
+    results = {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'config': {k: v for k, v in vars(args).items() if k not in ('output', 'verbose', 'child')},
+        },
+        'time_to_icon_ms': summarize([r['icon_s'] for r in runs], 1000.0),
+        'time_to_ready_ms': summarize([r['ready_s'] for r in runs], 1000.0),
+        'rss_at_icon_mb': summarize([r['rss_icon_mb'] for r in runs]),
+        'rss_ready_mb': summarize([r['rss_ready_mb'] for r in runs]),
+        'runs': runs,
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    missed = []
+    icon_ms = results['time_to_icon_ms']['median']
+    rss = results['rss_ready_mb']['median']
+    if icon_ms is not None and icon_ms > args.target_ms:
+        missed.append(f"time to icon {icon_ms:.0f} ms > {args.target_ms:.0f} ms")
+    if rss is not None and rss > args.target_mb:
+        missed.append(f"RSS {rss:.1f} MB > {args.target_mb:.0f} MB")
+    for line in missed:
+        report(f"Target missed: {line}")
+    return 1 if missed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,8 +8,10 @@ rmdir /s /q dist
 del *.spec
 
 echo Building KVM Switcher...
-python -m PyInstaller --noconfirm --log-level=WARN --onefile --windowed --name "KVM Switcher" ^
+REM --onedir: a one-file exe unpacks itself to a temp folder on every start, which dominates startup time
+python -m PyInstaller --noconfirm --log-level=WARN --onedir --windowed --name "KVM Switcher" ^
     --add-data "src;src" ^
+    --add-data "src\icon.png;." ^
     --hidden-import "pynput.keyboard._win32" ^
     --hidden-import "pynput.mouse._win32" ^
     --hidden-import "PIL._tkinter_finder" ^
@@ -17,5 +19,5 @@ python -m PyInstaller --noconfirm --log-level=WARN --onefile --windowed --name "
     main.py
 
 echo Build complete!
-echo The executable is located in the 'dist' folder.
+echo The executable is located in the 'dist\KVM Switcher' folder (ship the whole folder).
 
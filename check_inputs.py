@@ -1,19 +1,23 @@
-from monitorcontrol import get_monitors
+import os
+import sys
 import time
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from monitor_utils import MonitorManager
+
 def check_inputs():
     print("Enumerating monitors...")
     try:
-        monitors = get_monitors()
+        monitors = MonitorManager.get_monitors_with_locks()
         print(f"Found {len(monitors)} monitors.")
     except Exception as e:
         print(f"Failed to get monitors: {e}")
         return
     
-    for i, monitor in enumerate(monitors):
+    for i, (monitor, lock) in enumerate(monitors):
         print(f"\nMonitor {i}:")
         try:
-            with monitor:
+            with lock, monitor:
                 try:
                     caps = monitor.get_vcp_capabilities()
                     print(f"  Capabilities: {caps}")
@@ -5,7 +5,6 @@ import os
 sys.path.append(os.path.join(os.getcwd(), 'src'))
 
 try:
-    from monitorcontrol import get_monitors
     from monitor_utils import MonitorManager
 except ImportError as e:
     print(f"Import Error: {e}")
@@ -15,11 +14,11 @@ def check_methods():
     print("Checking Monitor methods...")
     
     try:
-        monitors = get_monitors()
-        for i, m in enumerate(monitors):
+        monitors = MonitorManager.get_monitors_with_locks()
+        for i, (m, lock) in enumerate(monitors):
             print(f"\nMonitor {i}:")
             try:
-                with m:
+                with lock, m:
                     # Test get_input_source
                     try:
                         inp = m.get_input_source()
@@ -1,7 +1,11 @@
 import subprocess
 import json
 import re
-from monitorcontrol import get_monitors
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from monitor_utils import MonitorManager
 
 def get_wmi_ids():
     print("--- WMI Data ---")
@@ -53,11 +57,11 @@ def get_wmi_ids():
 
 def get_mc_monitors():
     print("\n--- MonitorControl Data ---")
-    monitors = get_monitors()
-    for i, m in enumerate(monitors):
+    monitors = MonitorManager.get_monitors_with_locks()
+    for i, (m, lock) in enumerate(monitors):
         print(f"Monitor {i}: {m}")
         try:
-            with m:
+            with lock, m:
                 caps = m.get_vcp_capabilities()
                 print(f"  Caps Model: {caps.get('model')}")
                 print(f"  Caps Type: {caps.get('type')}")
@@ -0,0 +1,73 @@
+"""
+Command line client for the running KVM Switcher (talks to its local control endpoint).
+
+    python kvm.py status
+    python kvm.py switch <monitor> <source>     monitor: uid or index, source: name ("HDMI-1") or VCP value ("0x11")
+    python kvm.py scan
+
+Answers come from the app's cached state, so status and switch take milliseconds instead of a rescan.
+"""
+import argparse
+import json
+import os
+import sys
+
+# Only the IPC client is imported here; the monitor stack stays in the app
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from control_server import send_request
+
+
+def print_monitors(response):
+    for mon in response['monitors']:
+        current = mon['current_name'] or "unknown"
+        if mon['current_input'] is not None:
+            current += f" (0x{mon['current_input']:02X})"
+        print(f"{mon['id']}: {mon['name']}  input: {current}")
+        if mon['uid']:
+            print(f"   uid: {mon['uid']}")
+        if mon['inputs']:
+            print(f"   inputs: {', '.join(mon['inputs'])}")
+    if not response['monitors']:
+        print("No monitors detected" + (" (scan in progress)" if response.get('scanning') else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="kvm", description="Control the running KVM Switcher.")
+    parser.add_argument("--json", action="store_true", help="print the raw JSON response")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="list monitors and their current inputs")
+    commands.add_parser("scan", help="rescan monitors, then list them")
+    switch = commands.add_parser("switch", help="switch a monitor's input")
+    switch.add_argument("monitor", help="monitor uid or index (see 'status')")
+    switch.add_argument("source", help="input name (HDMI-1, DisplayPort, ...) or VCP value (0x11)")
+    switch.add_argument("--no-wait", action="store_true", help="return once the switch is queued")
+    switch.add_argument("--timeout", type=float, default=10.0, help="seconds to wait for the switch")
+    args = parser.parse_args(argv)
+
+    request = {'cmd': args.command}
+    if args.command == "switch":
+        request.update(monitor=args.monitor, source=args.source, wait=not args.no_wait, timeout=args.timeout)
+
+    try:
+        response = send_request(request)
+    except ConnectionError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps(response, indent=2))
+    elif not response.get('ok'):
+        print(f"Error: {response.get('error')}", file=sys.stderr)
+    elif args.command == "switch":
+        if response.get('queued'):
+            print("Switch queued")
+        else:
+            print(f"Switched in {response['elapsed'] * 1000:.0f} ms")
+    else:
+        print_monitors(response)
+    return 0 if response.get('ok') else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,8 +6,6 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 src_dir = os.path.join(current_dir, 'src')
 sys.path.append(src_dir)
 
-from kvm_tray import KVMApp
-
 if __name__ == "__main__":
     import sys
     import logging
@@ -34,7 +32,8 @@ if __name__ == "__main__":
     else:
         try:
            print("Starting KVM Switcher...")
-           from src.kvm_tray import KVMApp
+           # Imported here so --settings doesn't load the tray stack
+           from kvm_tray import KVMApp
            app = KVMApp()
            app.run()
         except Exception as e:
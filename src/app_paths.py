@@ -0,0 +1,53 @@
+import os
+import sys
+from typing import Union
+
+APP_DIR_NAME = "KVMInputSwitcher"
+
+
+def get_cache_dir() -> str:
+    """
+    Returns the per-user directory for state that should survive restarts
+    (capabilities cache, snapshots...). Created on first use.
+    %LOCALAPPDATA%\\KVMInputSwitcher on Windows, $XDG_CACHE_HOME/KVMInputSwitcher elsewhere.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+
+    path = os.path.join(base, APP_DIR_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_file(name: str) -> str:
+    return os.path.join(get_cache_dir(), name)
+
+
+def atomic_write(path: str, data: Union[str, bytes], mode: int = 0o666):
+    """
+    Writes `data` (str as UTF-8) to a temp file next to `path` and swaps it in, so a crash
+    never leaves a truncated file and readers see either the old or the new content.
+    `mode` applies when the file is created (e.g. 0o600 for secrets). Raises OSError on failure.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    tmp_path = path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def get_runtime_dir() -> str:
+    """
+    Returns a per-user directory only the user can access, for sockets and keys of the running app.
+    $XDG_RUNTIME_DIR/KVMInputSwitcher if set, else the cache directory.
+    """
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if not base or sys.platform == "win32":
+        return get_cache_dir()
+    path = os.path.join(base, APP_DIR_NAME)
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
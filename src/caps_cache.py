@@ -0,0 +1,135 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from app_paths import atomic_write, cache_file
+
+logger = logging.getLogger(__name__)
+
+
+class CapabilitiesCache:
+    """
+    Persistent cache of parsed VCP capabilities, keyed by monitor identity.
+
+    Fetching the capabilities string is the slowest DDC/CI transaction (seconds on
+    some monitors), and it never changes unless the monitor itself changes, so we
+    keep the parsed result on disk and reuse it across rescans and restarts.
+    """
+    CACHE_FILE = "vcp_capabilities.json"
+    DEFAULT_TTL = 7 * 24 * 3600  # One week; firmware updates are rare
+
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_TTL):
+        self.path = path or cache_file(self.CACHE_FILE)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._load()
+
+    @staticmethod
+    def make_key(device_id: Optional[str], instance_name: Optional[str] = None,
+                 manufacturer: Optional[str] = None, model: Optional[str] = None,
+                 edid_hash: Optional[str] = None) -> Optional[str]:
+        """
+        Builds the cache key from the monitor identity.
+        The EDID hash stands in for the firmware level: reading VCP 0xC9 would cost a DDC
+        round trip per monitor, while a firmware update that changes anything the host sees
+        normally changes the EDID too.
+        Returns None when there is no stable identity (we never cache those).
+        """
+        if not device_id or device_id == "Unknown":
+            return None
+        parts = [device_id.upper(), (instance_name or "").upper(), (manufacturer or "").upper(), model or "",
+                 edid_hash or ""]
+        return "|".join(parts)
+
+    def get(self, key: Optional[str]) -> Optional[Dict]:
+        if not key:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            if time.time() - entry.get('stored_at', 0) > self.ttl:
+                logger.debug(f"Capabilities cache entry expired for {key}")
+                del self._entries[key]
+                return None
+            return _decode_caps(entry.get('caps', {}))
+
+    def put(self, key: Optional[str], caps: Dict):
+        if not key or not isinstance(caps, dict):
+            return
+        with self._lock:
+            self._entries[key] = {'stored_at': time.time(), 'caps': _encode_caps(caps)}
+            self._save()
+
+    def invalidate(self, key: Optional[str] = None):
+        """
+        Drops one entry, or the whole cache when key is None.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._save()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._entries = data
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable capabilities cache {self.path}: {e}")
+            self._entries = {}
+
+    def _save(self):
+        try:
+            atomic_write(self.path, json.dumps(self._entries))
+        except Exception as e:
+            logger.warning(f"Failed to write capabilities cache: {e}")
+
+
+# Keys of the monitorcontrol capabilities dict whose nested dicts are keyed by VCP code
+_CODE_KEYED = ('cmds', 'vcp')
+
+
+def _encode_caps(caps: Dict) -> Dict:
+    encoded = {}
+    for key, value in caps.items():
+        if key in _CODE_KEYED and isinstance(value, dict):
+            encoded[key] = _stringify_keys(value)
+        elif isinstance(value, (list, tuple)):
+            # InputSource / ColorPreset enums are IntEnums; store the raw values
+            encoded[key] = [getattr(v, 'value', v) for v in value]
+        else:
+            encoded[key] = value
+    return encoded
+
+
+def _decode_caps(caps: Dict) -> Dict:
+    decoded = dict(caps)
+    for key in _CODE_KEYED:
+        if isinstance(decoded.get(key), dict):
+            decoded[key] = _int_keys(decoded[key])
+    return decoded
+
+
+def _stringify_keys(d: Dict) -> Dict:
+    return {str(k): _stringify_keys(v) if isinstance(v, dict) else v for k, v in d.items()}
+
+
+def _int_keys(d: Dict) -> Dict:
+    result = {}
+    for k, v in d.items():
+        try:
+            k = int(k)
+        except (TypeError, ValueError):
+            pass
+        result[k] = _int_keys(v) if isinstance(v, dict) else v
+    return result
@@ -0,0 +1,107 @@
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from ddc_errors import DDCUnsupportedError
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_OPEN = REGISTRY.gauge("kvm_circuit_open", "1 while a monitor's circuit breaker is open", ("monitor",))
+CIRCUIT_TRIPS = REGISTRY.counter("kvm_circuit_trips", "Times a monitor's circuit breaker opened", ("monitor",))
+
+
+class _Circuit:
+    def __init__(self):
+        self.failures = 0       # Consecutive failed operations
+        self.opens = 0          # Consecutive times the circuit opened (drives the backoff)
+        self.open_until = None  # None = closed
+        self.trial = False      # A half-open trial call is in flight
+
+
+class CircuitBreaker:
+    """
+    Per-monitor circuit breaker for background DDC traffic.
+
+    After `threshold` failed operations in a row (or one "unsupported" error) the monitor's
+    circuit opens and scans stop talking to it. Once the cooldown has passed a single trial
+    call is let through (half-open): success closes the circuit, failure opens it again with
+    twice the cooldown, up to max_cooldown.
+    """
+    def __init__(self, threshold: int = 2, base_cooldown: float = 5.0, max_cooldown: float = 300.0):
+        self.threshold = threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def allow(self, key: str) -> bool:
+        """
+        True if a call may go out. In the half-open state only one caller gets True.
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit.open_until is None:
+                return True
+            if time.monotonic() < circuit.open_until or circuit.trial:
+                return False
+            circuit.trial = True
+            return True
+
+    def is_trial(self, key: str) -> bool:
+        with self._lock:
+            circuit = self._circuits.get(key)
+            return circuit is not None and circuit.trial
+
+    def is_open(self, key: str) -> bool:
+        with self._lock:
+            circuit = self._circuits.get(key)
+            return circuit is not None and circuit.open_until is not None
+
+    def retry_in(self, key: str) -> float:
+        """
+        Seconds until the next trial call is allowed (0 if closed or due).
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit.open_until is None:
+                return 0.0
+            return max(0.0, circuit.open_until - time.monotonic())
+
+    def record_success(self, key: str):
+        with self._lock:
+            circuit = self._circuits.pop(key, None)
+        if circuit is not None and circuit.open_until is not None:
+            logger.info(f"{key} is responding again; resuming DDC traffic")
+            CIRCUIT_OPEN.set(0, monitor=key)
+
+    def record_failure(self, key: str, error: Optional[Exception] = None):
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            circuit.failures += 1
+            was_trial = circuit.trial
+            circuit.trial = False
+            if not (was_trial or circuit.failures >= self.threshold or isinstance(error, DDCUnsupportedError)):
+                return
+            cooldown = min(self.base_cooldown * (2 ** circuit.opens), self.max_cooldown)
+            # Jitter so monitors that broke together don't all come back on the same scan
+            cooldown *= random.uniform(0.8, 1.2)
+            circuit.opens += 1
+            circuit.open_until = time.monotonic() + cooldown
+
+        CIRCUIT_TRIPS.inc(monitor=key)
+        CIRCUIT_OPEN.set(1, monitor=key)
+        logger.warning(f"Pausing DDC traffic to {key} for {cooldown:.0f}s after repeated failures"
+                       + (f" ({error})" if error else ""))
+
+    def reset(self, key: Optional[str] = None):
+        """
+        Closes the circuit of `key` (or all), e.g. when the monitor was re-plugged.
+        """
+        with self._lock:
+            keys = [key] if key is not None else list(self._circuits)
+            removed = [k for k in keys if self._circuits.pop(k, None) is not None]
+        for k in removed:
+            CIRCUIT_OPEN.set(0, monitor=k)
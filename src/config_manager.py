@@ -1,14 +1,50 @@
-import winreg
 import sys
 import os
 import logging
 
+if sys.platform == "win32":
+    import winreg
+
 class ConfigManager:
     APP_NAME = "KVMInputSwitcher"
     RUN_KEY_PATH = r"Software\Microsoft\Windows\CurrentVersion\Run"
+    # Last answer of is_run_at_startup(); the menu asks on every render and the registry read isn't free
+    _STARTUP_STATE = None
+
+    @staticmethod
+    def _get_launch_command() -> str:
+        if getattr(sys, 'frozen', False):
+            return sys.executable
+        # If running as script, use pythonw.exe + script path
+        # But for now assuming python.exe
+        return f'"{sys.executable}" "{os.path.abspath(sys.argv[0])}"'
+
+    @staticmethod
+    def _autostart_file() -> str:
+        # XDG autostart entry (Linux desktops)
+        config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+        return os.path.join(config_home, "autostart", f"{ConfigManager.APP_NAME}.desktop")
 
     @staticmethod
     def is_run_at_startup() -> bool:
+        """
+        Cached; set_run_at_startup() keeps it current, invalidate_startup_state() forces a re-read
+        (e.g. after another process may have changed it).
+        """
+        state = ConfigManager._STARTUP_STATE
+        if state is None:
+            state = ConfigManager._read_run_at_startup()
+            ConfigManager._STARTUP_STATE = state
+        return state
+
+    @staticmethod
+    def invalidate_startup_state():
+        ConfigManager._STARTUP_STATE = None
+
+    @staticmethod
+    def _read_run_at_startup() -> bool:
+        if sys.platform != "win32":
+            return os.path.exists(ConfigManager._autostart_file())
         try:
             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, ConfigManager.RUN_KEY_PATH, 0, winreg.KEY_READ)
             winreg.QueryValueEx(key, ConfigManager.APP_NAME)
@@ -22,17 +58,16 @@ class ConfigManager:
 
     @staticmethod
     def set_run_at_startup(enabled: bool):
+        # Re-read on next use: the write below may fail
+        ConfigManager.invalidate_startup_state()
+        if sys.platform != "win32":
+            ConfigManager._set_autostart_entry(enabled)
+            return
         try:
             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, ConfigManager.RUN_KEY_PATH, 0, winreg.KEY_SET_VALUE)
             if enabled:
                 # Get path to executable
-                if getattr(sys, 'frozen', False):
-                    exe_path = sys.executable
-                else:
-                    # If running as script, use pythonw.exe + script path
-                    # But for now assuming python.exe
-                    exe_path = f'"{sys.executable}" "{os.path.abspath(sys.argv[0])}"'
-                
+                exe_path = ConfigManager._get_launch_command()
                 winreg.SetValueEx(key, ConfigManager.APP_NAME, 0, winreg.REG_SZ, exe_path)
             else:
                 try:
@@ -42,3 +77,21 @@ class ConfigManager:
             winreg.CloseKey(key)
         except Exception as e:
             logging.error(f"Error changing startup config: {e}")
+
+    @staticmethod
+    def _set_autostart_entry(enabled: bool):
+        path = ConfigManager._autostart_file()
+        try:
+            if enabled:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'w') as f:
+                    f.write("[Desktop Entry]\n"
+                            "Type=Application\n"
+                            "Name=KVM Switcher\n"
+                            f"Exec={ConfigManager._get_launch_command()}\n"
+                            f"Path={os.getcwd()}\n"
+                            "X-GNOME-Autostart-enabled=true\n")
+            elif os.path.exists(path):
+                os.remove(path)
+        except Exception as e:
+            logging.error(f"Error changing startup config: {e}")
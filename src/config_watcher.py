@@ -0,0 +1,153 @@
+import logging
+import os
+import select
+import sys
+import threading
+from typing import Callable, List, Optional, Tuple
+
+from hotplug import Debouncer
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigWatcher:
+    """
+    Calls on_change(path) after one of the watched files changed on disk.
+
+    The directories are watched with inotify on Linux and change notifications on Windows,
+    elsewhere (or if those fail) the files' mtime/size are polled. Any wake-up only leads
+    to a cheap stat of the watched files, and bursts of writes (editors saving via temp
+    files and renames) are debounced into one callback per file.
+    """
+    POLL_INTERVAL = 1.0
+
+    # inotify(7)
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+
+    def __init__(self, paths: List[str], on_change: Callable[[str], None], delay: float = 0.2):
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.on_change = on_change
+        self._stop = threading.Event()
+        self._thread = None
+        self._signatures = {path: self._signature(path) for path in self.paths}
+        self._debouncers = {path: Debouncer(lambda p=path: self._fire(p), delay) for path in self.paths}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="kvm-config-watch", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for debouncer in self._debouncers.values():
+            debouncer.cancel()
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def check(self) -> List[str]:
+        """
+        Stats the watched files; schedules on_change for the ones that changed and returns them.
+        """
+        changed = []
+        for path in self.paths:
+            signature = self._signature(path)
+            if signature != self._signatures[path]:
+                self._signatures[path] = signature
+                self._debouncers[path].trigger()
+                changed.append(path)
+        return changed
+
+    def _fire(self, path: str):
+        logger.info(f"{os.path.basename(path)} changed on disk")
+        self.on_change(path)
+
+    def _directories(self) -> List[str]:
+        # Watch directories, not files: saving often replaces the file with a new inode
+        return sorted({os.path.dirname(p) for p in self.paths})
+
+    def _run(self):
+        try:
+            if sys.platform.startswith("linux"):
+                self._run_inotify()
+            elif sys.platform == "win32":
+                self._run_windows()
+        except Exception as e:
+            logger.info(f"File change notifications unavailable ({e}); polling config files instead.")
+        # Fallback, and what the notification loops drop to if they fail
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.POLL_INTERVAL)
+
+    def _run_inotify(self):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        try:
+            mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+            for directory in self._directories():
+                if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch({directory}) failed")
+            while not self._stop.is_set():
+                # The timeout notices stop() and doubles as a safety-net stat if an event got lost
+                ready, _, _ = select.select([fd], [], [], self.POLL_INTERVAL)
+                if ready:
+                    try:
+                        # The event details don't matter: any event in the directory means "stat again"
+                        while os.read(fd, 4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                self.check()
+        finally:
+            os.close(fd)
+
+    def _run_windows(self):
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.windll.kernel32
+        kernel32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        kernel32.FindFirstChangeNotificationW.argtypes = [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD]
+        kernel32.WaitForMultipleObjects.argtypes = [wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE),
+                                                    wintypes.BOOL, wintypes.DWORD]
+        kernel32.FindNextChangeNotification.argtypes = [wintypes.HANDLE]
+        kernel32.FindCloseChangeNotification.argtypes = [wintypes.HANDLE]
+        FILE_NOTIFY_CHANGE_FILE_NAME = 0x01
+        FILE_NOTIFY_CHANGE_SIZE = 0x08
+        FILE_NOTIFY_CHANGE_LAST_WRITE = 0x10
+        WAIT_OBJECT_0 = 0x0
+        INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+        handles = []
+        try:
+            for directory in self._directories():
+                handle = kernel32.FindFirstChangeNotificationW(
+                    directory, False,
+                    FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_SIZE | FILE_NOTIFY_CHANGE_LAST_WRITE)
+                if not handle or handle == INVALID_HANDLE_VALUE:
+                    raise OSError(f"FindFirstChangeNotification({directory}) failed")
+                handles.append(handle)
+            array = (wintypes.HANDLE * len(handles))(*handles)
+            while not self._stop.is_set():
+                # Wake up regularly to notice stop()
+                result = kernel32.WaitForMultipleObjects(len(handles), array, False, int(self.POLL_INTERVAL * 1000))
+                if WAIT_OBJECT_0 <= result < WAIT_OBJECT_0 + len(handles):
+                    kernel32.FindNextChangeNotification(handles[result - WAIT_OBJECT_0])
+                self.check()
+        finally:
+            for handle in handles:
+                kernel32.FindCloseChangeNotification(handle)
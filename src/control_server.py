@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import secrets
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Client, Listener
+from typing import Callable, Dict, Optional
+
+from app_paths import atomic_write, get_runtime_dir
+
+logger = logging.getLogger(__name__)
+
+KEY_FILE = "control.key"
+
+
+def control_address() -> str:
+    """
+    Where the running app listens: a named pipe on Windows, a Unix domain socket elsewhere.
+    """
+    if sys.platform == "win32":
+        user = os.environ.get("USERNAME", "user")
+        return rf"\\.\pipe\KVMInputSwitcher-{user}"
+    return os.path.join(get_runtime_dir(), "control.sock")
+
+
+def _key_path() -> str:
+    return os.path.join(get_runtime_dir(), KEY_FILE)
+
+
+def _create_authkey() -> bytes:
+    """
+    A fresh random key per app start, readable only by the user. Clients prove they can read it
+    (multiprocessing's HMAC handshake), so other local users can't drive the monitors.
+    """
+    key = secrets.token_bytes(32)
+    path = _key_path()
+    atomic_write(path, key, 0o600)
+    return key
+
+
+def _load_authkey() -> bytes:
+    with open(_key_path(), 'rb') as f:
+        return f.read()
+
+
+class ControlServer:
+    """
+    Local request/response endpoint of the running app, for scripts and the `kvm.py` CLI.
+
+    Requests and responses are JSON objects, one message each way per request; a connection
+    can carry several requests. handler(request) -> response runs on a small thread pool,
+    so a slow command (a switch waiting for the monitor) doesn't hold up the others.
+    """
+    def __init__(self, handler: Callable[[Dict], Dict], address: Optional[str] = None, max_workers: int = 4):
+        self.handler = handler
+        self.address = address or control_address()
+        self.listener = None
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kvm-control")
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if sys.platform != "win32" and os.path.exists(self.address):
+            # Left over from a run that didn't shut down cleanly
+            os.unlink(self.address)
+        self.listener = Listener(self.address, authkey=_create_authkey())
+        self._thread = threading.Thread(target=self._accept_loop, name="kvm-control-accept", daemon=True)
+        self._thread.start()
+        logger.info(f"Control endpoint listening on {self.address}")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self.listener:
+            try:
+                self.listener.close()
+            except OSError:
+                pass
+        try:
+            os.unlink(_key_path())
+        except OSError:
+            pass
+        self._pool.shutdown(wait=False)
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            try:
+                conn = self.listener.accept()
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                # Failed handshake (wrong key) or a client that went away mid-handshake
+                logger.warning(f"Rejected control connection: {e}")
+                continue
+            try:
+                self._pool.submit(self._serve, conn)
+            except RuntimeError:
+                conn.close()  # Shutting down
+                break
+
+    def _serve(self, conn):
+        with conn:
+            while True:
+                try:
+                    raw = conn.recv_bytes()
+                except (EOFError, OSError):
+                    return
+                try:
+                    request = json.loads(raw.decode('utf-8'))
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                    response = self.handler(request)
+                except Exception as e:
+                    response = {'ok': False, 'error': str(e)}
+                try:
+                    conn.send_bytes(json.dumps(response).encode('utf-8'))
+                except OSError:
+                    return
+
+
+def send_request(request: Dict, address: Optional[str] = None, timeout: Optional[float] = None) -> Dict:
+    """
+    Sends one request to the running app and returns its response.
+    Raises ConnectionError if the app isn't running, TimeoutError if it doesn't answer within `timeout`.
+    """
+    address = address or control_address()
+    try:
+        authkey = _load_authkey()
+        conn = Client(address, authkey=authkey)
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        raise ConnectionError(f"KVM Switcher is not running ({e})") from e
+    with conn:
+        conn.send_bytes(json.dumps(request).encode('utf-8'))
+        if timeout is not None and not conn.poll(timeout):
+            raise TimeoutError(f"KVM Switcher did not answer within {timeout:.1f}s")
+        return json.loads(conn.recv_bytes().decode('utf-8'))
@@ -0,0 +1,174 @@
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from ddc_linux import (
+    CAPS_CMD, CAPS_FRAGMENT_MAX, CAPS_REPLY, DDC_CI_ADDR, EDID_ADDR, GET_VCP_CMD, GET_VCP_REPLY,
+    HOST_ADDR, LENGTH_FLAG, LinuxDDCBackend, REPLY_CHECKSUM_SEED, SET_VCP_CMD, ddc_checksum,
+)
+
+# Null message: what a display answers when it has nothing to say (yet)
+NULL_REPLY = bytes([DDC_CI_ADDR << 1, LENGTH_FLAG, (DDC_CI_ADDR << 1) ^ LENGTH_FLAG ^ REPLY_CHECKSUM_SEED])
+
+
+class EmulatedMonitor:
+    """
+    A display as seen from its I2C bus: DDC/CI at 0x37 and the EDID EEPROM at 0x50.
+    Validates host checksums like real firmware and answers Get/Set VCP and
+    capabilities requests, so the Linux backend can be exercised without hardware.
+    """
+    def __init__(self, edid: bytes, capabilities: str, vcp: Optional[Dict[int, Tuple[int, int]]] = None,
+                 settle_time: float = 0.0):
+        """
+        settle_time: after an input switch (VCP 0x60) the display ignores DDC/CI for this long, like real
+        monitors re-syncing to the new signal.
+        """
+        self.edid = edid
+        self.settle_time = settle_time
+        self._busy_until = 0.0
+        self.capabilities = capabilities.encode('ascii') + b"\x00"
+        # VCP code -> (current, maximum)
+        self.vcp = dict(vcp or {})
+        self.lock = threading.Lock()
+        self._pending_reply = None
+        self._edid_offset = 0
+        self.writes = []  # (code, value) of every Set VCP received
+
+    def handle_write(self, address: int, data: bytes):
+        with self.lock:
+            if address == EDID_ADDR:
+                self._edid_offset = data[0] if data else 0
+                return
+            if address != DDC_CI_ADDR:
+                raise OSError(6, "No such device or address")
+
+            self._pending_reply = None
+            if time.monotonic() < self._busy_until:
+                return  # Re-syncing; requests go unanswered
+            if len(data) < 3 or data[0] != HOST_ADDR:
+                return
+            length = data[1] & ~LENGTH_FLAG
+            message, checksum = data[:2 + length], data[2 + length] if len(data) > 2 + length else None
+            if checksum != ddc_checksum(message, DDC_CI_ADDR << 1):
+                return  # Firmware silently drops corrupted requests
+            self._handle_command(message[2:])
+
+    def handle_read(self, address: int, length: int) -> bytes:
+        with self.lock:
+            if address == EDID_ADDR:
+                data = self.edid[self._edid_offset:self._edid_offset + length]
+                self._edid_offset += len(data)
+                return data
+            reply = self._pending_reply or NULL_REPLY
+            self._pending_reply = None
+        # Real hardware clocks out whatever the host asks for; pad like an idle bus
+        return (reply + b"\xff" * length)[:max(length, len(reply))]
+
+    def _handle_command(self, payload: bytes):
+        opcode = payload[0]
+        if opcode == GET_VCP_CMD and len(payload) >= 2:
+            code = payload[1]
+            if code in self.vcp:
+                current, maximum = self.vcp[code]
+                self._reply(bytes([GET_VCP_REPLY, 0x00, code, 0x00,
+                                   maximum >> 8, maximum & 0xFF, current >> 8, current & 0xFF]))
+            else:
+                self._reply(bytes([GET_VCP_REPLY, 0x01, code, 0x00, 0, 0, 0, 0]))
+        elif opcode == SET_VCP_CMD and len(payload) >= 4:
+            code, value = payload[1], (payload[2] << 8) | payload[3]
+            maximum = self.vcp.get(code, (0, 0xFFFF))[1]
+            self.vcp[code] = (value, maximum)
+            self.writes.append((code, value))
+            if code == 0x60:
+                self._busy_until = time.monotonic() + self.settle_time
+        elif opcode == CAPS_CMD and len(payload) >= 3:
+            offset = (payload[1] << 8) | payload[2]
+            fragment = self.capabilities[offset:offset + CAPS_FRAGMENT_MAX]
+            self._reply(bytes([CAPS_REPLY, payload[1], payload[2]]) + fragment)
+
+    def _reply(self, payload: bytes):
+        message = bytes([DDC_CI_ADDR << 1, LENGTH_FLAG | len(payload)]) + payload
+        self._pending_reply = message + bytes([ddc_checksum(message, REPLY_CHECKSUM_SEED)])
+
+
+class EmulatedI2CDevice:
+    """
+    Drop-in replacement for ddc_linux.I2CDevice that talks to an EmulatedMonitor.
+    `latency` is added to every transfer to mimic a slow bus; a `failure_rate` fraction
+    of transfers fails with EIO like a flaky cable or a monitor that doesn't ACK.
+    """
+    def __init__(self, monitor: Optional[EmulatedMonitor], latency: float = 0.0,
+                 failure_rate: float = 0.0, rng: Optional[random.Random] = None):
+        self.monitor = monitor
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rng = rng or random.Random()
+        self.address = None
+        self.is_open = False
+
+    def open(self):
+        if self.monitor is None:
+            raise OSError(2, "No such file or directory")
+        self.is_open = True
+
+    def set_address(self, address: int):
+        self.address = address
+
+    def write(self, data: bytes):
+        self._delay()
+        self.monitor.handle_write(self.address, bytes(data))
+
+    def read(self, length: int) -> bytes:
+        self._delay()
+        return self.monitor.handle_read(self.address, length)
+
+    def close(self):
+        self.is_open = False
+
+    def _delay(self):
+        if not self.is_open:
+            raise OSError(9, "Bad file descriptor")
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            raise OSError(5, "Input/output error")
+
+
+class EmulatedDisplaySetup:
+    """
+    A fake /sys/class/drm tree plus emulated I2C buses behind it.
+    backend() returns a LinuxDDCBackend wired to both.
+    `seed` makes injected failures reproducible.
+    """
+    def __init__(self, sysfs_root: str, latency: float = 0.0, failure_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.sysfs_root = sysfs_root
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.buses: Dict[int, EmulatedMonitor] = {}
+        os.makedirs(sysfs_root, exist_ok=True)
+
+    def add_monitor(self, connector: str, bus: int, monitor: EmulatedMonitor, connected: bool = True):
+        conn_dir = os.path.join(self.sysfs_root, connector)
+        os.makedirs(conn_dir, exist_ok=True)
+        os.makedirs(os.path.join(self.sysfs_root, f"i2c-{bus}"), exist_ok=True)
+        ddc_link = os.path.join(conn_dir, "ddc")
+        if not os.path.islink(ddc_link):
+            os.symlink(os.path.join("..", f"i2c-{bus}"), ddc_link)
+        self.set_connected(connector, connected)
+        with open(os.path.join(conn_dir, "edid"), 'wb') as f:
+            f.write(monitor.edid if connected else b"")
+        self.buses[bus] = monitor
+
+    def set_connected(self, connector: str, connected: bool):
+        with open(os.path.join(self.sysfs_root, connector, "status"), 'w') as f:
+            f.write("connected\n" if connected else "disconnected\n")
+
+    def opener(self, bus: int) -> EmulatedI2CDevice:
+        return EmulatedI2CDevice(self.buses.get(bus), self.latency, self.failure_rate, self.rng)
+
+    def backend(self) -> LinuxDDCBackend:
+        return LinuxDDCBackend(sysfs_root=self.sysfs_root, opener=self.opener)
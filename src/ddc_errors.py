@@ -0,0 +1,168 @@
+import ctypes
+import errno
+import sys
+import threading
+from typing import Dict, Optional, Type
+
+from monitorcontrol.vcp import VCPError, VCPPermissionError
+
+
+class DDCError(VCPError):
+    """
+    A DDC/CI failure classified by what it means for the caller.
+    `code` is the backend's error code (Win32 error or errno) when known.
+    """
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+
+
+class DDCTransientError(DDCError):
+    """
+    The monitor answered badly or not yet (busy, garbled reply); retrying shortly usually works.
+    """
+
+
+class DDCDisconnectedError(DDCTransientError):
+    """
+    The monitor dropped off the bus, typically right after accepting an input switch while it
+    re-syncs. For a write this means the command went through.
+    """
+
+
+class DDCUnsupportedError(DDCError):
+    """
+    The monitor (or this session) can't do what was asked: DDC/CI disabled, VCP code not
+    supported, no access. Retrying doesn't help.
+    """
+
+
+class DDCBusError(DDCError):
+    """
+    Nothing usable on the bus: no ACK, I2C transfer failure, monitor off or unplugged.
+    """
+
+
+class DDCCircuitOpenError(DDCError):
+    """
+    Not attempted: the monitor failed repeatedly and its circuit breaker is open.
+    """
+
+
+class DDCBusBusyError(DDCError):
+    """
+    Not attempted: another process (a second tool talking to the same monitor) kept the bus
+    longer than the lock timeout.
+    """
+
+
+class DDCCancelledError(DDCError):
+    """
+    The caller gave up (timeout or cancellation) before the operation finished; says nothing about the monitor.
+    """
+
+
+# Win32 error codes the Dxva2 monitor configuration API fails with (winerror.h, ERROR_GRAPHICS_*)
+WINDOWS_ERRORS: Dict[int, Type[DDCError]] = {
+    0x0000001F: DDCBusError,            # ERROR_GEN_FAILURE (monitor off / not responding)
+    0xC0262580: DDCUnsupportedError,    # ERROR_GRAPHICS_I2C_NOT_SUPPORTED
+    0xC0262581: DDCBusError,            # ERROR_GRAPHICS_I2C_DEVICE_DOES_NOT_EXIST
+    0xC0262582: DDCBusError,            # ERROR_GRAPHICS_I2C_ERROR_TRANSMITTING_DATA
+    0xC0262583: DDCBusError,            # ERROR_GRAPHICS_I2C_ERROR_RECEIVING_DATA
+    0xC0262584: DDCUnsupportedError,    # ERROR_GRAPHICS_DDCCI_VCP_NOT_SUPPORTED
+    0xC0262585: DDCTransientError,      # ERROR_GRAPHICS_DDCCI_INVALID_DATA
+    0xC0262586: DDCTransientError,      # ERROR_GRAPHICS_DDCCI_MONITOR_RETURNED_INVALID_TIMING_STATUS_BYTE
+    0xC0262587: DDCUnsupportedError,    # ERROR_GRAPHICS_MCA_INVALID_CAPABILITIES_STRING
+    0xC0262588: DDCTransientError,      # ERROR_GRAPHICS_MCA_INTERNAL_ERROR
+    0xC0262589: DDCDisconnectedError,   # ERROR_GRAPHICS_DDCCI_INVALID_MESSAGE_COMMAND
+    0xC026258A: DDCTransientError,      # ERROR_GRAPHICS_DDCCI_INVALID_MESSAGE_LENGTH
+    0xC026258B: DDCTransientError,      # ERROR_GRAPHICS_DDCCI_INVALID_MESSAGE_CHECKSUM
+    0xC026258C: DDCDisconnectedError,   # ERROR_GRAPHICS_INVALID_PHYSICAL_MONITOR_HANDLE
+    0xC026258D: DDCDisconnectedError,   # ERROR_GRAPHICS_MONITOR_NO_LONGER_EXISTS
+    0xC02625DA: DDCUnsupportedError,    # ERROR_GRAPHICS_MCA_MONITOR_VIOLATES_MCCS_SPECIFICATION
+    0xC02625DC: DDCUnsupportedError,    # ERROR_GRAPHICS_MCA_UNSUPPORTED_MCCS_VERSION
+    0xC02625E0: DDCUnsupportedError,    # ERROR_GRAPHICS_ONLY_CONSOLE_SESSION_SUPPORTED (e.g. over RDP)
+}
+
+# errno values from i2c-dev transfers
+ERRNO_ERRORS: Dict[int, Type[DDCError]] = {
+    errno.EIO: DDCBusError,
+    errno.ENXIO: DDCBusError,       # No ACK at 0x37: monitor off or DDC/CI disabled
+    errno.ENODEV: DDCBusError,
+    errno.ENOENT: DDCBusError,      # /dev/i2c-N is gone
+    errno.ETIMEDOUT: DDCBusError,
+    errno.EACCES: DDCUnsupportedError,
+    errno.EPERM: DDCUnsupportedError,
+}
+if hasattr(errno, "EREMOTEIO"):
+    ERRNO_ERRORS[errno.EREMOTEIO] = DDCBusError
+
+# monitorcontrol only passes on the localized FormatError() text of Win32 failures, e.g.
+# "failed to get VCP feature: <message>"; we map the text back to its code with FormatError(code)
+_message_codes: Optional[Dict[str, int]] = None
+_message_lock = threading.Lock()
+
+
+def _windows_message_codes() -> Dict[str, int]:
+    global _message_codes
+    with _message_lock:
+        if _message_codes is None:
+            codes = {}
+            for code in WINDOWS_ERRORS:
+                # FormatError takes a signed 32-bit value
+                signed = code - (1 << 32) if code >= (1 << 31) else code
+                try:
+                    text = ctypes.FormatError(signed).strip()
+                except Exception:
+                    continue
+                if text:
+                    codes[text] = code
+            _message_codes = codes
+        return _message_codes
+
+
+def _code_from_message(message: str) -> Optional[int]:
+    if sys.platform != "win32":
+        return None
+    message = message.strip()
+    for text, code in _windows_message_codes().items():
+        if message.endswith(text):
+            return code
+    return None
+
+
+def classify_error(e: BaseException) -> DDCError:
+    """
+    Maps any exception from a DDC call to the DDCError subclass it stands for.
+    DDCErrors are returned as is; everything else is wrapped (the original is kept as __cause__).
+    """
+    if isinstance(e, DDCError):
+        return e
+
+    message = str(e)
+    cls, code = None, None
+
+    # Codes first: an OSError in the chain carries winerror/errno
+    cause = e
+    while cause is not None and cls is None:
+        if isinstance(cause, OSError):
+            code = getattr(cause, 'winerror', None) or cause.errno
+            if code is not None:
+                cls = WINDOWS_ERRORS.get(code & 0xFFFFFFFF) or ERRNO_ERRORS.get(code)
+        cause = cause.__cause__
+
+    if cls is None:
+        code = _code_from_message(message)
+        if code is not None:
+            cls = WINDOWS_ERRORS[code]
+
+    if cls is None and isinstance(e, VCPPermissionError):
+        cls = DDCUnsupportedError
+
+    if cls is None:
+        # Unknown: behave like a bus failure (retry within the deadline, counts towards the breaker)
+        cls = DDCBusError
+
+    error = cls(message, code)
+    error.__cause__ = e
+    return error
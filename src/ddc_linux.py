@@ -0,0 +1,300 @@
+import glob
+import logging
+import os
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from monitorcontrol import Monitor
+from monitorcontrol.vcp import VCP
+
+from ddc_errors import DDCBusError, DDCError, DDCTransientError, DDCUnsupportedError
+from edid import parse_edid
+
+logger = logging.getLogger(__name__)
+
+# i2c-dev ioctl: select the slave address for subsequent read()/write()
+I2C_SLAVE = 0x0703
+
+# DDC/CI addresses (7-bit) and protocol bytes, per VESA DDC/CI 1.1
+DDC_CI_ADDR = 0x37          # 0x6E/0x6F on the wire
+EDID_ADDR = 0x50            # 0xA0/0xA1 on the wire
+HOST_ADDR = 0x51            # Source address byte of host -> display messages
+REPLY_CHECKSUM_SEED = 0x50  # Display -> host checksums are seeded with the virtual host address
+LENGTH_FLAG = 0x80
+
+GET_VCP_CMD = 0x01
+GET_VCP_REPLY = 0x02
+SET_VCP_CMD = 0x03
+CAPS_CMD = 0xF3
+CAPS_REPLY = 0xE3
+
+# MCCS timing
+GET_REPLY_DELAY = 0.04   # Host waits 40 ms before reading a Get VCP reply
+CAPS_REPLY_DELAY = 0.05  # ... and 50 ms for a capabilities fragment
+COMMAND_INTERVAL = 0.05  # Minimum spacing between two commands to the same display
+
+CAPS_FRAGMENT_MAX = 32
+CAPS_MAX_FRAGMENTS = 64
+
+
+def ddc_checksum(data: bytes, seed: int) -> int:
+    checksum = seed
+    for b in data:
+        checksum ^= b
+    return checksum
+
+
+class I2CDevice:
+    """
+    Thin wrapper over /dev/i2c-N using the i2c-dev ioctl interface.
+    Anything with the same open/set_address/write/read/close methods can stand in
+    for it (see ddc_emulator.EmulatedI2CDevice).
+    """
+    def __init__(self, bus: int, dev_root: str = "/dev"):
+        self.path = os.path.join(dev_root, f"i2c-{bus}")
+        self.fd = None
+
+    def open(self):
+        self.fd = os.open(self.path, os.O_RDWR)
+
+    def set_address(self, address: int):
+        import fcntl
+        fcntl.ioctl(self.fd, I2C_SLAVE, address)
+
+    def write(self, data: bytes):
+        os.write(self.fd, bytes(data))
+
+    def read(self, length: int) -> bytes:
+        return os.read(self.fd, length)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class LinuxDDCVCP(VCP):
+    """
+    monitorcontrol VCP implementation speaking DDC/CI directly over an I2C bus.
+    Wrapped in monitorcontrol.Monitor it behaves exactly like the Windows handles,
+    so MonitorManager doesn't need to know which backend it talks to.
+    """
+    # Last command time per bus, shared by all handles of the same display
+    _last_command: Dict[int, float] = {}
+    _timing_lock = threading.Lock()
+
+    def __init__(self, bus: int, opener: Callable[[int], object] = I2CDevice):
+        self.bus = bus
+        self.opener = opener
+        self.dev = None
+
+    def __enter__(self):
+        dev = self.opener(self.bus)
+        try:
+            dev.open()
+            dev.set_address(DDC_CI_ADDR)
+        except OSError as e:
+            # Whatever failed, don't keep the descriptor of a half-opened device
+            dev.close()
+            if isinstance(e, PermissionError):
+                raise DDCUnsupportedError(f"permission denied for i2c-{self.bus} (is the user in the i2c group?)",
+                                          e.errno) from e
+            raise DDCBusError(f"unable to open i2c-{self.bus}: {e}", e.errno) from e
+        self.dev = dev
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        if self.dev:
+            self.dev.close()
+            self.dev = None
+        return False
+
+    def get_vcp_feature(self, code: int) -> Tuple[int, int]:
+        reply = self._transact(bytes([GET_VCP_CMD, code]), GET_REPLY_DELAY, 8)
+        opcode, result, reply_code, _type, maximum, current = struct.unpack(">BBBBHH", reply)
+        if opcode != GET_VCP_REPLY or reply_code != code:
+            raise DDCTransientError(f"unexpected reply to Get VCP 0x{code:02X}: {reply.hex()}")
+        if result == 0x01:
+            raise DDCUnsupportedError(f"Unsupported VCP code 0x{code:02X}")
+        if result != 0x00:
+            raise DDCTransientError(f"Get VCP 0x{code:02X} failed with result code {result}")
+        return current, maximum
+
+    def set_vcp_feature(self, code: int, value: int):
+        self._transact(bytes([SET_VCP_CMD, code, (value >> 8) & 0xFF, value & 0xFF]))
+
+    def get_vcp_capabilities(self) -> str:
+        caps = b""
+        offset = 0
+        for _ in range(CAPS_MAX_FRAGMENTS):
+            reply = self._transact(bytes([CAPS_CMD, offset >> 8, offset & 0xFF]), CAPS_REPLY_DELAY,
+                                   3 + CAPS_FRAGMENT_MAX, exact=False)
+            if reply[0] != CAPS_REPLY or len(reply) < 3:
+                raise DDCTransientError(f"unexpected capabilities reply: {reply.hex()}")
+            fragment_offset = (reply[1] << 8) | reply[2]
+            if fragment_offset != offset:
+                raise DDCTransientError(f"capabilities fragment offset {fragment_offset}, expected {offset}")
+            fragment = reply[3:]
+            if not fragment:
+                break
+            caps += fragment
+            offset += len(fragment)
+        else:
+            raise DDCUnsupportedError("capabilities string incomplete or too long")
+        return caps.split(b"\x00")[0].decode('ascii', errors='replace')
+
+    def _transact(self, payload: bytes, reply_delay: Optional[float] = None,
+                  reply_length: int = 0, exact: bool = True) -> bytes:
+        """
+        Sends one DDC/CI request and, if reply_delay is given, reads and validates the reply.
+        Returns the reply payload (without address, length and checksum bytes).
+        """
+        if self.dev is None:
+            raise DDCError("VCP used outside of its context manager")
+
+        self._wait_command_interval()
+        message = bytes([HOST_ADDR, LENGTH_FLAG | len(payload)]) + payload
+        message += bytes([ddc_checksum(message, DDC_CI_ADDR << 1)])
+        try:
+            self.dev.write(message)
+            if reply_delay is None:
+                return b""
+            time.sleep(reply_delay)
+            raw = self.dev.read(reply_length + 3)
+        except OSError as e:
+            raise DDCBusError(f"i2c-{self.bus} transfer failed: {e}", e.errno) from e
+        finally:
+            self._mark_command()
+
+        if len(raw) < 3:
+            raise DDCTransientError(f"short reply from i2c-{self.bus}")
+        length = raw[1] & ~LENGTH_FLAG
+        if length == 0:
+            # Null message (6E 80 BE): the display has no reply ready yet
+            raise DDCTransientError("display returned a null message (busy)")
+        if 2 + length + 1 > len(raw) or (exact and length != reply_length):
+            raise DDCTransientError(f"unexpected reply length {length} from i2c-{self.bus}")
+        body = raw[:2 + length]
+        if ddc_checksum(body, REPLY_CHECKSUM_SEED) != raw[2 + length]:
+            raise DDCTransientError(f"reply checksum mismatch on i2c-{self.bus}")
+        return body[2:]
+
+    def _wait_command_interval(self):
+        with LinuxDDCVCP._timing_lock:
+            last = LinuxDDCVCP._last_command.get(self.bus, 0.0)
+        wait = last + COMMAND_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+    def _mark_command(self):
+        with LinuxDDCVCP._timing_lock:
+            LinuxDDCVCP._last_command[self.bus] = time.monotonic()
+
+
+def read_edid_i2c(bus: int, opener: Callable[[int], object] = I2CDevice) -> Optional[bytes]:
+    """
+    Reads the EDID base block straight from the display at 0x50 (for connectors without a sysfs edid file).
+    """
+    dev = opener(bus)
+    try:
+        dev.open()
+        dev.set_address(EDID_ADDR)
+        dev.write(b"\x00")
+        return dev.read(128)
+    except OSError as e:
+        logger.debug(f"Could not read EDID over i2c-{bus}: {e}")
+        return None
+    finally:
+        dev.close()
+
+
+def find_ddc_buses(sysfs_root: str = "/sys/class/drm") -> List[Dict]:
+    """
+    Maps connected DRM connectors to their DDC I2C bus.
+    Returns [{'connector': 'card0-DP-1', 'bus': 5, 'edid': bytes or None}, ...]
+    """
+    results = []
+    for conn_dir in sorted(glob.glob(os.path.join(sysfs_root, "card*-*"))):
+        try:
+            with open(os.path.join(conn_dir, "status"), 'r') as f:
+                if f.read().strip() != "connected":
+                    continue
+        except OSError:
+            continue
+
+        bus = _connector_bus(conn_dir)
+        if bus is None:
+            logger.debug(f"No DDC bus found for {os.path.basename(conn_dir)}")
+            continue
+
+        edid = None
+        try:
+            with open(os.path.join(conn_dir, "edid"), 'rb') as f:
+                edid = f.read() or None
+        except OSError:
+            pass
+
+        results.append({'connector': os.path.basename(conn_dir), 'bus': bus, 'edid': edid})
+    return results
+
+
+def _connector_bus(conn_dir: str) -> Optional[int]:
+    # Most drivers link the DDC adapter as 'ddc'; DisplayPort connectors expose their AUX channel as a child i2c-N
+    candidates = []
+    ddc_link = os.path.join(conn_dir, "ddc")
+    if os.path.exists(ddc_link) or os.path.islink(ddc_link):
+        candidates.append(os.path.basename(os.path.realpath(ddc_link)))
+    candidates += [os.path.basename(p) for p in sorted(glob.glob(os.path.join(conn_dir, "i2c-*")))]
+
+    for name in candidates:
+        if name.startswith("i2c-"):
+            try:
+                return int(name[4:])
+            except ValueError:
+                continue
+    return None
+
+
+class LinuxDDCBackend:
+    """
+    MonitorManager backend for Linux: DRM connectors for identity, /dev/i2c-N for DDC/CI.
+    Point sysfs_root at a fake tree and pass an emulated opener to run without hardware.
+    """
+    def __init__(self, sysfs_root: str = "/sys/class/drm", dev_root: str = "/dev",
+                 opener: Optional[Callable[[int], object]] = None):
+        self.sysfs_root = sysfs_root
+        self.opener = opener or (lambda bus: I2CDevice(bus, dev_root))
+
+    def enumerate(self) -> Tuple[List[Monitor], List[Optional[Dict]], List[str]]:
+        """
+        Returns (monitors, monitor_info, physical_ids), all in the same order.
+        monitor_info entries use the same keys as MonitorManager.get_wmi_monitor_info().
+        """
+        monitors, info_list, phys_ids = [], [], []
+        for conn in find_ddc_buses(self.sysfs_root):
+            connector, bus = conn['connector'], conn['bus']
+            data = conn['edid'] or read_edid_i2c(bus, self.opener)
+
+            info = None
+            hw_id = "Unknown"
+            if data:
+                try:
+                    edid = parse_edid(data, connector)
+                    hw_id = edid['hw_id']
+                    info = {
+                        'Manufacturer': edid['manufacturer'],
+                        'Model': edid['model'],
+                        'InstanceName': f"DRM\\{hw_id}\\{connector}",
+                        'IsInternal': edid['is_internal'],
+                        'Serial': edid['serial'],
+                        'EdidHash': edid['hash'],
+                    }
+                except ValueError as e:
+                    logger.warning(f"Invalid EDID on {connector}: {e}")
+
+            monitors.append(Monitor(LinuxDDCVCP(bus, self.opener)))
+            info_list.append(info)
+            phys_ids.append(f"DRM\\{hw_id}\\{connector}")
+        return monitors, info_list, phys_ids
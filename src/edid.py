@@ -0,0 +1,174 @@
+import glob
+import hashlib
+import os
+import struct
+from typing import Dict, List, Optional
+
+# Based on VESA E-EDID Standard Release A2 (EDID 1.4)
+EDID_HEADER = b"\x00\xff\xff\xff\xff\xff\xff\x00"
+EDID_BLOCK_SIZE = 128
+
+# Display descriptor tags
+DESCRIPTOR_SERIAL = 0xFF
+DESCRIPTOR_TEXT = 0xFE
+DESCRIPTOR_NAME = 0xFC
+
+# EDID 1.4 digital video interface (byte 20, bits 0-3)
+DIGITAL_INTERFACES = {
+    0x0: "Undefined",
+    0x1: "DVI",
+    0x2: "HDMI-a",
+    0x3: "HDMI-b",
+    0x4: "MDDI",
+    0x5: "DisplayPort",
+}
+
+# PNP IDs of vendors that only make laptop/tablet panels
+PANEL_VENDORS = {"AUO", "BOE", "CMN", "CSO", "IVO", "KDB", "LGD", "NCP", "SDC", "SHP", "TMX"}
+
+# DRM connector types that are always built-in panels
+INTERNAL_CONNECTORS = ("eDP", "LVDS", "DSI")
+
+# 1920x1080@60 detailed timing, used by build_edid()
+_DTD_1080P = bytes.fromhex("023a801871382d40582c450056502100001e")
+
+
+def parse_edid(data: bytes, connector: Optional[str] = None) -> Dict:
+    """
+    Decodes the base block of a raw EDID blob.
+    If the DRM connector name is known (e.g. 'card0-eDP-1') it decides 'is_internal';
+    otherwise that is only a guess from the EDID, for callers that have nothing better
+    (on Windows the DisplayConfig output technology or WMI come first).
+    Raises ValueError for blobs that are not EDID.
+    """
+    if len(data) < EDID_BLOCK_SIZE or data[:8] != EDID_HEADER:
+        raise ValueError("Not an EDID blob")
+
+    block = data[:EDID_BLOCK_SIZE]
+    product_code, serial_number = struct.unpack_from("<HI", block, 10)
+    # Manufacturer ID is big-endian: three 5-bit letters, 'A' = 1
+    mfg_raw = (block[8] << 8) | block[9]
+    manufacturer = "".join(chr(((mfg_raw >> shift) & 0x1F) + ord('A') - 1) for shift in (10, 5, 0))
+
+    version = (block[18], block[19])
+    digital = bool(block[20] & 0x80)
+    interface = None
+    if digital and version >= (1, 4):
+        interface = DIGITAL_INTERFACES.get(block[20] & 0x0F, "Unknown")
+
+    name = None
+    serial_str = None
+    texts = []
+    for offset in (54, 72, 90, 108):
+        desc = block[offset:offset + 18]
+        # Display descriptors start with a zero pixel clock; anything else is a timing
+        if desc[0] != 0 or desc[1] != 0:
+            continue
+        tag = desc[3]
+        text = desc[5:18].split(b"\x0a")[0].decode('ascii', errors='replace').strip()
+        if tag == DESCRIPTOR_NAME:
+            name = text
+        elif tag == DESCRIPTOR_SERIAL:
+            serial_str = text
+        elif tag == DESCRIPTOR_TEXT and text:
+            texts.append(text)
+
+    hw_id = f"{manufacturer}{product_code:04X}"
+    if connector:
+        is_internal = any(f"-{kind}" in connector for kind in INTERNAL_CONNECTORS)
+    else:
+        # Panels carry no monitor name, only free-text descriptors (vendor + part number)
+        is_internal = digital and name is None and (bool(texts) or manufacturer in PANEL_VENDORS)
+
+    return {
+        'manufacturer': manufacturer,
+        'product_code': product_code,
+        'hw_id': hw_id,
+        'serial_number': serial_number,
+        'serial': serial_str or (str(serial_number) if serial_number else ""),
+        'model': name or (texts[-1] if texts else hw_id),
+        'week': block[16],
+        'year': block[17] + 1990,
+        'version': f"{version[0]}.{version[1]}",
+        'digital': digital,
+        'interface': interface,
+        'extensions': block[126],
+        'checksum_ok': sum(block) % 256 == 0,
+        'is_internal': is_internal,
+        'hash': hashlib.sha1(block).hexdigest()[:16],
+    }
+
+
+def read_drm_edids(sysfs_root: str = "/sys/class/drm") -> List[Dict]:
+    """
+    Reads and parses the EDID of every connected DRM connector.
+    Each result has the parse_edid() fields plus 'connector' and 'edid' (raw bytes).
+    """
+    results = []
+    for conn_dir in sorted(glob.glob(os.path.join(sysfs_root, "card*-*"))):
+        connector = os.path.basename(conn_dir)
+        try:
+            with open(os.path.join(conn_dir, "status"), 'r') as f:
+                if f.read().strip() != "connected":
+                    continue
+            with open(os.path.join(conn_dir, "edid"), 'rb') as f:
+                data = f.read()
+            info = parse_edid(data, connector)
+        except (OSError, ValueError):
+            continue
+        info['connector'] = connector
+        info['edid'] = data
+        results.append(info)
+    return results
+
+
+def build_edid(manufacturer: str, product_code: int, serial_number: int = 0, name: Optional[str] = None,
+               serial: Optional[str] = None, texts: tuple = (), interface: Optional[int] = None,
+               week: int = 1, year: int = 2020, extensions: int = 0) -> bytes:
+    """
+    Builds a valid 128-byte EDID base block. Used for the sample corpus and the
+    emulated DDC backends; interface=None makes an EDID 1.3 analog display.
+    """
+    block = bytearray(EDID_BLOCK_SIZE)
+    block[0:8] = EDID_HEADER
+    mfg_raw = 0
+    for ch in manufacturer.upper()[:3]:
+        mfg_raw = (mfg_raw << 5) | (ord(ch) - ord('A') + 1)
+    block[8] = mfg_raw >> 8
+    block[9] = mfg_raw & 0xFF
+    struct.pack_into("<HI", block, 10, product_code, serial_number)
+    block[16] = week
+    block[17] = year - 1990
+    block[18] = 1
+    if interface is None:
+        block[19] = 3
+        block[20] = 0x00
+    else:
+        block[19] = 4
+        block[20] = 0x80 | 0x20 | (interface & 0x0F)  # digital, 8 bits per color
+    block[21], block[22] = 60, 34  # Screen size (cm)
+    block[23] = 120  # Gamma 2.2
+    block[24] = 0x0A
+
+    descriptors = [_DTD_1080P]
+    if name is not None:
+        descriptors.append(_text_descriptor(DESCRIPTOR_NAME, name))
+    if serial is not None:
+        descriptors.append(_text_descriptor(DESCRIPTOR_SERIAL, serial))
+    for text in texts:
+        descriptors.append(_text_descriptor(DESCRIPTOR_TEXT, text))
+    while len(descriptors) < 4:
+        descriptors.append(bytes([0, 0, 0, 0x10, 0]) + b"\x00" * 13)  # Dummy descriptor
+    for i, desc in enumerate(descriptors[:4]):
+        block[54 + i * 18:72 + i * 18] = desc
+
+    block[126] = extensions
+    block[127] = (-sum(block[:127])) % 256
+    return bytes(block)
+
+
+def _text_descriptor(tag: int, text: str) -> bytes:
+    payload = text.encode('ascii')[:13]
+    if len(payload) < 13:
+        payload += b"\x0a" + b"\x20" * (12 - len(payload))
+    return bytes([0, 0, 0, tag, 0]) + payload
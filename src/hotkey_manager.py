@@ -1,8 +1,8 @@
 import json
 import os
 import logging
-from pynput import keyboard
-from typing import Callable, Dict
+import threading
+from typing import Callable, Dict, Optional, Tuple
 from monitor_utils import INPUT_SOURCES
 
 # Reverse mapping for user config
@@ -12,35 +12,103 @@ INPUT_NAME_TO_VAL.update({
     "HDMI1": 0x11, "HDMI2": 0x12, "DP": 0x0F, "DisplayPort": 0x0F, "USBC": 0x1B
 })
 
+def resolve_source(raw_source) -> Optional[int]:
+    """
+    Resolves a configured source (VCP value or name/alias like "HDMI-1", "DP") to its VCP value.
+    """
+    if isinstance(raw_source, int):
+        return raw_source
+    if isinstance(raw_source, str):
+        # Try exact match or alias
+        src_val = INPUT_NAME_TO_VAL.get(raw_source)
+        if src_val is not None:
+            return src_val
+        # Try case-insensitive lookup if failed
+        for name, val in INPUT_NAME_TO_VAL.items():
+            if name.lower() == raw_source.lower():
+                return val
+    return None
+
+def resolve_monitor(action: Dict) -> Optional[Tuple[Optional[str], Optional[int]]]:
+    """
+    Reads the monitor a binding targets: {"monitor": "<uid>"} (stable, see the tray's monitor list
+    or kvm.log) and/or {"monitor_idx": n} (scan order, used if the uid isn't connected).
+    Returns (uid, index) for MonitorManager.find_monitor(), or None if neither is given.
+    """
+    uid = action.get("monitor")
+    index = action.get("monitor_idx")
+    if uid is None and index is None:
+        return None
+    try:
+        return (str(uid) if uid is not None else None, int(index) if index is not None else None)
+    except (TypeError, ValueError):
+        return None
+
 class HotkeyManager:
+    """
+    Global hotkeys from hotkeys.json.
+
+    One keyboard listener runs for the lifetime of the app. Key events are looked up in a
+    dispatch table (key -> bindings containing that key); reload() builds the new table
+    completely and swaps it in with a single assignment, so a reload never leaves a gap
+    without bindings and costs the key-event path nothing.
+    """
     CONFIG_FILE = "hotkeys.json"
     
-    def __init__(self, switch_callback: Callable[[int, int], None]):
+    def __init__(self, switch_callback: Callable[[Tuple, int], None],
+                 scene_callback: Optional[Callable[[str], None]] = None):
         """
-        switch_callback: function(monitor_idx, source_value)
+        switch_callback: function(target, source_value), target as returned by resolve_monitor()
+        scene_callback: function(scene_name), for bindings like {"scene": "Work PC"}
         """
         self.switch_callback = switch_callback
+        self.scene_callback = scene_callback
         self.listener = None
         self.config = {}
         self.config_path = os.path.join(os.getcwd(), self.CONFIG_FILE)
+        # key -> ((frozenset of keys, action), ...); replaced as a whole, never modified
+        self._table: Dict[object, Tuple] = {}
+        self._pressed = set()  # Only touched by the listener thread
+        self._reload_lock = threading.Lock()
         self.load_config()
+        self._table = self._build_table(self.config)
 
     def load_config(self):
         if not os.path.exists(self.config_path):
             self.create_default_config()
         
+        config = self._read_config()
+        self.config = config if config is not None else {}
+
+    def _read_config(self) -> Optional[Dict]:
         try:
             with open(self.config_path, 'r') as f:
-                self.config = json.load(f)
+                config = json.load(f)
+            if not isinstance(config, dict):
+                raise ValueError("expected an object of key combination -> action")
             logging.info(f"Loaded hotkeys from {self.config_path}")
+            return config
         except Exception as e:
             logging.error(f"Failed to load hotkeys: {e}")
-            self.config = {}
+            return None
 
-    def reload(self):
-        self.stop()
-        self.load_config()
-        self.start()
+    def reload(self) -> bool:
+        """
+        Re-reads hotkeys.json and swaps in the new bindings; safe to call from any thread.
+        A file that can't be read or parsed keeps the current bindings. Returns True if applied.
+        """
+        with self._reload_lock:
+            config = self._read_config()
+            if config is None:
+                logging.warning("Keeping the current hotkeys.")
+                return False
+            table = self._build_table(config)
+            self.config = config
+            # The listener sees either the old or the new table, never a partial one
+            self._table = table
+        if self.listener is None:
+            self.start()
+        return True
 
     def create_default_config(self):
         # Default mapping using human readable strings
@@ -55,59 +123,102 @@ class HotkeyManager:
         except Exception as e:
             logging.error(f"Failed to create default config: {e}")
 
-    def start(self):
-        if self.listener:
-            self.listener.stop()
+    def _build_table(self, config: Dict) -> Dict[object, Tuple]:
+        """
+        Validates the bindings of `config` and returns the dispatch table; invalid bindings are skipped.
+        """
+        # pynput is imported on first use: it is slow to load and scenes/the CLI only need the parsing helpers
+        from pynput.keyboard import HotKey
         
-        # Build mapping for pynput
-        hotkey_map = {}
+        bindings = []
         
-        for keys, action in self.config.items():
-            # Check validity
-            if "monitor_idx" in action and "source" in action:
-                mon_idx = int(action["monitor_idx"])
+        for keys, action in config.items():
+            if not isinstance(action, dict):
+                logging.warning(f"Invalid action for hotkey '{keys}': {action}")
+                continue
+            
+            # Scene bindings switch several monitors at once
+            if "scene" in action:
+                if not self.scene_callback:
+                    continue
+                
+                def action_func(name=str(action["scene"])):
+                    logging.info(f"Hotkey triggered! Apply scene '{name}'")
+                    self.scene_callback(name)
+            else:
+                # Check validity
+                target = resolve_monitor(action)
+                if target is None or "source" not in action:
+                    logging.warning(f"Incomplete action for hotkey '{keys}': {action}")
+                    continue
                 raw_source = action["source"]
                 
                 # Resolve source
-                src_val = None
-                if isinstance(raw_source, int):
-                    src_val = raw_source
-                elif isinstance(raw_source, str):
-                    # Try exact match or alias
-                    src_val = INPUT_NAME_TO_VAL.get(raw_source)
-                    # Try case-insensitive lookup if failed
-                    if src_val is None:
-                        for name, val in INPUT_NAME_TO_VAL.items():
-                            if name.lower() == raw_source.lower():
-                                src_val = val
-                                break
+                src_val = resolve_source(raw_source)
                 
                 if src_val is None:
                     logging.warning(f"Invalid source '{raw_source}' for hotkey '{keys}'")
                     continue
 
                 # capture closure
-                def action_func(m=mon_idx, s=src_val):
-                    logging.info(f"Hotkey triggered! Switch Mon {m} -> {s:02X}")
+                def action_func(m=target, s=src_val):
+                    logging.info(f"Hotkey triggered! Switch Mon {m[0] or m[1]} -> {s:02X}")
                     self.switch_callback(m, s)
-                
-                try:
-                    hotkey_map[keys] = action_func
-                except Exception as e:
-                    logging.error(f"Failed to bind '{keys}': {e}")
+            
+            try:
+                parsed = frozenset(HotKey.parse(keys))
+            except ValueError as e:
+                logging.error(f"Failed to bind '{keys}': {e}")
+                continue
+            bindings.append((parsed, action_func))
         
-        if not hotkey_map:
+        if not bindings:
             logging.warning("No valid hotkeys to bind.")
+        
+        table = {}
+        for parsed, action_func in bindings:
+            for key in parsed:
+                table.setdefault(key, []).append((parsed, action_func))
+        return {key: tuple(entries) for key, entries in table.items()}
+
+    def start(self):
+        if self.listener:
             return
 
         try:
-            self.listener = keyboard.GlobalHotKeys(hotkey_map)
+            from pynput import keyboard
+            self.listener = keyboard.Listener(on_press=self._on_press, on_release=self._on_release)
             self.listener.start()
-            logging.info("GlobalHotKeys listener started.")
+            logging.info("Hotkey listener started.")
         except Exception as e:
+            self.listener = None
             logging.error(f"Failed to start hotkey listener: {e}")
 
     def stop(self):
         if self.listener:
             self.listener.stop()
             self.listener = None
+        self._pressed.clear()
+
+    def _on_press(self, key, injected=False):
+        # pynput >= 1.8 passes `injected` (synthetic events, e.g. from remote tools); ignore those like GlobalHotKeys
+        listener = self.listener
+        if injected or listener is None:
+            return
+        key = listener.canonical(key)
+        if key in self._pressed:
+            return  # Auto-repeat
+        self._pressed.add(key)
+        # Same rule as pynput's HotKey: fire when the last missing key of a combination goes down
+        for keys, action_func in self._table.get(key, ()):
+            if keys <= self._pressed:
+                try:
+                    action_func()
+                except Exception as e:
+                    logging.error(f"Hotkey action failed: {e}")
+
+    def _on_release(self, key, injected=False):
+        listener = self.listener
+        if injected or listener is None:
+            return
+        self._pressed.discard(listener.canonical(key))
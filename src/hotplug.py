@@ -0,0 +1,290 @@
+import glob
+import hashlib
+import logging
+import os
+import select
+import socket
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Debouncer:
+    """
+    Coalesces bursts of trigger() calls into a single callback, fired once no new
+    trigger arrived for `delay` seconds. hold() postpones firing further, e.g. while
+    an input switch makes the monitor drop off and come back on the bus.
+    """
+    def __init__(self, callback: Callable[[], None], delay: float = 0.4):
+        self.callback = callback
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._timer = None
+        self._pending = False
+        self._hold_until = 0.0
+
+    def trigger(self):
+        with self._lock:
+            self._pending = True
+            self._schedule(self.delay)
+
+    def hold(self, seconds: float):
+        """
+        Suppress firing for the next `seconds`. Triggers arriving meanwhile still fire once afterwards.
+        """
+        with self._lock:
+            self._hold_until = max(self._hold_until, time.monotonic() + seconds)
+            if self._pending:
+                self._schedule(self.delay)
+
+    def cancel(self):
+        with self._lock:
+            self._pending = False
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+    def _schedule(self, delay: float):
+        # Caller holds self._lock
+        delay = max(delay, self._hold_until - time.monotonic())
+        if self._timer:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._fire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _fire(self):
+        with self._lock:
+            remaining = self._hold_until - time.monotonic()
+            if remaining > 0:
+                self._schedule(remaining)
+                return
+            if not self._pending:
+                return
+            self._pending = False
+            self._timer = None
+        try:
+            self.callback()
+        except Exception as e:
+            logger.error(f"Hot-plug callback failed: {e}")
+
+
+class DrmHotplugSource:
+    """
+    Linux hot-plug detection from DRM connector state under /sys/class/drm.
+
+    Kernel uevents (NETLINK_KOBJECT_UEVENT) wake us up immediately; the connector
+    status and EDID files are then compared against the last snapshot. If the netlink socket
+    is unavailable we fall back to polling the status files, which is cheap and
+    causes no DDC traffic. `sysfs_root` can point at a fake tree for testing.
+    """
+    NETLINK_KOBJECT_UEVENT = 15
+
+    def __init__(self, on_change: Callable[[], None], sysfs_root: str = "/sys/class/drm",
+                 poll_interval: float = 0.5, use_uevents: bool = True):
+        self.on_change = on_change
+        self.sysfs_root = sysfs_root
+        self.poll_interval = poll_interval
+        self.use_uevents = use_uevents
+        self._snapshot = self.read_connectors()
+        self._stop = threading.Event()
+        self._thread = None
+        self._sock = None
+
+    def read_connectors(self) -> Dict[str, Tuple[str, Optional[str]]]:
+        """
+        Returns { "card0-DP-1": ("connected", edid hash), ... } for every connector with a status file.
+        The EDID catches one monitor swapped for another on the same connector, which stays "connected".
+        """
+        connectors = {}
+        for status_path in glob.glob(os.path.join(self.sysfs_root, "card*-*", "status")):
+            conn_dir = os.path.dirname(status_path)
+            name = os.path.basename(conn_dir)
+            try:
+                with open(status_path, 'r') as f:
+                    status = f.read().strip()
+            except OSError:
+                continue
+            connectors[name] = (status, self._edid_hash(conn_dir))
+        return connectors
+
+    @staticmethod
+    def _edid_hash(conn_dir: str) -> Optional[str]:
+        # The kernel's cached copy: reading it causes no DDC traffic
+        try:
+            with open(os.path.join(conn_dir, "edid"), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        return hashlib.sha1(data).hexdigest()[:16] if data else None
+
+    def poll_once(self) -> bool:
+        """
+        Compares connector state with the previous snapshot.
+        Calls on_change and returns True if anything was plugged, unplugged or swapped.
+        """
+        current = self.read_connectors()
+        if current == self._snapshot:
+            return False
+        changed = sorted(k for k in set(current) | set(self._snapshot)
+                         if current.get(k) != self._snapshot.get(k))
+        logger.info(f"Display connectors changed: {', '.join(changed)}")
+        self._snapshot = current
+        self.on_change()
+        return True
+
+    def start(self):
+        if self.use_uevents:
+            self._sock = self._open_uevent_socket()
+        self._thread = threading.Thread(target=self._run, name="kvm-hotplug", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._sock:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def _open_uevent_socket(self) -> Optional[socket.socket]:
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, self.NETLINK_KOBJECT_UEVENT)
+            sock.bind((0, 1))  # Group 1: kernel uevents
+            return sock
+        except (AttributeError, OSError) as e:
+            logger.info(f"Kernel uevents unavailable ({e}); polling DRM connector status instead.")
+            return None
+
+    def _run(self):
+        while not self._stop.is_set():
+            sock = self._sock
+            if sock is None:
+                self._stop.wait(self.poll_interval)
+            else:
+                try:
+                    # The timeout keeps a safety-net poll in case a uevent got lost
+                    ready, _, _ = select.select([sock], [], [], 5.0)
+                    if ready and b"SUBSYSTEM=drm" not in sock.recv(8192):
+                        continue
+                except OSError:
+                    if self._stop.is_set():
+                        break
+                    self._sock = None
+                    continue
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"Hot-plug poll failed: {e}")
+
+
+class WindowsDisplayChangeSource:
+    """
+    Windows hot-plug detection: a hidden top-level window that receives the
+    WM_DISPLAYCHANGE and WM_DEVICECHANGE broadcasts on its own message loop thread.
+    """
+    WM_DESTROY = 0x0002
+    WM_CLOSE = 0x0010
+    WM_DISPLAYCHANGE = 0x007E
+    WM_DEVICECHANGE = 0x0219
+    DBT_DEVNODES_CHANGED = 0x0007
+
+    def __init__(self, on_change: Callable[[], None]):
+        self.on_change = on_change
+        self._hwnd = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="kvm-hotplug", daemon=True)
+        self._thread.start()
+        self._ready.wait(2.0)
+        if not self._hwnd:
+            raise OSError("Could not create display change window")
+
+    def stop(self):
+        if self._hwnd:
+            import ctypes
+            ctypes.windll.user32.PostMessageW(self._hwnd, self.WM_CLOSE, 0, 0)
+
+    def _run(self):
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+        LRESULT = ctypes.c_ssize_t
+        WNDPROC = ctypes.WINFUNCTYPE(LRESULT, wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+
+        class WNDCLASSW(ctypes.Structure):
+            _fields_ = [
+                ("style", wintypes.UINT),
+                ("lpfnWndProc", WNDPROC),
+                ("cbClsExtra", ctypes.c_int),
+                ("cbWndExtra", ctypes.c_int),
+                ("hInstance", wintypes.HINSTANCE),
+                ("hIcon", wintypes.HICON),
+                ("hCursor", wintypes.HANDLE),
+                ("hbrBackground", wintypes.HBRUSH),
+                ("lpszMenuName", wintypes.LPCWSTR),
+                ("lpszClassName", wintypes.LPCWSTR),
+            ]
+
+        user32.DefWindowProcW.argtypes = [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+        user32.DefWindowProcW.restype = LRESULT
+
+        def wnd_proc(hwnd, msg, wparam, lparam):
+            if msg == self.WM_DISPLAYCHANGE or (msg == self.WM_DEVICECHANGE and wparam == self.DBT_DEVNODES_CHANGED):
+                try:
+                    self.on_change()
+                except Exception as e:
+                    logger.error(f"Hot-plug callback failed: {e}")
+            elif msg == self.WM_DESTROY:
+                user32.PostQuitMessage(0)
+                return 0
+            return user32.DefWindowProcW(hwnd, msg, wparam, lparam)
+
+        # Keep a reference so the callback isn't garbage collected while the window lives
+        self._wnd_proc = WNDPROC(wnd_proc)
+
+        wc = WNDCLASSW()
+        wc.lpfnWndProc = self._wnd_proc
+        wc.hInstance = kernel32.GetModuleHandleW(None)
+        wc.lpszClassName = "KVMSwitcherDisplayWatcher"
+        user32.RegisterClassW(ctypes.byref(wc))
+
+        # A hidden top-level window (message-only windows don't get broadcasts)
+        self._hwnd = user32.CreateWindowExW(0, wc.lpszClassName, "KVM Switcher", 0,
+                                            0, 0, 0, 0, None, None, wc.hInstance, None)
+        self._ready.set()
+        if not self._hwnd:
+            return
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        self._hwnd = None
+
+
+def create_hotplug_source(on_change: Callable[[], None]):
+    """
+    Returns a started hot-plug event source for this platform, or None if there
+    is none (callers should then fall back to periodic polling).
+    """
+    try:
+        if sys.platform == "win32":
+            source = WindowsDisplayChangeSource(on_change)
+        elif sys.platform.startswith("linux") and os.path.isdir("/sys/class/drm"):
+            source = DrmHotplugSource(on_change)
+        else:
+            return None
+        source.start()
+        return source
+    except Exception as e:
+        logger.warning(f"Hot-plug detection unavailable: {e}")
+        return None
@@ -0,0 +1,65 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class InputStateCache:
+    """
+    Last known input source per monitor, fed by scans, switches and verification reads.
+
+    Entries carry their origin and age, which decide what they may be used for:
+    - READ entries come from the monitor itself (scan, pre-switch or verification read).
+    - WRITE entries are sources we sent but the monitor has not confirmed yet.
+
+    A remembered source that differs from a switch target is enough to go straight to the
+    write (the worst case is one redundant switch). Skipping a switch is only done from a
+    recent READ entry, since the user may have changed inputs with the monitor's own buttons.
+    """
+    READ = 'read'
+    WRITE = 'write'
+
+    def __init__(self, ttl: float = 300.0, confirm_ttl: float = 10.0):
+        """
+        ttl: how long an entry is trusted at all.
+        confirm_ttl: how long a READ entry is trusted to skip a switch without re-reading.
+        """
+        self.ttl = ttl
+        self.confirm_ttl = confirm_ttl
+        self._lock = threading.Lock()
+        # key -> (source, origin, monotonic timestamp)
+        self._states: Dict[str, Tuple[int, str, float]] = {}
+
+    def put(self, key: str, source: Optional[int], origin: str = READ):
+        if source is None:
+            return
+        with self._lock:
+            self._states[key] = (int(source), origin, time.monotonic())
+
+    def get(self, key: str, max_age: Optional[float] = None, confirmed: bool = False) -> Optional[int]:
+        """
+        Returns the remembered source if it is younger than max_age (default: ttl),
+        and only READ entries if `confirmed` is set. None if unknown or stale.
+        """
+        with self._lock:
+            entry = self._states.get(key)
+        if entry is None:
+            return None
+        source, origin, stamp = entry
+        if confirmed and origin != self.READ:
+            return None
+        if time.monotonic() - stamp > (self.ttl if max_age is None else max_age):
+            return None
+        return source
+
+    def is_confirmed(self, key: str, source: int) -> bool:
+        """
+        True if the monitor recently reported `source` itself, so switching to it can be skipped.
+        """
+        return self.get(key, self.confirm_ttl, confirmed=True) == source
+
+    def invalidate(self, key: Optional[str] = None):
+        with self._lock:
+            if key is None:
+                self._states.clear()
+            else:
+                self._states.pop(key, None)
@@ -1,6 +1,6 @@
 import pystray
 from pystray import MenuItem as Item, Menu
-from PIL import Image, ImageDraw
+from PIL import Image
 import threading
 import time
 import logging
@@ -11,68 +11,261 @@ import ctypes
 # Ensure src is in path if running from parent
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from monitor_utils import MonitorManager
+from monitor_utils import MonitorManager, INPUT_SOURCES
 from config_manager import ConfigManager
-from hotkey_manager import HotkeyManager
+from hotkey_manager import resolve_source
+from hotplug import Debouncer, create_hotplug_source
+from menu_model import MenuModel
+from process_lock import SingleInstance
+from metrics import MetricsFileExporter, MetricsHTTPServer
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Only what the icon and menu need is imported up front. pynput (hotkeys), scenes, the config watcher
+# and the control endpoint are imported and started by _start_services() once the icon is up.
 
 class KVMApp:
+    # Fallback rescan period when no hot-plug event source is available
+    POLL_INTERVAL = 30
+    # How long an input switch may make the monitor drop off the bus (hot-plug events are held meanwhile)
+    SWITCH_SETTLE_TIME = 3.0
+    # Pause between background capability probes so they stay out of the way of switches
+    IDLE_PROBE_GAP = 0.5
+    # OpenMetrics file next to kvm.log; set KVM_METRICS_PORT to also serve http://127.0.0.1:<port>/metrics
+    METRICS_FILE = "kvm_metrics.prom"
+
     def __init__(self):
+        """
+        Sets up state only; run() shows the icon first and starts everything else afterwards.
+        """
         self.monitors = []
         self.icon = None
         self.scanning = False
+        self.first_scan_done = threading.Event()  # Until then the menu says "Scanning monitors..."
+        # Hotkeys/scenes/menu switches that came in before the first scan had monitor handles;
+        # key -> action, the newest request per target wins like in the switch queue
+        self._deferred = {}
+        self._deferred_lock = threading.Lock()
         self.should_exit = False
+        self.show_admin_warning = False
+        
+        # Started by _start_services()
+        self.metrics_file = None
+        self.metrics_server = None
+        self.hotplug = None
+        self.scene_mgr = None
+        self.hotkey_mgr = None
+        self.config_watcher = None
+        self.control_server = None
+        
+        # The menu is re-rendered only when what it shows changed
+        self.menu_model = MenuModel()
+        self._menu_lock = threading.Lock()
         
-        # Start background scanner
+        # Hot-plug events trigger rescans; bursts are coalesced into one debounced rescan
+        self._rescan_event = threading.Event()
+        self.rescan_debouncer = Debouncer(self.request_rescan)
+        # A rescan requested while a manual refresh runs is kept here and run after it
+        self._scan_state_lock = threading.Lock()
+        self._rescan_pending = False
+        
+        # Scans only list monitors; capabilities are probed later, menu/hotkey requests first
+        self._probe_lock = threading.Lock()
+        self._probe_requests = []
+        self._probe_failed = set()
+        self._probe_event = threading.Event()
+
+    def _start_services(self):
+        """
+        Everything that isn't needed to show the icon: runs on pystray's setup thread once it is visible.
+        The scanner goes first so the menu fills in as early as possible.
+        """
+        self.hotplug = create_hotplug_source(self.rescan_debouncer.trigger)
+        self.probe_thread = threading.Thread(target=self._deferred_probe_loop, daemon=True)
+        self.probe_thread.start()
         self.scanner_thread = threading.Thread(target=self._monitor_scanner_loop, daemon=True)
         self.scanner_thread.start()
         
+        # Scenes switch several monitors with one hotkey/menu item
+        from scene_manager import SceneManager
+        self.scene_mgr = SceneManager()
+        
         # Start Hotkey Manager
-        self.hotkey_mgr = HotkeyManager(self.on_hotkey_switch)
-        self.hotkey_mgr.start()
+        try:
+            from hotkey_manager import HotkeyManager
+            self.hotkey_mgr = HotkeyManager(self.on_hotkey_switch, self.on_scene_switch)
+            self.hotkey_mgr.start()
+        except Exception as e:
+            logging.error(f"Hotkeys unavailable: {e}")
+        
+        # Edits to hotkeys.json/scenes.json (e.g. saved by the settings UI) apply without "Reload"
+        from config_watcher import ConfigWatcher
+        watched = [self.scene_mgr.config_path] + ([self.hotkey_mgr.config_path] if self.hotkey_mgr else [])
+        self.config_watcher = ConfigWatcher(watched, self._on_config_changed).start()
+        
+        # Local endpoint for scripts and the kvm.py CLI
+        try:
+            from control_server import ControlServer
+            self.control_server = ControlServer(self.handle_control).start()
+        except Exception as e:
+            logging.error(f"Failed to start control endpoint: {e}")
+        
+        self.metrics_file = MetricsFileExporter(os.path.join(os.getcwd(), self.METRICS_FILE)).start()
+        metrics_port = os.environ.get("KVM_METRICS_PORT")
+        if metrics_port:
+            try:
+                self.metrics_server = MetricsHTTPServer(int(metrics_port)).start()
+                logging.info(f"Serving metrics on http://127.0.0.1:{self.metrics_server.port}/metrics")
+            except Exception as e:
+                logging.error(f"Failed to start metrics endpoint on port {metrics_port}: {e}")
 
         # Check for Admin Privileges
         try:
             is_admin = ctypes.windll.shell32.IsUserAnAdmin()
             if not is_admin:
                 logging.warning("Not running as Admin. Hotkeys might not work in some apps.")
-                # Show a toast notification if possible, or just log for now.
-                # Pystray notify requires icon to be running, so we can't do it in init easily before icon.run()
-                # We'll rely on the log default, but maybe trigger a notification after icon start.
                 self.show_admin_warning = True
-            else:
-                self.show_admin_warning = False
         except Exception:
             logging.warning("Failed to check admin privileges.")
-            self.show_admin_warning = False
-
-    def on_hotkey_switch(self, monitor_idx, source_value):
-        # We need to find the monitor object by index? 
-        # But monitor_idx depends on the order in self.monitors which changes on scan?
-        # Ideally, hotkeys should bind to Serial Number or ID.
-        # For now, we use the index in the 'monitors' list as a naive approach.
         
-        # If monitors haven't been scanned yet, we might miss.
+        if self.icon and self.show_admin_warning:
+            self.icon.notify(
+                "Hotkeys may not work in games or admin apps without Admin privileges.",
+                title="KVM Switcher: Not running as Admin"
+            )
+        # Scenes are known now
+        self.refresh_menu()
+
+    def on_hotkey_switch(self, target, source_value):
+        """
+        target: (uid, index) from hotkeys.json, a uid, or a scan index; see MonitorManager.find_monitor().
+        Also used by the menu, whose items name monitors the same way.
+        """
+        if self._defer_until_scanned(('switch', target), lambda: self.on_hotkey_switch(target, source_value)):
+            return
+        if not self.monitors:
+            logging.warning("Switch requested but no monitors detected yet.")
+            return
+
+        # Constant-time lookup in the index of the last scan; a uid finds the monitor wherever it enumerated
+        mon = MonitorManager.find_monitor(target)
+        if mon is None:
+            logging.warning(f"Target monitor {target} not found.")
+            return
+        # The switch doesn't need capabilities, but the menu will want this monitor next
+        self.request_probe(mon)
+        self.on_switch_input(mon['monitor_obj'], source_value)
+
+    def on_scene_switch(self, scene_name):
+        """
+        Applies a scene: switches all its monitors concurrently and reports the result per monitor.
+        """
+        if self._defer_until_scanned(('scene', scene_name), lambda: self.on_scene_switch(scene_name)):
+            return
+        targets = self.scene_mgr.get_targets(scene_name)
+        if not targets:
+            logging.warning(f"Scene '{scene_name}' not found or empty.")
+            return
         if not self.monitors:
-            logging.warning("Hotkey pressed but no monitors detected yet.")
+            logging.warning("Scene requested but no monitors detected yet.")
+            return
+
+        switch_targets = []
+        missing = []
+        for target, source_value in targets:
+            mon = MonitorManager.find_monitor(target)
+            if mon:
+                switch_targets.append((mon['monitor_obj'], source_value))
+            else:
+                missing.append(target[0] or target[1])
+
+        names = {id(m['monitor_obj']): m['name'] for m in self.monitors}
+        results = []
+        results_lock = threading.Lock()
+        start = time.monotonic()
+
+        def _report():
+            elapsed = time.monotonic() - start
+            failed = []
+            for r in results:
+                name = names.get(id(r['monitor_obj']), "?")
+                if r['ok']:
+                    logging.info(f"Scene '{scene_name}': {name} -> 0x{r['source']:02X} ({r['elapsed']:.2f}s)")
+                    self._set_current_input(r['monitor_obj'], r['source'])
+                elif r['superseded']:
+                    # A newer hotkey/scene for this monitor took over; that one reports itself
+                    logging.info(f"Scene '{scene_name}': {name} {r['error']}")
+                else:
+                    logging.error(f"Scene '{scene_name}': {name} failed: {r['error']}")
+                    failed.append(name)
+            failed += [f"Monitor {i} (not found)" for i in missing]
+
+            ok_count = len(targets) - len(failed)
+            logging.info(f"Scene '{scene_name}' applied to {ok_count}/{len(targets)} monitors in {elapsed:.2f}s")
+            self.refresh_menu()
+            if self.icon and failed:
+                self.icon.notify(f"Failed: {', '.join(failed)}", title=f"Scene '{scene_name}': {ok_count}/{len(targets)} switched")
+
+        def _done(result):
+            with results_lock:
+                results.append(result)
+                last = len(results) == len(switch_targets)
+            if last:
+                _report()
+
+        self.rescan_debouncer.hold(self.SWITCH_SETTLE_TIME)
+        if not switch_targets:
+            _report()
             return
+        # No thread of our own: the switch queue runs one worker per monitor and drops superseded targets
+        queue = MonitorManager.get_switch_queue()
+        for monitor_obj, source_value in switch_targets:
+            queue.submit(monitor_obj, source_value, on_done=_done)
 
-        target_monitor = None
-        # Find by ID match or list index? 
-        # MonitorManager assigns 'id' = list index.
+    def _set_current_input(self, monitor_obj, source_value):
+        # Immediately update internal state so menu reflects this
         for m in self.monitors:
-            if m['id'] == monitor_idx:
-                target_monitor = m['monitor_obj']
+            if m['monitor_obj'] == monitor_obj:
+                m['current_input'] = source_value
                 break
-        
-        if target_monitor:
-            self.on_switch_input(target_monitor, source_value)
-        else:
-            logging.warning(f"Hotkey target monitor {monitor_idx} not found.")
+        # The next start's snapshot shows the new source
+        MonitorManager.save_topology_snapshot()
+
+    def _defer_until_scanned(self, key, action):
+        """
+        Before the first scan there are no monitor handles, only the topology snapshot:
+        keeps `action` to run right after that scan (enumeration only, no DDC) and returns True.
+        Returns False once the first scan is done.
+        """
+        with self._deferred_lock:
+            if self.first_scan_done.is_set():
+                return False
+            # Re-inserted so requests run in the order of their latest press
+            self._deferred.pop(key, None)
+            self._deferred[key] = action
+        logging.info(f"Monitors not enumerated yet; {key[0]} {key[1]} runs after the first scan")
+        return True
+
+    def _run_deferred(self):
+        with self._deferred_lock:
+            actions, self._deferred = list(self._deferred.values()), {}
+        for action in actions:
+            try:
+                action()
+            except Exception as e:
+                logging.error(f"Deferred request failed: {e}")
+
+    # Pre-rendered tray icon (what create_image() draws), so startup needs no drawing
+    ICON_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon.png")
+
+    def load_image(self):
+        try:
+            return Image.open(self.ICON_FILE)
+        except OSError as e:
+            logging.warning(f"Pre-rendered icon unavailable ({e}); drawing it")
+            return self.create_image()
 
     def create_image(self):
+        from PIL import ImageDraw
+        
         # Create a simple icon (Monitor shape)
         # 64x64
         width = 64
@@ -93,43 +286,197 @@ class KVMApp:
         
         return image
 
+    def request_rescan(self):
+        """
+        Wakes the scanner thread for an immediate rescan.
+        """
+        self._rescan_event.set()
+
+    def scan_now(self, lazy=True):
+        """
+        Incremental rescan whose result goes to the menu and the deferred prober.
+        Used by the scanner thread and the control endpoint; returns the monitors.
+        """
+        self.scanning = True
+        try:
+            # Only monitors that appeared or changed are probed (deferred, see _deferred_probe_loop);
+            # the rest just get their source re-read
+            self.monitors = MonitorManager.get_connected_monitors(incremental=True, lazy=lazy, persist=True,
+                                                                  raise_errors=True)
+        except Exception as e:
+            # A failed scan says nothing about the monitors; keep listing the previous ones
+            logging.error(f"Scanner error: {e}")
+        finally:
+            self.scanning = False
+            with self._deferred_lock:
+                self.first_scan_done.set()
+        # Hotkeys pressed during startup, now that the monitors have handles
+        self._run_deferred()
+        
+        with self._probe_lock:
+            self._probe_failed.clear()
+        self._probe_event.set()
+        
+        # Update menu dynamically by re-assigning it
+        self.refresh_menu()
+        return self.monitors
+
     def _monitor_scanner_loop(self):
         while not self.should_exit:
-            if not self.scanning:
-                self.scanning = True
-                try:
-                    self.monitors = MonitorManager.get_connected_monitors()
-                except Exception as e:
-                    logging.error(f"Scanner error: {e}")
-                
-                self.scanning = False
-                
-                # Update menu dynamically by re-assigning it
-                if self.icon:
-                    self.icon.menu = self.build_menu()
+            self._rescan_event.clear()
+            with self._scan_state_lock:
+                busy = self.scanning
+                if busy:
+                    # A manual refresh is running; it requests this rescan again when it is done
+                    self._rescan_pending = True
+            if not busy:
+                self.scan_now()
             
-            # Sleep 30 seconds
-            for _ in range(30): 
-                if self.should_exit: break
-                time.sleep(1)
-
-    def on_switch_input(self, monitor_obj, source_value):
-        def _task():
-            # Change icon to indicate activity?
-            logging.info(f"Switching input to {source_value}...")
-            MonitorManager.set_input_source(monitor_obj, source_value)
+            # Sleep until a hot-plug event arrives. Without an event source, poll every 30 seconds.
+            self._rescan_event.wait(None if self.hotplug else self.POLL_INTERVAL)
+
+    def request_probe(self, mon):
+        """
+        Moves a lazily listed monitor to the front of the deferred probe queue.
+        """
+        if mon['monitor_obj'] is None or not MonitorManager.needs_probe(mon):
+            return
+        with self._probe_lock:
+            if any(r is mon for r in self._probe_requests):
+                return
+            self._probe_requests.append(mon)
+        self._probe_event.set()
+
+    def _next_probe(self):
+        with self._probe_lock:
+            while self._probe_requests:
+                mon = self._probe_requests.pop(0)
+                if MonitorManager.needs_probe(mon) and id(mon['monitor_obj']) not in self._probe_failed:
+                    return mon, True
+            for mon in self.monitors:
+                if MonitorManager.needs_probe(mon) and id(mon['monitor_obj']) not in self._probe_failed:
+                    return mon, False
+        return None, False
+
+    def _deferred_probe_loop(self):
+        """
+        Completes monitors listed by the fast scan phase: capabilities and current source,
+        one monitor at a time. Requested monitors go first, the rest at idle pace.
+        """
+        while not self.should_exit:
+            self._probe_event.clear()
+            mon, requested = self._next_probe()
+            if mon is None:
+                self._probe_event.wait()
+                continue
             
-            # Immediately update internal state so menu reflects this
-            # Find the monitor entry
-            for m in self.monitors:
-                if m['monitor_obj'] == monitor_obj:
-                    m['current_input'] = source_value
-                    break
-                    
-            if self.icon: 
-                self.icon.menu = self.build_menu()
+            try:
+                MonitorManager.ensure_probed(mon)
+            except Exception as e:
+                logging.error(f"Failed to probe {mon['name']}: {e}")
+                with self._probe_lock:
+                    self._probe_failed.add(id(mon['monitor_obj']))
             
-        threading.Thread(target=_task).start()
+            # Names can change too (model from capabilities); re-rendered only if the menu shows something new
+            self.refresh_menu()
+            if not requested:
+                self._probe_event.wait(self.IDLE_PROBE_GAP)
+
+    def on_switch_input(self, monitor_obj, source_value, on_done=None):
+        """
+        Queues a switch; on_done(result) gets the switch queue's result once it ran or was superseded.
+        """
+        def _verified(confirmed, current, elapsed):
+            # The monitor may have refused the input (e.g. no signal there); show what it really reports
+            if current is not None and current != source_value:
+                self._set_current_input(monitor_obj, current)
+                self.refresh_menu()
+        
+        def _done(result):
+            if result['superseded']:
+                # A newer request for this monitor replaced this one before it ran
+                pass
+            elif not result['ok']:
+                logging.error(f"Switching to 0x{source_value:02X} failed: {result['error']}")
+            else:
+                self._set_current_input(monitor_obj, source_value)
+                self.refresh_menu()
+            if on_done:
+                on_done(result)
+
+        logging.info(f"Switching input to {source_value}...")
+        # The monitor may drop off and re-appear while it re-syncs; rescan once afterwards
+        self.rescan_debouncer.hold(self.SWITCH_SETTLE_TIME)
+        # Hotkey storms coalesce in the queue: at most one switch running and one waiting per monitor
+        MonitorManager.get_switch_queue().submit(monitor_obj, source_value, on_done=_done, on_verified=_verified)
+
+    def handle_control(self, request):
+        """
+        Serves a request from the control endpoint (see control_server and kvm.py).
+        status and switch answer from the cached state; only scan talks to the monitors.
+        """
+        cmd = request.get('cmd')
+        if cmd == 'status':
+            return {'ok': True, 'scanning': self.scanning, 'monitors': [self._describe_entry(m) for m in self.monitors]}
+        if cmd == 'scan':
+            monitors = self.scan_now(lazy=False)
+            return {'ok': True, 'scanning': False, 'monitors': [self._describe_entry(m) for m in monitors]}
+        if cmd == 'switch':
+            return self._control_switch(request)
+        return {'ok': False, 'error': f"unknown command {cmd!r}"}
+
+    def _control_switch(self, request):
+        target = request.get('monitor')
+        if isinstance(target, str) and target.isdigit():
+            target = int(target)
+        # Right after startup the monitors may only be known from the snapshot
+        self.first_scan_done.wait(float(request.get('timeout', 10.0)))
+        mon = MonitorManager.find_monitor(target) if target is not None else None
+        if mon is None:
+            return {'ok': False, 'error': f"monitor {target!r} not found"}
+        
+        raw_source = request.get('source')
+        source_value = resolve_source(raw_source)
+        if source_value is None and isinstance(raw_source, str):
+            try:
+                source_value = int(raw_source, 0)
+            except ValueError:
+                pass
+        if source_value is None:
+            return {'ok': False, 'error': f"unknown source {raw_source!r}"}
+        
+        if not request.get('wait', True):
+            self.on_switch_input(mon['monitor_obj'], source_value)
+            return {'ok': True, 'queued': True}
+        
+        done = threading.Event()
+        outcome = {}
+        
+        def _done(result):
+            outcome.update(ok=result['ok'], error=result['error'], elapsed=result['elapsed'],
+                           superseded=result['superseded'], coalesced=result['coalesced'])
+            done.set()
+        
+        self.on_switch_input(mon['monitor_obj'], source_value, on_done=_done)
+        if not done.wait(float(request.get('timeout', 10.0))):
+            return {'ok': False, 'error': "timed out waiting for the switch (it may still complete)"}
+        return outcome
+
+    @staticmethod
+    def _describe_entry(mon):
+        current = mon.get('current_input')
+        current_name = None
+        if current is not None:
+            names = {v: k for k, v in (mon['inputs'] or {}).items()}
+            current_name = names.get(current) or INPUT_SOURCES.get(current, f"Input {current:02X}")
+        return {
+            'id': mon['id'],
+            'uid': mon.get('uid'),
+            'name': mon['name'],
+            'current_input': current,
+            'current_name': current_name,
+            'inputs': mon['inputs'],
+        }
 
     def on_toggle_startup(self, icon, item):
         current = ConfigManager.is_run_at_startup()
@@ -138,20 +485,46 @@ class KVMApp:
     def on_refresh(self, icon, item):
         # Force refresh
         def _refresh():
-            self.scanning = True
-            # Update menu to show "Scanning..."
-            if self.icon: self.icon.menu = self.build_menu()
-            
-            self.monitors = MonitorManager.get_connected_monitors()
-            self.scanning = False
+            with self._scan_state_lock:
+                self.scanning = True
+            try:
+                # An explicit rescan also re-reads state other processes may have changed,
+                # and the capabilities, in case a cached copy is wrong
+                ConfigManager.invalidate_startup_state()
+                MonitorManager.get_caps_cache().invalidate()
+                # Update menu to show "Scanning..."
+                self.refresh_menu()
+                
+                self.monitors = MonitorManager.get_connected_monitors(persist=True, raise_errors=True)
+            except Exception as e:
+                logging.error(f"Rescan failed: {e}")
+            finally:
+                # Never leave the flag stuck, or the scanner would skip every later hot-plug rescan
+                with self._scan_state_lock:
+                    self.scanning = False
+                    pending, self._rescan_pending = self._rescan_pending, False
+                if pending:
+                    self.request_rescan()
             
-            if self.icon: self.icon.menu = self.build_menu()
+            self.refresh_menu()
         threading.Thread(target=_refresh).start()
 
     def on_exit(self, icon, item):
         self.should_exit = True
+        if self.config_watcher:
+            self.config_watcher.stop()
+        if self.control_server:
+            self.control_server.stop()
+        self.rescan_debouncer.cancel()
+        if self.hotplug:
+            self.hotplug.stop()
+        self._rescan_event.set()
         if self.hotkey_mgr:
             self.hotkey_mgr.stop()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        if self.metrics_file:
+            self.metrics_file.stop()
         icon.stop()
 
     def on_configure_hotkeys(self, icon, item):
@@ -177,83 +550,135 @@ class KVMApp:
             logging.error(f"Failed to open settings: {e}")
 
     def on_reload_hotkeys(self, icon, item):
+        if self.scene_mgr:
+            self.scene_mgr.load_config()
         if self.hotkey_mgr:
             self.hotkey_mgr.reload()
             logging.info("Hotkeys reloaded.")
 
+    def _on_config_changed(self, path):
+        # Runs on the watcher's thread; the reloads swap in fully built tables, hotkeys keep working meanwhile
+        if path == os.path.abspath(self.scene_mgr.config_path):
+            self.scene_mgr.load_config()
+        elif self.hotkey_mgr and path == os.path.abspath(self.hotkey_mgr.config_path):
+            if self.hotkey_mgr.reload():
+                logging.info("Hotkeys reloaded.")
+        self.refresh_menu()
+
+    def _build_input_items(self, row):
+        """
+        Items of a monitor's submenu: its inputs as radio items, the active one checked.
+        Queues the deferred probe if its inputs aren't known yet. pystray calls this when it
+        renders the menu, not when the submenu opens, so every listed monitor gets queued
+        (ahead of the idle pace); only hotkeys single out the monitor they need.
+        """
+        uid, index, _, inputs, current = row
+        # Rows are identities, not handles: a click goes to whatever handle the latest scan has
+        target = (uid, index)
+        if inputs is None:
+            mon = MonitorManager.find_monitor(target) if self.first_scan_done.is_set() else None
+            if mon is not None:
+                self.request_probe(mon)
+            return [Item("Loading inputs...", lambda: None, enabled=False)]
+        
+        def make_callback(t, v):
+            return lambda icon, item: self.on_hotkey_switch(t, v)
+        
+        input_items = []
+        for name, val in inputs:
+            input_items.append(Item(
+                name,
+                make_callback(target, val),
+                checked=lambda item, v=val: current == v,
+                radio=True
+            ))
+        
+        if not input_items:
+            curr_name = next((k for k, v in inputs if v == current), "Unknown")
+            input_items.append(Item(f"Current: {curr_name}", lambda: None, enabled=False))
+        
+        return input_items
+
+    def _menu_view(self):
+        scanning = self.scanning or not self.first_scan_done.is_set()
+        scene_names = self.scene_mgr.names() if self.scene_mgr and self.monitors else []
+        return MenuModel.make_view(self.monitors, scanning, scene_names)
+
+    def refresh_menu(self):
+        """
+        Re-renders the menu if anything it shows changed; call it after anything that may have.
+        """
+        if not self.icon:
+            return
+        with self._menu_lock:
+            view = self._menu_view()
+            if self.menu_model.update(view):
+                self.icon.menu = self._render_menu(view)
+
     def build_menu(self):
-        # Dynamic menu construction
+        view = self._menu_view()
+        self.menu_model.update(view)
+        return self._render_menu(view)
+
+    def _render_menu(self, view):
+        scanning, rows, scene_names = view
         items = []
         
-        if self.scanning:
+        if scanning:
             items.append(Item("Scanning monitors...", lambda: None, enabled=False))
-        elif not self.monitors:
-            items.append(Item("No monitors found", lambda: None, enabled=False))
+        if not rows:
+            if not items:
+                items.append(Item("No monitors found", lambda: None, enabled=False))
         else:
-            for mon in self.monitors:
-                # Submenu for each monitor
-                input_items = []
-                for name, val in mon['inputs'].items():
-                    # Check if this input is the currently active one
-                    # If so, skip it as requested by user ("Do not display current source")
-                    # if mon.get('current_input') == val:
-                    #     logging.info(f"Hiding input {name} ({val}) because it matches current: {mon.get('current_input')}")
-                    #     continue
-                     
-                    
-                    def make_callback(m, v):
-                        return lambda icon, item: self.on_switch_input(m, v)
-                        
-                    input_items.append(Item(
-                        name,
-                        make_callback(mon['monitor_obj'], val)
-                    ))
-                
-                # If no items (e.g. only 1 input and it's active), maybe show "Current: HDMI-1" disabled?
-                if not input_items:
-                    curr_val = mon.get('current_input')
-                    # Find name
-                    curr_name = "Unknown"
-                    for k,v in mon['inputs'].items(): 
-                        if v == curr_val: curr_name = k
-                    
-                    input_items.append(Item(f"Current: {curr_name}", lambda: None, enabled=False))
-
-                items.append(Item(mon['name'], Menu(*input_items)))
+            # Until the first scan is done these are the snapshot of the last run
+            for row in rows:
+                # Callable submenu, but pystray builds it with the rest of the menu, not on open
+                items.append(Item(row[2], Menu(lambda r=row: self._build_input_items(r))))
+        
+        if scene_names:
+            def make_scene_callback(name):
+                return lambda icon, item: self.on_scene_switch(name)
+            items.append(Item("Scenes", Menu(*[Item(n, make_scene_callback(n)) for n in scene_names])))
         
         items.append(Menu.SEPARATOR)
         items.append(Item("Configure Hotkeys", self.on_configure_hotkeys))
-        items.append(Item("Reload Hotkeys", self.on_reload_hotkeys))
+        items.append(Item("Reload Hotkeys & Scenes", self.on_reload_hotkeys))
         items.append(Menu.SEPARATOR)
         items.append(Item("Rescan Monitors", self.on_refresh))
+        # Cached by ConfigManager; toggling updates it, a rescan re-reads it
         items.append(Item("Run at Startup", self.on_toggle_startup, checked=lambda i: ConfigManager.is_run_at_startup()))
         items.append(Item("Exit", self.on_exit))
         
         return Menu(*items)
 
     def run(self):
+        """
+        Shows the icon and blocks until Exit. Returns False right away if the tray already runs.
+        """
+        instance = SingleInstance()
+        if not instance.acquire():
+            logging.warning("KVM Switcher is already running; not starting a second tray.")
+            return False
+        
+        # Last known monitors, so the menu and hotkey targets don't wait for the first scan
+        self.monitors = MonitorManager.load_topology_snapshot()
         # Call build_menu() immediately to pass a Menu object, not the method
-        logging.info("Building initial menu...")
         menu = self.build_menu()
-        logging.info("Creating icon...")
-        self.icon = pystray.Icon("KVM Switcher", self.create_image(), "KVM Switcher", menu=menu)
-        logging.info("Running icon...")
+        self.icon = pystray.Icon("KVM Switcher", self.load_image(), "KVM Switcher", menu=menu)
         logging.info("Running icon...")
-        
-        # Show specific startup notifications
-        def startup_notify():
-            time.sleep(2) # Wait for icon availability
-            if getattr(self, 'show_admin_warning', False):
-                self.icon.notify(
-                    "Hotkeys may not work in games or admin apps without Admin privileges.",
-                    title="KVM Switcher: Not running as Admin"
-                )
-        
-        threading.Thread(target=startup_notify, daemon=True).start()
-        
-        self.icon.run()
+        try:
+            self.icon.run(setup=self._on_icon_ready)
+        finally:
+            instance.release()
         logging.info("Icon run loop ended.")
+        return True
+
+    def _on_icon_ready(self, icon):
+        # pystray calls this on its own thread once the icon can be shown
+        icon.visible = True
+        self._start_services()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     app = KVMApp()
     app.run()
@@ -0,0 +1,50 @@
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+from metrics import REGISTRY
+
+MENU_RENDERS = REGISTRY.counter("kvm_menu_renders", "Tray menu rebuilds (skipped when nothing visible changed)")
+
+
+class MenuModel:
+    """
+    What the tray menu shows, as plain comparable data.
+
+    Rebuilding the pystray menu is not free (the backends recreate the native menu), and
+    most rescans and switches change nothing visible. update() takes the view of the
+    current state and says whether it differs from the one last rendered, so the tray
+    only reassigns icon.menu when there is something new to show.
+
+    A view is (scanning, monitor rows, scene names); a monitor row is
+    (uid, id, name, inputs as ((name, value), ...) or None while unknown, current input).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._view = None
+
+    @staticmethod
+    def monitor_row(mon: Dict) -> Tuple:
+        inputs = mon.get('inputs')
+        current = mon.get('current_input')
+        return (
+            mon.get('uid'),
+            mon['id'],
+            mon['name'],
+            tuple(inputs.items()) if inputs is not None else None,
+            int(current) if current is not None else None,
+        )
+
+    @staticmethod
+    def make_view(monitors: List[Dict], scanning: bool, scene_names: Sequence[str]) -> Tuple:
+        return bool(scanning), tuple(MenuModel.monitor_row(m) for m in monitors), tuple(scene_names)
+
+    def update(self, view: Tuple) -> bool:
+        """
+        Records `view`; True if it differs from the previous one and the menu needs rendering.
+        """
+        with self._lock:
+            if view == self._view:
+                return False
+            self._view = view
+        MENU_RENDERS.inc()
+        return True
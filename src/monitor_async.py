@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from monitor_utils import MonitorManager
+from retry_policy import cancellable
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMonitorManager:
+    """
+    asyncio front end of MonitorManager for embedders (control daemon, scripts).
+
+    The blocking DDC work runs on a bounded thread pool, so any number of concurrent
+    operations costs at most `max_workers` threads; the bus locks still serialize
+    traffic per monitor. Every operation has a timeout and can be cancelled. Cancelling
+    stops the retries at the next attempt (a DDC transaction already on the wire finishes
+    first) and raises asyncio.CancelledError / asyncio.TimeoutError in the caller.
+
+        async with AsyncMonitorManager() as manager:
+            monitors = await manager.scan()
+            await asyncio.gather(*(manager.switch(m['monitor_obj'], 0x0F) for m in monitors))
+    """
+    DEFAULT_TIMEOUTS = {
+        'scan': 30.0,
+        'switch': 5.0,
+        'read_vcp': 3.0,
+    }
+
+    def __init__(self, max_workers: int = 4, timeouts: Optional[Dict[str, float]] = None):
+        self.max_workers = max_workers
+        self.timeouts = dict(self.DEFAULT_TIMEOUTS)
+        self.timeouts.update(timeouts or {})
+        self._executor = None
+        self._lock = threading.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Stops the worker threads once the operations still running have finished.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    async def scan(self, incremental: bool = False, lazy: bool = False,
+                   timeout: Optional[float] = None) -> List[Dict]:
+        """
+        See MonitorManager.get_connected_monitors(). A cancelled scan leaves the previous topology in place.
+        """
+        return await self._run('scan', timeout, MonitorManager.get_connected_monitors, incremental, lazy)
+
+    async def switch(self, monitor, source_value: int, timeout: Optional[float] = None):
+        """
+        See MonitorManager.set_input_source(); returns once the command was written.
+        """
+        return await self._run('switch', timeout, MonitorManager.set_input_source, monitor, source_value)
+
+    async def read_vcp(self, monitor, code: int, timeout: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Returns (current value, maximum value) of VCP feature `code`.
+        """
+        return await self._run('read_vcp', timeout, MonitorManager.read_vcp, monitor, code)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="kvm-async")
+            return self._executor
+
+    async def _run(self, operation: str, timeout: Optional[float], func, *args):
+        if timeout is None:
+            timeout = self.timeouts[operation]
+        cancel = threading.Event()
+
+        def call():
+            with cancellable(cancel):
+                return func(*args)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), call)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{operation} timed out after {timeout:.1f}s")
+            raise
+        finally:
+            # After a timeout or cancellation a queued call never starts and a running one stops
+            # retrying; after completion nobody looks at the flag anymore
+            cancel.set()
@@ -1,12 +1,33 @@
 import re
+import sys
+import contextlib
+import contextvars
 import logging
-import time
 import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
 from monitorcontrol import get_monitors, Monitor
+from caps_cache import CapabilitiesCache
+from ddc_errors import DDCBusBusyError, DDCCancelledError, DDCCircuitOpenError, DDCDisconnectedError, DDCTransientError, classify_error
+from edid import parse_edid
+from input_state import InputStateCache
+from metrics import REGISTRY
+from process_lock import BusLock
+from retry_policy import RetryPolicy, check_cancelled
+from switch_queue import SwitchQueue
+from switch_verifier import SwitchVerifier
+from topology_store import TopologyStore
 
 logger = logging.getLogger(__name__)
 
+SCAN_DURATION = REGISTRY.histogram("kvm_scan_duration_seconds", "Duration of monitor scans", ("mode",))
+MONITORS_DETECTED = REGISTRY.gauge("kvm_monitors_detected", "Monitors listed by the last scan")
+INPUT_SWITCHES = REGISTRY.counter("kvm_input_switches", "Input switch requests by outcome (sent, skipped, failed)",
+                                  ("monitor", "result"))
+TRANSIENT_ERRORS = REGISTRY.counter("kvm_ddc_transient_errors",
+                                    "DDC errors seen while a monitor re-syncs to another input", ("monitor",))
+
 # Standard VCP Code 0x60 Input Source Values
 # Based on VESA Monitor Control Command Set (MCCS)
 INPUT_SOURCES = {
@@ -48,11 +69,299 @@ class DISPLAY_DEVICE(ctypes.Structure):
         ("DeviceKey", wintypes.WCHAR * 128),
     ]
 
-user32 = ctypes.windll.user32
-MonitorEnumProc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HMONITOR, wintypes.HDC, ctypes.POINTER(wintypes.RECT), wintypes.LPARAM)
+EDD_GET_DEVICE_INTERFACE_NAME = 0x00000001
+
+# DisplayConfig (QueryDisplayConfig) structures, for the output technology of each monitor
+class LUID(ctypes.Structure):
+    _fields_ = [
+        ("LowPart", wintypes.DWORD),
+        ("HighPart", wintypes.LONG),
+    ]
+
+class DISPLAYCONFIG_PATH_SOURCE_INFO(ctypes.Structure):
+    _fields_ = [
+        ("adapterId", LUID),
+        ("id", ctypes.c_uint32),
+        ("modeInfoIdx", ctypes.c_uint32),
+        ("statusFlags", ctypes.c_uint32),
+    ]
+
+class DISPLAYCONFIG_PATH_TARGET_INFO(ctypes.Structure):
+    _fields_ = [
+        ("adapterId", LUID),
+        ("id", ctypes.c_uint32),
+        ("modeInfoIdx", ctypes.c_uint32),
+        ("outputTechnology", ctypes.c_uint32),
+        ("rotation", ctypes.c_uint32),
+        ("scaling", ctypes.c_uint32),
+        ("refreshRate", ctypes.c_uint32 * 2),
+        ("scanLineOrdering", ctypes.c_uint32),
+        ("targetAvailable", wintypes.BOOL),
+        ("statusFlags", ctypes.c_uint32),
+    ]
+
+class DISPLAYCONFIG_PATH_INFO(ctypes.Structure):
+    _fields_ = [
+        ("sourceInfo", DISPLAYCONFIG_PATH_SOURCE_INFO),
+        ("targetInfo", DISPLAYCONFIG_PATH_TARGET_INFO),
+        ("flags", ctypes.c_uint32),
+    ]
+
+class DISPLAYCONFIG_MODE_INFO(ctypes.Structure):
+    # Only passed back to QueryDisplayConfig; the mode union isn't needed
+    _fields_ = [
+        ("infoType", ctypes.c_uint32),
+        ("id", ctypes.c_uint32),
+        ("adapterId", LUID),
+        ("modeInfo", ctypes.c_byte * 48),
+    ]
+
+class DISPLAYCONFIG_TARGET_DEVICE_NAME(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_uint32),
+        ("size", ctypes.c_uint32),
+        ("adapterId", LUID),
+        ("id", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("outputTechnology", ctypes.c_uint32),
+        ("edidManufactureId", ctypes.c_uint16),
+        ("edidProductCodeId", ctypes.c_uint16),
+        ("connectorInstance", ctypes.c_uint32),
+        ("monitorFriendlyDeviceName", wintypes.WCHAR * 64),
+        ("monitorDevicePath", wintypes.WCHAR * 128),
+    ]
+
+QDC_ONLY_ACTIVE_PATHS = 0x00000002
+DISPLAYCONFIG_DEVICE_INFO_GET_TARGET_NAME = 2
+
+# DISPLAYCONFIG_VIDEO_OUTPUT_TECHNOLOGY values of built-in panels: LVDS, embedded DisplayPort,
+# embedded UDI and INTERNAL
+INTERNAL_OUTPUT_TECHNOLOGIES = {6, 11, 13, 0x80000000}
+
+if sys.platform == "win32":
+    user32 = ctypes.windll.user32
+    MonitorEnumProc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HMONITOR, wintypes.HDC, ctypes.POINTER(wintypes.RECT), wintypes.LPARAM)
 
 class MonitorManager:
-    _LOCK = threading.Lock()
+    # Locking model:
+    # - one lock per DDC bus, held only while talking to the monitors on that bus; it is also
+    #   a lock file, so other processes (settings window, scripts) don't interleave transactions
+    # - a short registry lock guarding the bus lock table and the last topology list
+    # - a scan lock so two full scans never run at the same time (switches don't take it)
+    _REGISTRY_LOCK = threading.Lock()
+    _SCAN_LOCK = threading.Lock()
+    _BUS_LOCKS: Dict[str, BusLock] = {}
+    _MONITOR_BUS = weakref.WeakKeyDictionary()
+    _BUS_MODEL: Dict[str, str] = {}
+    _TOPOLOGY: List[Dict] = []
+    # Bus key -> {'signature', 'entry' (None if hidden), 'complete', 'probed', 'args'} from the last scan
+    _SNAPSHOT: Dict[str, Dict] = {}
+    _LAST_DIFF: Dict[str, List[str]] = {'added': [], 'removed': [], 'changed': [], 'unchanged': []}
+    # Stable id ('uid') and list index ('id') -> entry of the last scan, for hotkey dispatch
+    _INDEX: Dict[object, Dict] = {}
+    _CAPS_CACHE = None
+    _TOPOLOGY_STORE = None
+    # Whether the last scan was asked to persist (the tray's scans only; see get_connected_monitors)
+    _PERSIST_TOPOLOGY = False
+    _VERIFIER = None
+    _SWITCH_QUEUE = None
+    # Last known input source per monitor key; lets switches skip the pre-switch read
+    _INPUT_STATES = InputStateCache()
+    # How long to wait for a bus another process is using
+    BUS_LOCK_TIMEOUT = BusLock.DEFAULT_TIMEOUT
+    # Every DDC call goes through this; replace it to tune deadlines/backoff
+    RETRY_POLICY = RetryPolicy()
+    # Object with enumerate() -> (monitors, monitor_info, physical_ids); None = built-in Windows path
+    _BACKEND = None
+
+    @staticmethod
+    def set_backend(backend):
+        """
+        Replaces the monitor enumeration backend (e.g. an emulated one for tests and benchmarks).
+        """
+        MonitorManager._BACKEND = backend
+
+    @staticmethod
+    def get_backend():
+        if MonitorManager._BACKEND is None and sys.platform != "win32":
+            from ddc_linux import LinuxDDCBackend
+            MonitorManager._BACKEND = LinuxDDCBackend()
+        return MonitorManager._BACKEND
+
+    @staticmethod
+    def get_caps_cache() -> CapabilitiesCache:
+        if MonitorManager._CAPS_CACHE is None:
+            MonitorManager._CAPS_CACHE = CapabilitiesCache()
+        return MonitorManager._CAPS_CACHE
+
+    @staticmethod
+    def get_topology_store() -> TopologyStore:
+        if MonitorManager._TOPOLOGY_STORE is None:
+            MonitorManager._TOPOLOGY_STORE = TopologyStore()
+        return MonitorManager._TOPOLOGY_STORE
+
+    @staticmethod
+    def get_verifier() -> SwitchVerifier:
+        if MonitorManager._VERIFIER is None:
+            MonitorManager._VERIFIER = SwitchVerifier(MonitorManager._verify_read, lock_for=MonitorManager._lock_for)
+        return MonitorManager._VERIFIER
+
+    @staticmethod
+    def get_switch_queue() -> SwitchQueue:
+        """
+        The queue all interactive switches go through: one worker per monitor, newest target wins.
+        """
+        with MonitorManager._REGISTRY_LOCK:
+            if MonitorManager._SWITCH_QUEUE is None:
+                MonitorManager._SWITCH_QUEUE = SwitchQueue(MonitorManager.set_input_source, MonitorManager._monitor_key)
+            return MonitorManager._SWITCH_QUEUE
+
+    @staticmethod
+    def get_input_states() -> InputStateCache:
+        return MonitorManager._INPUT_STATES
+
+    @staticmethod
+    def _get_bus_lock(bus_key: str) -> BusLock:
+        with MonitorManager._REGISTRY_LOCK:
+            lock = MonitorManager._BUS_LOCKS.get(bus_key)
+            if lock is None:
+                # Keys of handles no scan has seen only mean something in this process
+                lock = BusLock(bus_key, MonitorManager.BUS_LOCK_TIMEOUT, shared=not bus_key.startswith("obj:"))
+                MonitorManager._BUS_LOCKS[bus_key] = lock
+            return lock
+
+    @staticmethod
+    def get_monitors_with_locks() -> List[Tuple[Monitor, BusLock]]:
+        """
+        (monitor handle, bus lock) pairs from one enumeration, for scripts that talk to the
+        monitors themselves: `with lock, monitor:` waits for the tray (or another script) to
+        finish with that monitor, so their DDC transactions don't interleave and garble replies.
+        """
+        backend = MonitorManager.get_backend()
+        if backend is not None:
+            monitors, _, phys_ids = backend.enumerate()
+        else:
+            # Both come from EnumDisplayMonitors, in the same order
+            monitors = get_monitors()
+            phys_ids = MonitorManager.get_monitor_device_ids()
+        pairs = []
+        for i, monitor in enumerate(monitors):
+            phys_id = phys_ids[i] if i < len(phys_ids) else None
+            pairs.append((monitor, MonitorManager._get_bus_lock(MonitorManager._bus_key(i, phys_id))))
+        return pairs
+
+    @staticmethod
+    def _register_monitor(monitor, bus_key: str):
+        with MonitorManager._REGISTRY_LOCK:
+            MonitorManager._MONITOR_BUS[monitor] = bus_key
+
+    @staticmethod
+    def _monitor_key(monitor) -> str:
+        """
+        Returns the bus key of a monitor handle. Handles from an older scan map to the
+        same key as the current handle of that monitor.
+        """
+        with MonitorManager._REGISTRY_LOCK:
+            bus_key = MonitorManager._MONITOR_BUS.get(monitor)
+        if bus_key is None:
+            # Not seen by a scan (e.g. caller enumerated on its own); key per handle
+            bus_key = f"obj:{id(monitor)}"
+        return bus_key
+
+    @staticmethod
+    def _lock_for(monitor) -> BusLock:
+        return MonitorManager._get_bus_lock(MonitorManager._monitor_key(monitor))
+
+    @staticmethod
+    def get_topology() -> List[Dict]:
+        """
+        Returns a copy of the monitor list from the last completed scan.
+        """
+        with MonitorManager._REGISTRY_LOCK:
+            return list(MonitorManager._TOPOLOGY)
+
+    @staticmethod
+    def load_topology_snapshot() -> List[Dict]:
+        """
+        Monitor list persisted by the last scan (possibly of a previous run), for showing
+        monitors before the first scan is done. The entries look like scan entries but have
+        'monitor_obj' None and 'stale' True; find_monitor() doesn't know them.
+        """
+        entries = MonitorManager.get_topology_store().load()
+        for entry in entries:
+            entry.update(monitor_obj=None, stale=True)
+        if entries:
+            logger.info(f"Loaded {len(entries)} monitors from the topology snapshot")
+        return entries
+
+    @staticmethod
+    def save_topology_snapshot():
+        """
+        Persists the current monitor list, including last known sources; no-op if nothing changed,
+        if the last scan wasn't a persisting one, or while a lazy scan's entries are incomplete.
+        """
+        with MonitorManager._REGISTRY_LOCK:
+            if not MonitorManager._PERSIST_TOPOLOGY:
+                return
+            results = list(MonitorManager._TOPOLOGY)
+        if any(entry['inputs'] is None for entry in results):
+            return  # Not probed yet; the last ensure_probed() saves
+        MonitorManager._save_topology(results)
+
+    @staticmethod
+    def _save_topology(results: List[Dict]):
+        snapshot = []
+        for entry in results:
+            current = entry.get('current_input')
+            snapshot.append({
+                'id': entry['id'],
+                'uid': entry.get('uid'),
+                'name': entry['name'],
+                'bus': MonitorManager._monitor_key(entry['monitor_obj']),
+                'inputs': entry['inputs'],
+                'current_input': int(current) if current is not None else None,
+            })
+        MonitorManager.get_topology_store().save(snapshot)
+
+    @staticmethod
+    def find_monitor(target) -> Optional[Dict]:
+        """
+        Looks up a monitor entry of the last scan by stable id (str), scan index (int), or a
+        (stable id, index) pair where the index is only used if the stable id isn't connected.
+        """
+        if isinstance(target, tuple):
+            uid, index = target
+            entry = MonitorManager.find_monitor(uid) if uid is not None else None
+            if entry is None and index is not None:
+                entry = MonitorManager.find_monitor(int(index))
+            return entry
+        with MonitorManager._REGISTRY_LOCK:
+            return MonitorManager._INDEX.get(target)
+
+    @staticmethod
+    def _build_index(results: List[Dict]) -> Dict[object, Dict]:
+        index = {}
+        for entry in results:
+            uid = entry.get('uid')
+            if uid is not None:
+                # Identical units without serial numbers share an EDID; tell them apart by order
+                base = uid.partition("#")[0]
+                uid, n = base, 2
+                while uid in index:
+                    uid = f"{base}#{n}"
+                    n += 1
+                entry['uid'] = uid
+                index[uid] = entry
+            index[entry['id']] = entry
+        return index
+
+    @staticmethod
+    def get_last_diff() -> Dict[str, List[str]]:
+        """
+        Bus keys that were added, removed, changed or unchanged in the last scan.
+        """
+        with MonitorManager._REGISTRY_LOCK:
+            return {k: list(v) for k, v in MonitorManager._LAST_DIFF.items()}
 
     @staticmethod
     def get_wmi_monitor_info() -> List[Dict]:
@@ -83,8 +392,8 @@ class MonitorManager:
                 $Model = [System.Text.Encoding]::ASCII.GetString($curr.UserFriendlyName).Trim([char]0)
             } else { $Model = "Generic" }
             
-            # 2147483648 (Internal), 11 (eDP), 7 (LVDS)
-            $IsInternal = ($param.VideoOutputTechnology -eq 2147483648 -or $param.VideoOutputTechnology -eq 11 -or $param.VideoOutputTechnology -eq 7)
+            # 2147483648 (Internal), 6 (LVDS), 11 (eDP), 13 (embedded UDI)
+            $IsInternal = ($param.VideoOutputTechnology -eq 2147483648 -or $param.VideoOutputTechnology -eq 6 -or $param.VideoOutputTechnology -eq 11 -or $param.VideoOutputTechnology -eq 13)
             
             [PSCustomObject]@{
                 Manufacturer = $Manuf
@@ -137,6 +446,137 @@ class MonitorManager:
             
         return info_list
 
+    @staticmethod
+    def get_monitor_info() -> List[Dict]:
+        """
+        Returns friendly names and connection type for every monitor.
+        Decodes the EDID in-process; the (slow) PowerShell/WMI query only runs for monitors
+        whose EDID couldn't be read or whose output technology DisplayConfig didn't report.
+        """
+        info_list = []
+        interface_names = []
+        try:
+            interface_names = MonitorManager._get_monitor_interface_names()
+            info_list = MonitorManager.get_edid_monitor_info(interface_names)
+        except Exception as e:
+            logger.debug(f"EDID info retrieval failed, falling back to WMI: {e}")
+        
+        complete = info_list and len(info_list) == len(interface_names) and all(w['IsInternal'] is not None for w in info_list)
+        wmi_info = [] if complete else MonitorManager.get_wmi_monitor_info()
+        return MonitorManager._merge_wmi_info(info_list, wmi_info)
+
+    @staticmethod
+    def _merge_wmi_info(edid_info: List[Dict], wmi_info: List[Dict]) -> List[Dict]:
+        """
+        Completes EDID-based monitor info with WMI: the connection type where DisplayConfig had
+        none, and whole entries for monitors whose EDID couldn't be read.
+        """
+        wmi_by_instance = {(w.get('InstanceName') or "").upper(): w for w in wmi_info}
+        merged = []
+        for info in edid_info:
+            w = wmi_by_instance.pop(info['InstanceName'].upper(), None)
+            if info['IsInternal'] is None:
+                # Last resort: guess from the EDID itself
+                info['IsInternal'] = bool(w['IsInternal']) if w is not None else info.pop('EdidInternal')
+            info.pop('EdidInternal', None)
+            merged.append(info)
+        merged.extend(wmi_by_instance.values())
+        return merged
+
+    @staticmethod
+    def _get_monitor_interface_names() -> List[str]:
+        """
+        Device interface paths of the active monitors (\\?\DISPLAY#GSM5B7F#5&1a2b&0&UID4353#{guid}).
+        """
+        interface_names = []
+        
+        def callback(hmonitor, hdc, lprect, lparam):
+            info = MONITORINFOEX()
+            info.cbSize = ctypes.sizeof(MONITORINFOEX)
+            if user32.GetMonitorInfoW(hmonitor, ctypes.byref(info)):
+                mon_dev = DISPLAY_DEVICE()
+                mon_dev.cb = ctypes.sizeof(DISPLAY_DEVICE)
+                # With this flag DeviceID is the interface path instead of the hardware ID
+                if user32.EnumDisplayDevicesW(info.szDevice, 0, ctypes.byref(mon_dev), EDD_GET_DEVICE_INTERFACE_NAME):
+                    interface_names.append(mon_dev.DeviceID)
+            return True
+        
+        user32.EnumDisplayMonitors(None, None, MonitorEnumProc(callback), 0)
+        return interface_names
+
+    @staticmethod
+    def get_output_technologies() -> Dict[str, int]:
+        """
+        Maps the interface path of every active monitor (upper case) to its DisplayConfig
+        outputTechnology, which tells built-in panels (eDP, LVDS) from external monitors.
+        Empty if the query fails.
+        """
+        n_paths, n_modes = ctypes.c_uint32(), ctypes.c_uint32()
+        if user32.GetDisplayConfigBufferSizes(QDC_ONLY_ACTIVE_PATHS, ctypes.byref(n_paths), ctypes.byref(n_modes)):
+            return {}
+        paths = (DISPLAYCONFIG_PATH_INFO * n_paths.value)()
+        modes = (DISPLAYCONFIG_MODE_INFO * n_modes.value)()
+        if user32.QueryDisplayConfig(QDC_ONLY_ACTIVE_PATHS, ctypes.byref(n_paths), paths,
+                                     ctypes.byref(n_modes), modes, None):
+            return {}
+        
+        technologies = {}
+        for path in paths[:n_paths.value]:
+            target = DISPLAYCONFIG_TARGET_DEVICE_NAME()
+            target.type = DISPLAYCONFIG_DEVICE_INFO_GET_TARGET_NAME
+            target.size = ctypes.sizeof(DISPLAYCONFIG_TARGET_DEVICE_NAME)
+            target.adapterId = path.targetInfo.adapterId
+            target.id = path.targetInfo.id
+            if user32.DisplayConfigGetDeviceInfo(ctypes.byref(target)) == 0 and target.monitorDevicePath:
+                technologies[target.monitorDevicePath.upper()] = target.outputTechnology
+        return technologies
+
+    @staticmethod
+    def get_edid_monitor_info(interface_names: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Reads the EDID of every active monitor from the registry and decodes it with edid.parse_edid.
+        Returns the same dicts as get_wmi_monitor_info() plus 'Serial' and 'EdidHash'; monitors
+        whose EDID can't be read are left out. 'IsInternal' comes from the DisplayConfig output
+        technology and is None if that is unknown ('EdidInternal' then holds the EDID's guess).
+        """
+        import winreg
+        
+        if interface_names is None:
+            interface_names = MonitorManager._get_monitor_interface_names()
+        try:
+            technologies = MonitorManager.get_output_technologies()
+        except Exception as e:
+            logger.debug(f"DisplayConfig query failed: {e}")
+            technologies = {}
+        
+        info_list = []
+        for name in interface_names:
+            parts = name.split('#')
+            if len(parts) < 3:
+                continue
+            instance = "\\".join([parts[0].split('\\')[-1], parts[1], parts[2]])
+            try:
+                key_path = f"SYSTEM\\CurrentControlSet\\Enum\\{instance}\\Device Parameters"
+                with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
+                    data, _ = winreg.QueryValueEx(key, "EDID")
+                edid = parse_edid(bytes(data))
+            except (OSError, ValueError) as e:
+                logger.debug(f"Could not read EDID for {instance}: {e}")
+                continue
+            
+            technology = technologies.get(name.upper())
+            info_list.append({
+                'Manufacturer': edid['manufacturer'],
+                'Model': edid['model'],
+                # Same format as WMI InstanceName so matching and cache keys don't change
+                'InstanceName': f"{instance}_0",
+                'IsInternal': technology in INTERNAL_OUTPUT_TECHNOLOGIES if technology is not None else None,
+                'EdidInternal': edid['is_internal'],
+                'Serial': edid['serial'],
+                'EdidHash': edid['hash'],
+            })
+        return info_list
+
     @staticmethod
     def get_monitor_device_ids() -> List[str]:
         """
@@ -167,116 +607,463 @@ class MonitorManager:
         return monitor_ids
 
     @staticmethod
-    def get_connected_monitors() -> List[Dict]:
+    def get_connected_monitors(incremental: bool = False, lazy: bool = False, persist: bool = False,
+                               raise_errors: bool = False) -> List[Dict]:
         """
         Scans for connected monitors and returns a list of dictionaries.
-        Tries to match WMI names to monitors.
+        Tries to match EDID/WMI names to monitors.
+        Each entry has the scan index 'id' and a stable 'uid' from the EDID (None without EDID)
+        that hotkeys can target; find_monitor() resolves either.
+        
+        Discovery is pipelined: the identity sources (monitor handles, EDID/WMI names,
+        physical device IDs) are fetched concurrently, then every DDC bus is probed by its
+        own worker, so a scan takes about as long as the slowest monitor.
+        On Linux the identity and handles come from the DRM/i2c-dev backend (ddc_linux).
+        
+        With incremental=True the cheap identity list is compared with the previous scan:
+        only added or changed monitors are fully probed, the others just get their current
+        source refreshed.
+        
+        With lazy=True monitors that need a full probe are only identified (no DDC traffic):
+        their entry has 'inputs' from the capabilities cache or None if unknown yet, and
+        ensure_probed() completes it later.
+        
+        persist=True (only the tray passes it) stores the result as the topology snapshot the
+        next start shows. Other processes scanning (settings window, scripts) must not replace
+        the tray's snapshot with their own view. A lazy scan stores nothing yet: ensure_probed()
+        does once every entry is complete.
+        
+        A scan that fails is logged and returns []; with raise_errors=True the error is raised
+        instead, so a caller holding a monitor list can tell it from "no monitors" and keep it.
         """
         results = []
-        with MonitorManager._LOCK:
+        mode = "lazy" if lazy else "incremental" if incremental else "full"
+        with MonitorManager._SCAN_LOCK, SCAN_DURATION.time(mode=mode):
             try:
-                monitors = get_monitors()
-                wmi_info = MonitorManager.get_wmi_monitor_info()
-                
-                # Robust Matching Strategy
-                # 1. Get Physical IDs (monitorcontrol order)
-                phys_ids = MonitorManager.get_monitor_device_ids()
+                monitors, monitor_info, phys_ids = MonitorManager._enumerate()
+                with MonitorManager._REGISTRY_LOCK:
+                    previous = dict(MonitorManager._SNAPSHOT)
                 
-                # 2. Reorder WMI info to match Physical IDs
-                ordered_wmi = [None] * len(monitors)
-                wmi_pool = wmi_info.copy()
-                
-                for i, pid in enumerate(phys_ids):
-                    if i >= len(monitors): break
-                    
-                    # Extract HW ID (e.g., LGD076D from MONITOR\LGD076D\...)
-                    hw_id = None
-                    parts = pid.split('\\')
-                    if len(parts) > 1:
-                        hw_id = parts[1].upper()
-                        
-                    # Find matching WMI entry
-                    match_idx = -1
-                    if hw_id:
-                        for k, w in enumerate(wmi_pool):
-                            # WMI InstanceName: DISPLAY\LGD076D\5&...
-                            if w.get('InstanceName') and hw_id in w['InstanceName'].upper():
-                                match_idx = k
-                                break
-                    
-                    # Fallback: exact index match if simple mapping (only if no better ID match found so far?)
-                    # Actually, if ID match fails, we shouldn't force index match blindly unless counts are equal.
+                # Group monitors by DDC bus; each bus gets one worker that probes its monitors in order
+                buses = {}
+                signatures = {}
+                diff = {'added': [], 'removed': [], 'changed': [], 'unchanged': []}
+                for i, monitor in enumerate(monitors):
+                    phys_id = phys_ids[i] if i < len(phys_ids) else None
+                    bus_key = MonitorManager._bus_key(i, phys_id)
+                    MonitorManager._register_monitor(monitor, bus_key)
                     
-                    if match_idx != -1:
-                        ordered_wmi[i] = wmi_pool.pop(match_idx)
+                    signature = MonitorManager._identity(i, bus_key, monitor_info[i])
+                    signatures[bus_key] = signature
+                    old = previous.get(bus_key)
+                    if old is None or old['signature'] != signature:
+                        # A (re)plugged monitor deserves a fresh chance even if its circuit was open
+                        MonitorManager.RETRY_POLICY.breaker.reset(bus_key)
+                    if old is None:
+                        diff['added'].append(bus_key)
+                    elif signature is None or old['signature'] != signature or not old['complete']:
+                        diff['changed'].append(bus_key)
                     else:
-                        logger.warning(f"Could not find WMI match for physical monitor {i} ({pid})")
-
-                # Use the reordered list
-                wmi_info = ordered_wmi
-                use_wmi = True # We always try to use the slot-based WMI info now because it's reordered
-
+                        diff['unchanged'].append(bus_key)
+                    buses.setdefault(bus_key, []).append((i, monitor, phys_id))
+                diff['removed'] = [k for k in previous if k not in signatures]
+                reuse = set(diff['unchanged']) if incremental else set()
                 
-                for i, monitor in enumerate(monitors):
-                    
-                    # Retry loop for capabilities
-                    caps = {}
-                    caps_success = False
-                    for attempt in range(3):
-                        try:
-                            with monitor:
-                                caps = monitor.get_vcp_capabilities()
-                            caps_success = True
-                            break
-                        except Exception:
-                            time.sleep(0.2)
-                    
-                    # Internal Monitor Filtering Logic
-                    model_name = "Generic Monitor"
-                    manufacturer = "Unknown"
-                    is_internal = False
-                    
-                    if use_wmi and wmi_info[i]:
-                        w = wmi_info[i]
-                        manufacturer = w.get('Manufacturer', 'Unknown').upper()
-                        model = w.get('Model', 'Unknown')
-                        model_name = f"{manufacturer} {model}"
-                        is_internal = w.get('IsInternal', False)
-                    elif caps_success and isinstance(caps, dict):
-                         model_name = caps.get('model', '') or "Generic Monitor"
-    
-                    # Filter based on technical connection type
-                    if is_internal:
-                        logger.info(f"Skipping monitor {i} ({model_name}): Identified as Internal Video Output.")
-                        continue
-    
-                    display_name = f"{model_name} #{i+1}"
-                    
-                    supported_inputs = MonitorManager._parse_supported_sources(caps) if caps_success else {'HDMI-1': 17, 'DisplayPort': 15}
-                    
-                    # Try to get current source with retry
-                    current_source = None
-                    for attempt in range(5):
-                        try:
-                            with monitor:
-                                current_source = MonitorManager._get_current_source(monitor)
-                            if current_source is not None:
-                                break 
-                        except Exception:
-                            time.sleep(0.5)
-                    
-                    results.append({
-                        'id': i,
-                        'name': display_name,
-                        'monitor_obj': monitor,
-                        'inputs': supported_inputs,
-                        'current_input': current_source
-                    })
+                slots = [None] * len(monitors)
+                snapshot = {}
+                
+                def probe_bus(bus_key, bus_monitors):
+                    # Holding the bus lock only delays switches on this bus, not on the others.
+                    # The fast phase of a lazy scan doesn't talk to the monitor, so it doesn't wait for the bus.
+                    needs_bus = not lazy or bus_key in reuse
+                    if not lazy and bus_key not in reuse:
+                        for i, monitor, phys_id in bus_monitors:
+                            MonitorManager._settle_before_probe(bus_key, phys_id, monitor_info[i])
+                    try:
+                        with MonitorManager._get_bus_lock(bus_key) if needs_bus else contextlib.nullcontext():
+                            for i, monitor, phys_id in bus_monitors:
+                                try:
+                                    probed = True
+                                    if bus_key in reuse:
+                                        entry, complete = previous[bus_key]['entry'], True
+                                        if entry is not None:
+                                            entry = MonitorManager._refresh_monitor(entry, monitor)
+                                    elif lazy:
+                                        entry, complete = MonitorManager._identify_monitor(i, monitor, phys_id, monitor_info[i])
+                                        probed = entry is None
+                                    else:
+                                        entry, complete = MonitorManager._probe_monitor(i, monitor, phys_id, monitor_info[i])
+                                    record(bus_key, i, monitor, phys_id, entry, complete, probed)
+                                except DDCCancelledError:
+                                    raise
+                                except Exception as e:
+                                    logger.error(f"Failed to probe monitor {i}: {e}")
+                    except DDCBusBusyError as e:
+                        # Another process (settings window, a script) keeps this bus; list its monitors
+                        # as we last knew them rather than failing the whole scan
+                        logger.warning(f"{e}; keeping the last known state of its monitors")
+                        old = previous.get(bus_key)
+                        for i, monitor, phys_id in bus_monitors:
+                            if old is not None and old['signature'] is not None and old['signature'] == signatures[bus_key]:
+                                entry = dict(old['entry'], monitor_obj=monitor) if old['entry'] is not None else None
+                                record(bus_key, i, monitor, phys_id, entry, old['complete'], old['probed'])
+                            else:
+                                # New here: identify it without DDC; the deferred probe completes it later
+                                entry, complete = MonitorManager._identify_monitor(i, monitor, phys_id, monitor_info[i])
+                                record(bus_key, i, monitor, phys_id, entry, complete, entry is None)
+                
+                def record(bus_key, i, monitor, phys_id, entry, complete, probed):
+                    slots[i] = entry
+                    snapshot[bus_key] = {
+                        'signature': signatures[bus_key],
+                        'entry': entry,
+                        'complete': complete,
+                        'probed': probed,
+                        'args': (i, monitor, phys_id, monitor_info[i]),
+                    }
+                
+                if buses:
+                    with ThreadPoolExecutor(max_workers=len(buses), thread_name_prefix="kvm-probe") as pool:
+                        # Each worker runs in a copy of our context, so a cancelled caller stops the probes too
+                        futures = [pool.submit(contextvars.copy_context().run, probe_bus, k, b) for k, b in buses.items()]
+                        for future in futures:
+                            future.result()
+                # A cancelled scan is incomplete; keep the previous snapshot
+                check_cancelled("scan")
+                
+                results = [entry for entry in slots if entry is not None]
+                if incremental:
+                    logger.info(f"Rescan: {len(diff['added'])} added, {len(diff['removed'])} removed, "
+                                f"{len(diff['changed'])} changed, {len(diff['unchanged'])} unchanged")
+                
+                index = MonitorManager._build_index(results)
+                for entry in results:
+                    if MonitorManager._monitor_key(entry['monitor_obj']) in diff['added']:
+                        logger.info(f"Monitor {entry['id']}: {entry['name']} (uid {entry['uid']})")
+                with MonitorManager._REGISTRY_LOCK:
+                    MonitorManager._INDEX = index
+                    MonitorManager._TOPOLOGY = list(results)
+                    MonitorManager._SNAPSHOT = snapshot
+                    MonitorManager._LAST_DIFF = diff
+                    MonitorManager._PERSIST_TOPOLOGY = persist
+                MONITORS_DETECTED.set(len(results))
+                if not lazy:
+                    # Next start shows these right away (written only when something changed)
+                    MonitorManager.save_topology_snapshot()
+            except DDCCancelledError:
+                raise
             except Exception as e:
+                if raise_errors:
+                    raise
                 logger.error(f"Failed to enumerate monitors: {e}")
         
         return results
 
+    @staticmethod
+    def _identity(index: int, bus_key: str, w: Optional[Dict]) -> Optional[tuple]:
+        """
+        Cheap identity of a monitor slot, compared between scans to find what changed.
+        None if the monitor can't be told apart from another one (always probed).
+        """
+        if w is None or bus_key.startswith("#"):
+            return None
+        # The index is part of it: it is the monitor's id and display name
+        return (index, bus_key, w.get('EdidHash') or w.get('InstanceName'),
+                w.get('Manufacturer'), w.get('Model'), w.get('IsInternal'))
+
+    @staticmethod
+    def _stable_id(w: Optional[Dict]) -> Optional[str]:
+        """
+        Identity of the monitor itself, independent of port and enumeration order: vendor, model
+        and EDID serial, or the EDID hash when the serial is blank. None if there is no EDID data.
+        """
+        if not w:
+            return None
+        if w.get('Serial'):
+            return f"{w.get('Manufacturer', 'Unknown').upper()}-{w.get('Model', 'Unknown')}-{w['Serial']}"
+        if w.get('EdidHash'):
+            return f"EDID-{w['EdidHash']}"
+        return None
+
+    @staticmethod
+    def _enumerate() -> Tuple[List[Monitor], List[Optional[Dict]], List[str]]:
+        """
+        Returns (monitors, monitor_info, physical_ids) in monitor order.
+        monitor_info entries are None for monitors we couldn't identify.
+        """
+        backend = MonitorManager.get_backend()
+        if backend is not None:
+            return backend.enumerate()
+        
+        # Windows: the three identity sources are independent of each other
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="kvm-identity") as pool:
+            f_monitors = pool.submit(get_monitors)
+            f_wmi = pool.submit(MonitorManager.get_monitor_info)
+            f_ids = pool.submit(MonitorManager.get_monitor_device_ids)
+            monitors = f_monitors.result()
+            wmi_info = f_wmi.result()
+            phys_ids = f_ids.result()
+        
+        # Use the WMI info reordered to match Physical IDs (monitorcontrol order)
+        return monitors, MonitorManager._match_wmi_info(phys_ids, wmi_info, len(monitors)), phys_ids
+
+    @staticmethod
+    def _bus_key(index: int, phys_id: Optional[str]) -> str:
+        """
+        Identifies the DDC bus a monitor talks over. Every physical monitor has its own
+        I2C channel (a connector on Linux), so the device ID is the bus.
+        """
+        if phys_id and phys_id != "Unknown":
+            return phys_id.upper()
+        return f"#{index}"
+
+    @staticmethod
+    def _match_wmi_info(phys_ids: List[str], wmi_info: List[Dict], count: int) -> List[Optional[Dict]]:
+        """
+        Reorders WMI info to match the physical IDs (monitorcontrol order).
+        Slots without a matching WMI entry are None.
+        """
+        ordered_wmi = [None] * count
+        wmi_pool = wmi_info.copy()
+        
+        for i, pid in enumerate(phys_ids):
+            if i >= count: break
+            
+            # Extract HW ID (e.g., LGD076D from MONITOR\LGD076D\...)
+            hw_id = None
+            parts = pid.split('\\')
+            if len(parts) > 1:
+                hw_id = parts[1].upper()
+                
+            # Find matching WMI entry
+            match_idx = -1
+            if hw_id:
+                for k, w in enumerate(wmi_pool):
+                    # WMI InstanceName: DISPLAY\LGD076D\5&...
+                    if w.get('InstanceName') and hw_id in w['InstanceName'].upper():
+                        match_idx = k
+                        break
+            
+            # If ID match fails, we shouldn't force index match blindly unless counts are equal.
+            if match_idx != -1:
+                ordered_wmi[i] = wmi_pool.pop(match_idx)
+            else:
+                logger.warning(f"Could not find WMI match for physical monitor {i} ({pid})")
+        
+        return ordered_wmi
+
+    @staticmethod
+    def _probe_monitor(i: int, monitor: Monitor, phys_id: Optional[str], w: Optional[Dict]) -> Tuple[Optional[Dict], bool]:
+        """
+        Reads capabilities and current source of a single monitor.
+        Returns (entry, complete): entry is None if the monitor should be hidden (internal panel);
+        complete is False if the entry is based on fallback data and should be probed again.
+        Callers hold the bus lock and should run _settle_before_probe() before taking it.
+        """
+        # Capabilities never change for a given monitor, so reuse the cached copy when we have one
+        caps_cache = MonitorManager.get_caps_cache()
+        caps_key = MonitorManager._caps_key(phys_id, w)
+        caps = caps_cache.get(caps_key)
+        caps_success = caps is not None
+        
+        policy = MonitorManager.RETRY_POLICY
+        monitor_key = MonitorManager._monitor_key(monitor)
+        
+        # Deadline-bounded retries for capabilities
+        if not caps_success:
+            caps = {}
+            try:
+                caps = policy.run(monitor_key, 'capabilities', lambda: MonitorManager._read_capabilities(monitor))
+                caps_success = True
+            except DDCCancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Could not read capabilities of monitor {i}: {e}")
+            
+            # Only cache capabilities that actually list input sources
+            if caps_success and MonitorManager._has_input_caps(caps):
+                caps_cache.put(caps_key, caps)
+        else:
+            logger.debug(f"Using cached capabilities for monitor {i} ({caps_key})")
+        
+        model_name = MonitorManager._describe_monitor(i, monitor_key, w, caps if caps_success else None)
+        if model_name is None:
+            return None, True
+        
+        supported_inputs = MonitorManager._parse_supported_sources(caps) if caps_success else {'HDMI-1': 17, 'DisplayPort': 15}
+        
+        entry = {
+            'id': i,
+            'uid': MonitorManager._stable_id(w),
+            'name': f"{model_name} #{i+1}",
+            'monitor_obj': monitor,
+            'inputs': supported_inputs,
+            'current_input': MonitorManager._probe_current_source(i, monitor, monitor_key)
+        }
+        return entry, caps_success and MonitorManager._has_input_caps(caps)
+
+    @staticmethod
+    def _settle_before_probe(monitor_key: str, phys_id: Optional[str], w: Optional[Dict]):
+        """
+        A monitor re-syncing after a switch won't answer a capabilities read; gives it its learned
+        settle time. Must run before taking the bus lock: the verifier needs the bus to confirm the switch.
+        """
+        if MonitorManager.get_caps_cache().get(MonitorManager._caps_key(phys_id, w)) is not None:
+            return  # Only the current source will be read, and a pending switch answers that
+        verifier = MonitorManager.get_verifier()
+        verifier.wait_settled(monitor_key, verifier.get_ready_in(monitor_key))
+
+    @staticmethod
+    def _identify_monitor(i: int, monitor: Monitor, phys_id: Optional[str], w: Optional[Dict]) -> Tuple[Optional[Dict], bool]:
+        """
+        Fast phase of a lazy scan: builds the entry from identity data and caches only, without DDC.
+        'inputs' is None when the capabilities aren't cached yet. Returns (entry, False) like _probe_monitor.
+        """
+        monitor_key = MonitorManager._monitor_key(monitor)
+        caps = MonitorManager.get_caps_cache().get(MonitorManager._caps_key(phys_id, w))
+        
+        model_name = MonitorManager._describe_monitor(i, monitor_key, w, caps)
+        if model_name is None:
+            return None, True
+        
+        current_source = MonitorManager.get_verifier().get_pending_target(monitor_key)
+        if current_source is None:
+            current_source = MonitorManager._INPUT_STATES.get(monitor_key)
+        
+        entry = {
+            'id': i,
+            'uid': MonitorManager._stable_id(w),
+            'name': f"{model_name} #{i+1}",
+            'monitor_obj': monitor,
+            'inputs': MonitorManager._parse_supported_sources(caps) if caps is not None else None,
+            'current_input': current_source
+        }
+        return entry, False
+
+    @staticmethod
+    def _describe_monitor(i: int, monitor_key: str, w: Optional[Dict], caps: Optional[Dict]) -> Optional[str]:
+        """
+        Returns the model name shown for a monitor, or None if it should be hidden (internal panel).
+        """
+        # Internal Monitor Filtering Logic
+        model_name = "Generic Monitor"
+        manufacturer = "Unknown"
+        is_internal = False
+        
+        if w:
+            manufacturer = w.get('Manufacturer', 'Unknown').upper()
+            model = w.get('Model', 'Unknown')
+            model_name = f"{manufacturer} {model}"
+            is_internal = w.get('IsInternal', False)
+        elif isinstance(caps, dict):
+             model_name = caps.get('model', '') or "Generic Monitor"
+
+        # Filter based on technical connection type
+        if is_internal:
+            logger.info(f"Skipping monitor {i} ({model_name}): Identified as Internal Video Output.")
+            return None
+
+        with MonitorManager._REGISTRY_LOCK:
+            MonitorManager._BUS_MODEL[monitor_key] = model_name
+        return model_name
+
+    @staticmethod
+    def _caps_key(phys_id: Optional[str], w: Optional[Dict]) -> Optional[str]:
+        return CapabilitiesCache.make_key(
+            phys_id,
+            w.get('InstanceName') if w else None,
+            w.get('Manufacturer') if w else None,
+            w.get('Model') if w else None,
+            w.get('EdidHash') if w else None
+        )
+
+    @staticmethod
+    def needs_probe(entry: Dict) -> bool:
+        """
+        True if the entry came from the fast phase of a lazy scan and hasn't been probed yet.
+        """
+        if entry.get('monitor_obj') is None:
+            return False  # From the topology snapshot, nothing to probe
+        monitor_key = MonitorManager._monitor_key(entry['monitor_obj'])
+        with MonitorManager._REGISTRY_LOCK:
+            snap = MonitorManager._SNAPSHOT.get(monitor_key)
+        return snap is not None and not snap['probed']
+
+    @staticmethod
+    def ensure_probed(entry: Dict) -> Dict:
+        """
+        Deferred phase of a lazy scan: reads capabilities and current source of one monitor
+        and fills them into `entry` (and the latest scan's entry for that monitor) in place.
+        Cheap if the monitor is already probed.
+        """
+        monitor_key = MonitorManager._monitor_key(entry['monitor_obj'])
+        with MonitorManager._REGISTRY_LOCK:
+            snap = MonitorManager._SNAPSHOT.get(monitor_key)
+        if snap is not None and not snap['probed']:
+            _, _, phys_id, w = snap['args']
+            MonitorManager._settle_before_probe(monitor_key, phys_id, w)
+        with MonitorManager._get_bus_lock(monitor_key):
+            with MonitorManager._REGISTRY_LOCK:
+                snap = MonitorManager._SNAPSHOT.get(monitor_key)
+            if snap is None:
+                return entry
+            if not snap['probed']:
+                probed, complete = MonitorManager._probe_monitor(*snap['args'])
+                with MonitorManager._REGISTRY_LOCK:
+                    if snap['entry'] is not None and probed is not None:
+                        snap['entry'].update(name=probed['name'], inputs=probed['inputs'],
+                                             current_input=probed['current_input'])
+                    snap['complete'] = complete
+                    snap['probed'] = True
+            latest = snap['entry']
+        if latest is not None and latest is not entry:
+            entry.update(name=latest['name'], inputs=latest['inputs'], current_input=latest['current_input'])
+        MonitorManager.save_topology_snapshot()
+        return entry
+
+    @staticmethod
+    def _refresh_monitor(entry: Dict, monitor: Monitor) -> Dict:
+        """
+        Incremental rescan of an unchanged monitor: keeps the entry, swaps in the new handle
+        and re-reads only the current source.
+        """
+        monitor_key = MonitorManager._monitor_key(monitor)
+        return dict(entry, monitor_obj=monitor,
+                    current_input=MonitorManager._probe_current_source(entry['id'], monitor, monitor_key))
+
+    @staticmethod
+    def _probe_current_source(i: int, monitor: Monitor, monitor_key: str) -> Optional[int]:
+        # A switch still being verified: its target is the best answer and reading would only disturb it
+        current_source = MonitorManager.get_verifier().get_pending_target(monitor_key)
+        if current_source is not None:
+            return current_source
+        try:
+            current_source = MonitorManager.RETRY_POLICY.run(
+                monitor_key, 'read', lambda: MonitorManager._read_input_source(monitor))
+            MonitorManager._INPUT_STATES.put(monitor_key, current_source)
+        except DDCCancelledError:
+            # The scan was cancelled: stop talking to this bus instead of carrying on with a guess
+            raise
+        except DDCCircuitOpenError as e:
+            logger.debug(str(e))
+        except Exception as e:
+            if MonitorManager._is_transient_error(e):
+                TRANSIENT_ERRORS.inc(monitor=monitor_key)
+                logger.debug(f"Transient DDC error (common during switching): {e}")
+            else:
+                logger.warning(f"Could not read current source of monitor {i}: {e}")
+        if current_source is None:
+            # Fall back to what we last knew rather than showing nothing
+            current_source = MonitorManager._INPUT_STATES.get(monitor_key)
+        return current_source
+
+    @staticmethod
+    def _has_input_caps(caps) -> bool:
+        if not isinstance(caps, dict):
+            return False
+        vcp = caps.get('vcp')
+        return bool(caps.get('inputs')) or (isinstance(vcp, dict) and 0x60 in vcp)
+
     @staticmethod
     def _parse_supported_sources(caps) -> Dict[str, int]:
         """
@@ -324,26 +1111,83 @@ class MonitorManager:
             
         return supported
 
+    @staticmethod
+    def _read_capabilities(monitor: Monitor) -> Dict:
+        with monitor:
+            return monitor.get_vcp_capabilities()
+
+    @staticmethod
+    def _read_input_source(monitor: Monitor) -> int:
+        with monitor:
+            return monitor.get_input_source()
+
+    @staticmethod
+    def _write_input_source(monitor: Monitor, source_value: int):
+        with monitor:
+            monitor.set_input_source(source_value)
+
+    @staticmethod
+    def read_vcp(monitor, code: int) -> Tuple[int, int]:
+        """
+        Reads any VCP feature: returns (current value, maximum value). Raises a DDCError on failure.
+        """
+        monitor_key = MonitorManager._monitor_key(monitor)
+
+        def read():
+            with monitor:
+                return monitor.vcp.get_vcp_feature(code)
+
+        with MonitorManager._lock_for(monitor):
+            value = MonitorManager.RETRY_POLICY.run(monitor_key, 'vcp', read)
+        if code == 0x60:
+            MonitorManager._INPUT_STATES.put(monitor_key, value[0] & 0xFF)
+        return value
+
+    @staticmethod
+    def _is_transient_error(e: Exception) -> bool:
+        """
+        Errors a working monitor produces now and then: busy, garbled reply, or re-syncing after a switch.
+        """
+        return isinstance(classify_error(e), DDCTransientError)
+
+    @staticmethod
+    def _is_disconnected_error(e: Exception) -> bool:
+        """
+        The monitor dropped off the bus, which after a write means it accepted the command and is re-syncing.
+        """
+        return isinstance(classify_error(e), DDCDisconnectedError)
+
     @staticmethod
     def _get_current_source(monitor: Monitor) -> Optional[int]:
         try:
             # Use the public API which handles VCP code object and masking
             return monitor.get_input_source()
         except Exception as e:
-            msg = str(e)
-            if "PDO" in msg or "command field" in msg or "명령 필드" in msg or "비동기적으로 삭제" in msg:
+            if MonitorManager._is_transient_error(e):
+                TRANSIENT_ERRORS.inc(monitor=MonitorManager._monitor_key(monitor))
                 logger.debug(f"Transient DDC error (common during switching): {e}")
             else:
                 logger.warning(f"Could not read current source: {e}")
             return None
 
     @staticmethod
-    def set_input_source(monitor, source_value: int):
+    def set_input_source(monitor, source_value: int, on_verified=None):
         """
         Sets the input source for the given monitor.
         Checks if the monitor is already on that source to prevent black screens.
+        Only the bus of this monitor is locked, so other monitors can switch or be scanned meanwhile.
+        
+        Returns right after the write; a background verifier then waits for the monitor to report
+        the new source and calls on_verified(confirmed, current_source, elapsed) when done.
         """
-        with MonitorManager._LOCK:
+        monitor_key = MonitorManager._monitor_key(monitor)
+        verifier = MonitorManager.get_verifier()
+        
+        # Let a previous switch on this monitor settle before sending the next command
+        verifier.wait_settled(monitor_key, verifier.get_ready_in(monitor_key))
+        
+        sent = False
+        with MonitorManager._lock_for(monitor):
             try:
                 # Ensure we have a valid int
                 if isinstance(source_value, str):
@@ -352,33 +1196,75 @@ class MonitorManager:
                     else:
                         source_value = int(source_value)
                 
-                # Check current source first to prevent redundant switches
+                if verifier.get_pending_target(monitor_key) == source_value:
+                    logger.info(f"Monitor is already switching to source 0x{source_value:02X}. Skipping switch.")
+                    INPUT_SWITCHES.inc(monitor=monitor_key, result="skipped")
+                    return
+                
+                # Don't switch to the source the monitor is already on
                 # (Switching to same source can cause black screen/reset on some monitors)
-                try:
-                    current = None
-                    with monitor:
-                        current = monitor.get_input_source()
-                        
-                    if current == source_value:
-                        logger.info(f"Monitor is already on source 0x{source_value:02X}. Skipping switch.")
-                        return
-                    logger.info(f"Current source: 0x{current:02X}, Target: 0x{source_value:02X}")
-                except Exception as e:
-                    logger.warning(f"Could not verify current source before switching: {e}. Proceeding anyway.")
+                policy = MonitorManager.RETRY_POLICY
+                states = MonitorManager._INPUT_STATES
+                known = states.get(monitor_key)
+                
+                if states.is_confirmed(monitor_key, source_value):
+                    logger.info(f"Monitor is already on source 0x{source_value:02X}. Skipping switch.")
+                    INPUT_SWITCHES.inc(monitor=monitor_key, result="skipped")
+                    return
+                elif known is not None and known != source_value:
+                    # Remembered state says we must switch anyway; skip the DDC round trip
+                    logger.info(f"Current source (cached): 0x{known:02X}, Target: 0x{source_value:02X}")
+                else:
+                    # Unknown, stale, or it claims we're there but isn't confirmed recently: ask the monitor
+                    try:
+                        current = policy.run(monitor_key, 'precheck', lambda: MonitorManager._read_input_source(monitor))
+                        states.put(monitor_key, current)
+                            
+                        if current == source_value:
+                            logger.info(f"Monitor is already on source 0x{source_value:02X}. Skipping switch.")
+                            INPUT_SWITCHES.inc(monitor=monitor_key, result="skipped")
+                            return
+                        logger.info(f"Current source: 0x{current:02X}, Target: 0x{source_value:02X}")
+                    except Exception as e:
+                        logger.warning(f"Could not verify current source before switching: {e}. Proceeding anyway.")
 
                 logger.info(f"Setting input source to {source_value} (0x{source_value:02X})...")
                 
-                with monitor:
-                    monitor.set_input_source(source_value)
-                    logger.info(f"Set monitor source to {source_value:02X}")
+                # A transient error here means the monitor took the command and dropped off; don't resend
+                policy.run(monitor_key, 'write', lambda: MonitorManager._write_input_source(monitor, source_value),
+                           retry_if=lambda e: not MonitorManager._is_disconnected_error(e))
+                logger.info(f"Set monitor source to {source_value:02X}")
+                sent = True
                     
             except Exception as e:
-                msg = str(e)
-                if "PDO" in msg or "command field" in msg or "명령 필드" in msg or "비동기적으로 삭제" in msg:
+                if MonitorManager._is_disconnected_error(e):
                     # Downgrade to info/warn as this is expected when the monitor switches away
                     logger.info(f"Monitor accepted command but disconnected (expected): {e}")
+                    TRANSIENT_ERRORS.inc(monitor=monitor_key)
+                    sent = True
                 else:
                     logger.error(f"Failed to set input source: {e}")
+                    INPUT_SWITCHES.inc(monitor=monitor_key, result="failed")
+                    # We no longer know where the monitor is
+                    MonitorManager._INPUT_STATES.invalidate(monitor_key)
                     raise e
+        
+        if sent:
+            INPUT_SWITCHES.inc(monitor=monitor_key, result="sent")
+            MonitorManager._INPUT_STATES.put(monitor_key, source_value, InputStateCache.WRITE)
+            with MonitorManager._REGISTRY_LOCK:
+                model = MonitorManager._BUS_MODEL.get(monitor_key, monitor_key)
+            verifier.start(monitor, monitor_key, model, source_value, on_verified)
 
-
+    @staticmethod
+    def _verify_read(monitor) -> Optional[int]:
+        """
+        Quiet single read used by the switch verifier; errors are expected while the monitor re-syncs.
+        """
+        with MonitorManager._lock_for(monitor):
+            try:
+                current = MonitorManager._read_input_source(monitor)
+            except Exception:
+                return None
+        MonitorManager._INPUT_STATES.put(MonitorManager._monitor_key(monitor), current)
+        return current
@@ -0,0 +1,178 @@
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+from app_paths import get_runtime_dir
+from ddc_errors import DDCBusBusyError
+
+logger = logging.getLogger(__name__)
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _try_lock(fd: int) -> bool:
+        os.lseek(fd, 0, os.SEEK_SET)
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(fd: int):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _unlock(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class FileLock:
+    """
+    Advisory exclusive lock on a file, between processes (flock() on POSIX, a byte-range lock
+    on Windows). The OS drops it when the holder dies, so a crash never leaves it stuck.
+    Not meant to be shared by threads; BusLock puts a thread lock in front of it.
+    """
+    MAX_POLL = 0.02
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+        self.locked = False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits up to `timeout` seconds (None: forever, 0: don't wait). True if acquired.
+        """
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = 0.001
+        # Neither flock() nor the Windows lock can wait with a timeout, so poll with a short backoff
+        while not _try_lock(self._fd):
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                delay = min(delay, remaining)
+            time.sleep(delay)
+            delay = min(delay * 2, self.MAX_POLL)
+        self.locked = True
+        return True
+
+    def release(self):
+        if self.locked:
+            self.locked = False
+            _unlock(self._fd)
+
+    def close(self):
+        self.release()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def _lock_dir() -> str:
+    path = os.path.join(get_runtime_dir(), "locks")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+
+class BusLock:
+    """
+    Lock of one DDC bus, for the threads of this process and for other processes (the tray,
+    the settings window, kvm.py, the check/debug scripts). Re-entrant like the RLock it replaces.
+
+    Only the outermost acquire takes the lock file. Waiting processes line up at a gate file
+    first: a holder that releases the bus and wants it right back has to queue behind a
+    process that is already waiting, so a busy tray can't starve a tool and vice versa.
+    Raises DDCBusBusyError if another process keeps the bus longer than `timeout`.
+    """
+    DEFAULT_TIMEOUT = 10.0
+
+    def __init__(self, key: str, timeout: float = DEFAULT_TIMEOUT, shared: bool = True):
+        self.key = key
+        self.timeout = timeout
+        self.shared = shared
+        self._local = threading.RLock()
+        self._depth = 0  # Only touched by the thread holding _local
+        self._gate = None
+        self._bus = None
+
+    def _files(self):
+        if self._bus is None:
+            # Bus keys are device paths; hash them into a file name that works everywhere
+            name = hashlib.sha1(self.key.encode('utf-8')).hexdigest()[:16]
+            base = os.path.join(_lock_dir(), name)
+            self._gate = FileLock(base + ".gate")
+            self._bus = FileLock(base + ".lock")
+        return self._gate, self._bus
+
+    def _acquire_shared(self) -> bool:
+        try:
+            gate, bus = self._files()
+            deadline = time.monotonic() + self.timeout
+            if not gate.acquire(self.timeout):
+                return False
+            try:
+                return bus.acquire(max(0.0, deadline - time.monotonic()))
+            finally:
+                gate.release()
+        except OSError as e:
+            # No usable lock directory: still serialize within this process
+            logger.warning(f"Cross-process bus locking unavailable for {self.key}: {e}")
+            self.shared = False
+            return True
+
+    def acquire(self):
+        self._local.acquire()
+        if self._depth == 0 and self.shared:
+            try:
+                acquired = self._acquire_shared()
+            except BaseException:
+                self._local.release()
+                raise
+            if not acquired:
+                self._local.release()
+                raise DDCBusBusyError(f"{self.key} busy: another process held it for more than {self.timeout:g}s")
+        self._depth += 1
+        return True
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and self._bus is not None:
+            self._bus.release()
+        self._local.release()
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class SingleInstance:
+    """
+    Held by the tray for its lifetime, so a second copy (autostart plus a manual start) exits
+    instead of running its own scanner, hotkeys and control endpoint next to the first.
+    """
+    def __init__(self, name: str = "tray"):
+        self._lock = FileLock(os.path.join(get_runtime_dir(), f"{name}.lock"))
+
+    def acquire(self) -> bool:
+        return self._lock.acquire(timeout=0)
+
+    def release(self):
+        self._lock.close()
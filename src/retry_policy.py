@@ -0,0 +1,200 @@
+import contextlib
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from circuit_breaker import CircuitBreaker
+from ddc_errors import DDCCancelledError, DDCCircuitOpenError, DDCDisconnectedError, DDCUnsupportedError, classify_error
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+DDC_LATENCY = REGISTRY.histogram("kvm_ddc_latency_seconds", "Duration of successful DDC calls",
+                                 ("operation", "monitor"))
+DDC_RETRIES = REGISTRY.counter("kvm_ddc_retries", "DDC call attempts after the first one",
+                               ("operation", "monitor"))
+DDC_FAILURES = REGISTRY.counter("kvm_ddc_failures", "DDC operations that ran out of attempts or time",
+                                ("operation", "monitor"))
+
+# Cancellation flag of the operation running in this context (set by the async API); run()
+# checks it before every attempt and during backoff. A DDC call already on the wire can't be aborted.
+_CANCEL_EVENT: ContextVar[Optional[threading.Event]] = ContextVar("kvm_cancel_event", default=None)
+
+
+@contextlib.contextmanager
+def cancellable(event: threading.Event):
+    """
+    Makes RetryPolicy.run() calls inside the block stop with DDCCancelledError once `event` is set.
+    """
+    token = _CANCEL_EVENT.set(event)
+    try:
+        yield event
+    finally:
+        _CANCEL_EVENT.reset(token)
+
+
+def check_cancelled(what: str = "operation"):
+    event = _CANCEL_EVENT.get()
+    if event is not None and event.is_set():
+        raise DDCCancelledError(f"{what} cancelled")
+
+
+class _Timing:
+    """
+    What we have learned about one operation on one monitor.
+    """
+    ALPHA = 0.3  # EWMA weight of the newest sample
+
+    def __init__(self):
+        self.latency = None  # EWMA of successful call duration (s)
+        self.failure_streak = 0
+
+    def record_success(self, elapsed: float):
+        self.latency = elapsed if self.latency is None else (1 - self.ALPHA) * self.latency + self.ALPHA * elapsed
+        self.failure_streak = 0
+
+    def record_failure(self):
+        self.failure_streak += 1
+
+
+class RetryPolicy:
+    """
+    Deadline-bounded retries for DDC operations.
+
+    - Every operation kind has a deadline after which no new attempt is started, so the worst
+      case per monitor is bounded by its operation deadlines no matter how the monitor behaves.
+    - Backoff is exponential with jitter, starting short so a one-off hiccup on a healthy
+      monitor costs ~50 ms instead of a fixed 0.5 s.
+    - Per monitor and operation we learn the typical call duration (no new attempt is started
+      if it can't finish before the deadline) and the failure streak (a monitor that keeps
+      failing gets a smaller budget each time, down to a single attempt).
+    - Errors are classified (ddc_errors); "unsupported" ends the retries at once.
+    - A per-monitor circuit breaker stops background operations (scans) on monitors that keep
+      failing; switches the user asks for are always attempted and close it again on success.
+    """
+    DEFAULT_DEADLINES = {
+        'capabilities': 2.0,
+        'read': 1.0,
+        'write': 1.0,
+        'precheck': 0.0,  # Pre-switch read: one attempt, the switch proceeds anyway
+        'vcp': 1.0,       # Reads of arbitrary VCP codes requested by API callers
+    }
+    # Operations issued by scans on their own; these are skipped while a monitor's circuit is open
+    GATED_OPERATIONS = ('capabilities', 'read')
+
+    def __init__(self, deadlines: Optional[Dict[str, float]] = None, base_delay: float = 0.05,
+                 max_delay: float = 0.8, jitter: float = 0.5, max_attempts: int = 8,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.breaker = breaker or CircuitBreaker()
+        self.deadlines = dict(self.DEFAULT_DEADLINES)
+        self.deadlines.update(deadlines or {})
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._timings: Dict[Tuple[str, str], _Timing] = {}
+
+    def run(self, key: str, operation: str, func: Callable[[], Any],
+            accept: Optional[Callable[[Any], bool]] = None,
+            retry_if: Optional[Callable[[Exception], bool]] = None,
+            deadline: Optional[float] = None) -> Any:
+        """
+        Calls func() until it succeeds or the operation deadline is reached.
+        accept(result) -> False treats a returned value as a failure (e.g. None from a read).
+        retry_if(error) -> False re-raises the (classified) error immediately.
+        Returns the last result, or raises the last error as a DDCError, when out of time.
+        Raises DDCCircuitOpenError without calling func() if the monitor's circuit is open, and
+        DDCCancelledError (without counting it against the monitor) if the caller cancelled.
+        """
+        cancel = _CANCEL_EVENT.get()
+        # Before asking the breaker: a granted half-open trial must actually run
+        check_cancelled(f"{operation} on {key}")
+        if operation in self.GATED_OPERATIONS and not self.breaker.allow(key):
+            raise DDCCircuitOpenError(f"{operation} on {key} skipped: circuit open for another "
+                                      f"{self.breaker.retry_in(key):.0f}s")
+        # A half-open trial gets a single attempt
+        max_attempts = 1 if self.breaker.is_trial(key) else self.max_attempts
+        
+        timing = self._get_timing(key, operation)
+        budget = self.get_budget(key, operation, deadline)
+        end = time.monotonic() + budget
+        delay = self.base_delay
+        attempt = 0
+        result = None
+        last_error = None
+
+        while True:
+            attempt += 1
+            if attempt > 1:
+                check_cancelled(f"{operation} on {key}")
+                DDC_RETRIES.inc(operation=operation, monitor=key)
+            started = time.monotonic()
+            try:
+                result = func()
+                last_error = None
+                if accept is None or accept(result):
+                    elapsed = time.monotonic() - started
+                    with self._lock:
+                        timing.record_success(elapsed)
+                    DDC_LATENCY.observe(elapsed, operation=operation, monitor=key)
+                    self.breaker.record_success(key)
+                    return result
+            except Exception as e:
+                error = classify_error(e)
+                if retry_if is not None and not retry_if(error):
+                    # The caller handles this one; a monitor that dropped off after a command is alive
+                    if isinstance(error, DDCDisconnectedError):
+                        self.breaker.record_success(key)
+                    else:
+                        self.breaker.record_failure(key, error)
+                    raise error from e
+                last_error = error
+                if isinstance(error, DDCUnsupportedError):
+                    break
+
+            sleep = self._backoff(delay)
+            expected = timing.latency or 0.0
+            if attempt >= max_attempts or time.monotonic() + sleep + expected > end:
+                break
+            if cancel is not None:
+                cancel.wait(sleep)
+            else:
+                time.sleep(sleep)
+            delay = min(delay * 2, self.max_delay)
+
+        with self._lock:
+            timing.record_failure()
+        DDC_FAILURES.inc(operation=operation, monitor=key)
+        self.breaker.record_failure(key, last_error)
+        logger.debug(f"{operation} on {key} gave up after {attempt} attempt(s)")
+        if last_error is not None:
+            raise last_error
+        return result
+
+    def get_budget(self, key: str, operation: str, deadline: Optional[float] = None) -> float:
+        """
+        Time budget for the next run(): the operation deadline, shrunk for monitors that keep failing.
+        """
+        if deadline is None:
+            deadline = self.deadlines.get(operation, 1.0)
+        streak = self._get_timing(key, operation).failure_streak
+        return deadline / (1 + min(streak, 4))
+
+    def get_expected_latency(self, key: str, operation: str) -> Optional[float]:
+        return self._get_timing(key, operation).latency
+
+    def _get_timing(self, key: str, operation: str) -> _Timing:
+        with self._lock:
+            timing = self._timings.get((key, operation))
+            if timing is None:
+                timing = _Timing()
+                self._timings[(key, operation)] = timing
+            return timing
+
+    def _backoff(self, delay: float) -> float:
+        # Equal jitter: keep part of the delay, randomize the rest so retries don't line up
+        return delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
@@ -0,0 +1,78 @@
+import json
+import os
+import logging
+from typing import Dict, List, Tuple
+from hotkey_manager import resolve_monitor, resolve_source
+
+class SceneManager:
+    """
+    Named sets of (monitor, source) targets, loaded from scenes.json:
+
+        {
+            "Work PC": [
+                {"monitor_idx": 0, "source": "HDMI-1"},
+                {"monitor": "GSM-LG ULTRAFINE-123456", "monitor_idx": 1, "source": "DisplayPort"}
+            ]
+        }
+
+    Targets name a monitor like hotkeys do (stable "monitor" id and/or "monitor_idx").
+
+    A hotkey binds to a scene with {"scene": "Work PC"} in hotkeys.json.
+    """
+    CONFIG_FILE = "scenes.json"
+
+    def __init__(self):
+        self.scenes: Dict[str, List[Tuple[Tuple, int]]] = {}
+        self.config_path = os.path.join(os.getcwd(), self.CONFIG_FILE)
+        self.load_config()
+
+    def load_config(self):
+        """
+        (Re)loads scenes.json. The new scenes replace the old ones in one step; a file that can't
+        be read or parsed keeps the current scenes.
+        """
+        if not os.path.exists(self.config_path):
+            self.scenes = {}
+            return
+
+        try:
+            with open(self.config_path, 'r') as f:
+                config = json.load(f)
+        except Exception as e:
+            logging.error(f"Failed to load scenes: {e}")
+            return
+        if not isinstance(config, dict):
+            logging.error("Failed to load scenes: expected an object of scene name -> targets")
+            return
+
+        scenes = {}
+        for name, targets in config.items():
+            resolved = []
+            for target in targets if isinstance(targets, list) else []:
+                monitor = resolve_monitor(target)
+                if monitor is None or "source" not in target:
+                    logging.warning(f"Ignoring incomplete target in scene '{name}': {target}")
+                    continue
+                src_val = resolve_source(target["source"])
+                if src_val is None:
+                    logging.warning(f"Invalid source '{target['source']}' in scene '{name}'")
+                    continue
+                resolved.append((monitor, src_val))
+
+            if resolved:
+                scenes[name] = resolved
+            else:
+                logging.warning(f"Scene '{name}' has no valid targets.")
+
+        self.scenes = scenes
+        logging.info(f"Loaded {len(self.scenes)} scenes from {self.config_path}")
+
+    def get_targets(self, name: str) -> List[Tuple[Tuple, int]]:
+        """
+        Returns [(monitor target, source_value), ...] for a scene, empty if unknown.
+        Targets are (uid, index) pairs for MonitorManager.find_monitor().
+        """
+        return self.scenes.get(name, [])
+
+    def names(self) -> List[str]:
+        return list(self.scenes.keys())
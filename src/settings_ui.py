@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json
+import logging
 import os
 import sys
 import threading
@@ -10,6 +11,8 @@ from pynput import keyboard
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from monitor_utils import MonitorManager, INPUT_SOURCES
 from hotkey_manager import HotkeyManager
+from control_server import send_request
+from app_paths import atomic_write
 
 class SettingsUI:
     def __init__(self, root):
@@ -18,7 +21,10 @@ class SettingsUI:
         self.root.geometry("700x450")
         
         self.hotkeys = {}
+        self.scene_bindings = {}
         self.monitors = []
+        self.monitor_uids = []  # Stable id per entry of self.monitors (None if unknown)
+        self.monitor_ids = []  # Scan id (monitor_idx) per entry of self.monitors
         self.row_frames = []
         self.listening = False
         self.current_recording_entry = None
@@ -33,6 +39,12 @@ class SettingsUI:
         ttk.Label(self.main_frame, text="Configure Hotkeys", font=("Arial", 14, "bold")).pack(pady=5)
         ttk.Label(self.main_frame, text="Click 'Record' and press your key combination.").pack(pady=(0, 10))
         
+        # Only shown while scanning for monitors ourselves (no tray running)
+        self.scan_frame = ttk.Frame(self.main_frame)
+        ttk.Label(self.scan_frame, text="Scanning monitors...").pack(side=tk.LEFT, padx=5)
+        self.scan_progress = ttk.Progressbar(self.scan_frame, mode="indeterminate", length=200)
+        self.scan_progress.pack(side=tk.LEFT, padx=5)
+        
         # Scrollable Area for Rows
         self.canvas = tk.Canvas(self.main_frame)
         self.scrollbar = ttk.Scrollbar(self.main_frame, orient="vertical", command=self.canvas.yview)
@@ -54,24 +66,68 @@ class SettingsUI:
         self.btn_frame.pack(fill=tk.X)
         
         ttk.Button(self.btn_frame, text="Add New Hotkey", command=self.add_row).pack(side=tk.LEFT, padx=5)
-        ttk.Button(self.btn_frame, text="Save & Close", command=self.save_and_close).pack(side=tk.RIGHT, padx=5)
+        self.btn_save = ttk.Button(self.btn_frame, text="Save & Close", command=self.save_and_close)
+        self.btn_save.pack(side=tk.RIGHT, padx=5)
         
         # Load Data
         self.scan_monitors()
         self.load_hotkeys()
         
     def scan_monitors(self):
-        # We need a list of monitor indices and names
-        # Since scanning takes time, we might show a splash or just block briefly
-        # For UI simple: just call synchronously.
+        """
+        Gets the monitor list from the running tray app, which already knows it (a local query,
+        milliseconds). Without a tray, scans in the background while the window stays usable.
+        """
         try:
-            detected = MonitorManager.get_connected_monitors()
-            self.monitors = [f"Monitor {m['id']} ({m['name']})" for m in detected]
-        except Exception:
+            response = send_request({'cmd': 'status'}, timeout=2.0)
+            if not response.get('ok'):
+                raise RuntimeError(response.get('error'))
+        except Exception as e:
+            self.start_background_scan(e)
+            return
+        self.set_monitors(response['monitors'])
+
+    def start_background_scan(self, reason):
+        logging.info(f"Monitor list not available from the tray ({reason}); scanning")
+        self.monitors = ["Scanning monitors..."]
+        self.btn_save.config(state="disabled")
+        self.scan_frame.pack(before=self.canvas, pady=(0, 10))
+        self.scan_progress.start(10)
+        
+        def scan():
+            # Identification only (lazy): names and uids need no DDC traffic
+            try:
+                detected = MonitorManager.get_connected_monitors(lazy=True)
+            except Exception as e:
+                logging.error(f"Monitor scan failed: {e}")
+                detected = None
+            self.root.after(0, lambda: self.finish_background_scan(detected))
+        
+        threading.Thread(target=scan, name="settings-scan", daemon=True).start()
+
+    def finish_background_scan(self, detected):
+        self.scan_progress.stop()
+        self.scan_frame.pack_forget()
+        self.btn_save.config(state="normal")
+        self.set_monitors(detected)
+        # Rows loaded meanwhile showed the placeholder; select their monitors now
+        for row in self.row_frames:
+            row["mon"].config(state="readonly")
+            self.select_monitor(row["mon"], row["mon_idx"], row["uid"])
+
+    def set_monitors(self, detected):
+        if detected is None:
             self.monitors = ["Monitor 0 (Generic)", "Monitor 1 (Generic)"]
+            self.monitor_uids = []
+            self.monitor_ids = [0, 1]
+        else:
+            self.monitors = [f"Monitor {m['id']} ({m['name']})" for m in detected]
+            self.monitor_uids = [m.get('uid') for m in detected]
+            self.monitor_ids = [m['id'] for m in detected]
             
         if not self.monitors:
              self.monitors = ["Monitor 0", "Monitor 1", "Monitor 2"]
+             self.monitor_ids = [0, 1, 2]
 
     def load_hotkeys(self):
         config_path = os.path.join(os.getcwd(), "hotkeys.json")
@@ -82,7 +138,11 @@ class SettingsUI:
             self.hotkeys = {}
             
         for key, action in self.hotkeys.items():
-            self.add_row(key, action.get("monitor_idx", 0), action.get("source", "HDMI-1"))
+            # Scene bindings aren't editable here; keep them as-is when saving
+            if "scene" in action:
+                self.scene_bindings[key] = action
+                continue
+            self.add_row(key, action.get("monitor_idx", 0), action.get("source", "HDMI-1"), action.get("monitor"))
 
     def start_recording(self, entry, btn):
         if self.listening: return
@@ -202,7 +262,7 @@ class SettingsUI:
             self.current_pressed = set()
             self.current_recording_entry = None
 
-    def add_row(self, key="", mon_idx=0, source="HDMI-1"):
+    def add_row(self, key="", mon_idx=0, source="HDMI-1", uid=None):
         row_frame = ttk.Frame(self.scrollable_frame)
         row_frame.pack(fill=tk.X, pady=2)
         
@@ -218,15 +278,11 @@ class SettingsUI:
         
         # Monitor Combo
         cb_mon = ttk.Combobox(row_frame, values=self.monitors, state="readonly", width=20)
-        # Set selection
-        try:
-            if mon_idx < len(self.monitors):
-                cb_mon.current(mon_idx)
-            else:
-                cb_mon.current(0)
-        except:
-             cb_mon.current(0)
-             
+        self.select_monitor(cb_mon, mon_idx, uid)
+        cb_mon.bind("<<ComboboxSelected>>", lambda e: self.monitor_picked(row_frame))
+        if str(self.btn_save.cget("state")) == "disabled":
+            # Monitors still being scanned; selected once they are known
+            cb_mon.config(state="disabled")
         cb_mon.pack(side=tk.LEFT, padx=2)
         
         # Input Source Combo
@@ -250,26 +306,55 @@ class SettingsUI:
             "key": ent_key,
             "btn": btn_rec,
             "mon": cb_mon,
-            "src": cb_src
+            "src": cb_src,
+            "mon_idx": mon_idx,
+            "uid": uid,
+            # Loaded bindings are saved unchanged unless the user picks another monitor;
+            # new rows save whatever is shown
+            "picked": not key
         })
 
+    def select_monitor(self, cb_mon, mon_idx, uid):
+        # Set selection: the monitor with this uid, wherever it enumerated now
+        if not self.monitor_ids:
+            # Still scanning: only the placeholder to show
+            cb_mon.config(values=self.monitors)
+            cb_mon.current(0)
+            return
+        values = list(self.monitors)
+        if uid is not None and uid in self.monitor_uids:
+            pos = self.monitor_uids.index(uid)
+        elif uid is None and mon_idx in self.monitor_ids:
+            pos = self.monitor_ids.index(mon_idx)
+        else:
+            # Not connected right now: show the binding as-is rather than a stand-in monitor
+            values.append(f"{uid} (offline)" if uid is not None else f"Monitor {mon_idx} (offline)")
+            pos = len(values) - 1
+        cb_mon.config(values=values)
+        cb_mon.current(pos)
+
+    def monitor_picked(self, frame):
+        for row in self.row_frames:
+            if row["frame"] == frame:
+                row["picked"] = True
+
     def delete_row(self, frame):
         frame.destroy()
         self.row_frames = [r for r in self.row_frames if r["frame"] != frame]
 
     def save_and_close(self):
-        new_config = {}
+        new_config = dict(self.scene_bindings)
         
         for row in self.row_frames:
             key = row["key"].get().strip()
             if not key: continue
             
-            mon_str = row["mon"].get() # "Monitor 0 (Name)"
-            # Extract index
-            try:
-                mon_idx = int(mon_str.split()[1])
-            except:
-                mon_idx = 0
+            mon_idx, uid = row["mon_idx"], row["uid"]
+            pos = row["mon"].current()
+            if row["picked"] and 0 <= pos < len(self.monitor_ids):
+                mon_idx = self.monitor_ids[pos]
+                uid = self.monitor_uids[pos] if pos < len(self.monitor_uids) else None
+            # (The "(offline)" entry is past the scanned monitors and keeps the binding as loaded)
             
             src = row["src"].get()
             
@@ -277,12 +362,15 @@ class SettingsUI:
                 "monitor_idx": mon_idx,
                 "source": src
             }
+            # The uid keeps the binding on the same monitor if the scan order changes
+            if uid:
+                new_config[key]["monitor"] = uid
             
         # Write
         try:
-            with open("hotkeys.json", "w") as f:
-                json.dump(new_config, f, indent=4)
-            messagebox.showinfo("Saved", "Configuration saved!\n\nPlease select 'Reload Hotkeys' in the System Tray to apply changes.")
+            # Write-then-rename, so the running tray never reloads a half-written file
+            atomic_write("hotkeys.json", json.dumps(new_config, indent=4))
+            messagebox.showinfo("Saved", "Configuration saved!\n\nThe running tray app picks up the changes automatically.")
             self.root.destroy()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save: {e}")
@@ -0,0 +1,112 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SWITCHES_COALESCED = REGISTRY.counter("kvm_switches_coalesced",
+                                      "Switch requests dropped because a newer one for the same monitor arrived",
+                                      ("monitor",))
+
+
+class _Slot:
+    def __init__(self):
+        self.pending: Optional[Dict] = None  # Latest request not yet started
+        self.worker: Optional[threading.Thread] = None
+
+
+class SwitchQueue:
+    """
+    Per-monitor command queue for input switches, latest intent wins.
+
+    Each monitor has at most one request executing and one waiting. A new request for a
+    monitor replaces the waiting one, so a burst of hotkey presses costs at most two
+    switches per monitor, and a worker thread exists only while its monitor has work.
+    Requests for different monitors run in parallel.
+
+    on_done(result) receives {'monitor_obj', 'source', 'ok', 'error', 'elapsed', 'coalesced',
+    'superseded'}: 'coalesced' lists the sources this request replaced; a replaced request
+    gets 'superseded': True instead of being executed.
+    """
+    def __init__(self, switch: Callable, key_for: Callable[[object], str]):
+        """
+        switch(monitor, source_value, on_verified=None) performs one switch (may raise).
+        key_for(monitor) returns the monitor's queue key (its bus key).
+        """
+        self.switch = switch
+        self.key_for = key_for
+        self._lock = threading.Lock()
+        self._slots: Dict[str, _Slot] = {}
+
+    def submit(self, monitor, source_value: int, on_done: Optional[Callable[[Dict], None]] = None,
+               on_verified: Optional[Callable] = None):
+        """
+        Queues a switch and returns immediately.
+        """
+        key = self.key_for(monitor)
+        request = {
+            'monitor_obj': monitor,
+            'source': source_value,
+            'on_done': on_done,
+            'on_verified': on_verified,
+            'coalesced': [],
+        }
+        superseded = None
+        with self._lock:
+            slot = self._slots.setdefault(key, _Slot())
+            if slot.pending is not None:
+                superseded = slot.pending
+                request['coalesced'] = superseded['coalesced'] + [superseded['source']]
+            slot.pending = request
+            if slot.worker is None:
+                slot.worker = threading.Thread(target=self._run, args=(key, slot), name=f"kvm-switch-{key}", daemon=True)
+                slot.worker.start()
+
+        if superseded is not None:
+            SWITCHES_COALESCED.inc(monitor=key)
+            logger.info(f"Switch to 0x{superseded['source']:02X} on {key} superseded by 0x{source_value:02X}")
+            self._finish(superseded, {'ok': False, 'error': f"superseded by 0x{source_value:02X}",
+                                      'elapsed': 0.0, 'superseded': True})
+
+    def _run(self, key: str, slot: _Slot):
+        while True:
+            with self._lock:
+                request = slot.pending
+                slot.pending = None
+                if request is None:
+                    # Idle: let the thread go; the next submit starts a new one
+                    slot.worker = None
+                    return
+
+            if request['coalesced']:
+                skipped = ", ".join(f"0x{s:02X}" for s in request['coalesced'])
+                logger.info(f"Switching {key} to 0x{request['source']:02X} (coalesced: {skipped})")
+
+            start = time.monotonic()
+            error = None
+            try:
+                self.switch(request['monitor_obj'], request['source'], on_verified=request['on_verified'])
+            except Exception as e:
+                error = str(e)
+            self._finish(request, {'ok': error is None, 'error': error,
+                                   'elapsed': time.monotonic() - start, 'superseded': False})
+
+    @staticmethod
+    def _finish(request: Dict, outcome: Dict):
+        on_done = request['on_done']
+        if on_done is None:
+            return
+        result = {
+            'monitor_obj': request['monitor_obj'],
+            'source': request['source'],
+            'coalesced': list(request['coalesced']),
+        }
+        result.update(outcome)
+        try:
+            on_done(result)
+        except Exception as e:
+            logger.error(f"Switch callback failed: {e}")
+
@@ -0,0 +1,173 @@
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from app_paths import atomic_write, cache_file
+
+logger = logging.getLogger(__name__)
+
+
+class SwitchVerifier:
+    """
+    Confirms input switches in the background.
+
+    After VCP 0x60 is written the monitor re-syncs and often stops answering DDC for a
+    while. The verifier polls the monitor until it reports the new source (or a deadline
+    expires), records how long that took per monitor model, and tells callers when a
+    monitor is expected to be responsive again so follow-up DDC traffic can wait for it.
+    """
+    SETTLE_FILE = "settle_times.json"
+    DEFAULT_SETTLE_TIME = 2.0
+    ALPHA = 0.3  # EWMA weight of the newest measurement
+    FIRST_POLL = 0.1  # No monitor re-syncs faster than this
+
+    def __init__(self, read_source: Callable[[object], Optional[int]], deadline: float = 10.0,
+                 poll_interval: float = 0.25, path: Optional[str] = None,
+                 lock_for: Optional[Callable[[object], object]] = None):
+        """
+        read_source: function(monitor) -> current source or None; must not raise.
+        lock_for: function(monitor) -> the (re-entrant) lock read_source takes, so a read is
+        timed from when the bus is ours rather than from when we started waiting for it.
+        """
+        self.read_source = read_source
+        self.lock_for = lock_for
+        self.deadline = deadline
+        self.poll_interval = poll_interval
+        self.path = path or cache_file(self.SETTLE_FILE)
+        self._lock = threading.Lock()
+        self._settle_times: Dict[str, float] = self._load()
+        # key -> {'target', 'model', 'started', 'done' (Event), 'generation'}
+        self._pending: Dict[str, Dict] = {}
+
+    def start(self, monitor, key: str, model: str, target: int,
+              on_done: Optional[Callable[[bool, Optional[int], float], None]] = None):
+        """
+        Starts verifying a switch of `monitor` to `target`. Returns immediately.
+        on_done(confirmed, last_read_source, elapsed) is called from the verifier thread.
+        A newer switch on the same key supersedes a pending verification.
+        """
+        with self._lock:
+            previous = self._pending.get(key)
+            entry = {
+                'target': target,
+                'model': model,
+                'started': time.monotonic(),
+                'done': threading.Event(),
+                'generation': (previous['generation'] + 1) if previous else 0,
+            }
+            self._pending[key] = entry
+        if previous:
+            previous['done'].set()
+
+        threading.Thread(target=self._verify, args=(monitor, key, entry, on_done),
+                         name=f"kvm-verify-{key}", daemon=True).start()
+
+    def is_settling(self, key: str) -> bool:
+        with self._lock:
+            entry = self._pending.get(key)
+        return entry is not None and not entry['done'].is_set()
+
+    def get_pending_target(self, key: str) -> Optional[int]:
+        with self._lock:
+            entry = self._pending.get(key)
+        return entry['target'] if entry and not entry['done'].is_set() else None
+
+    def wait_settled(self, key: str, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until the monitor behind `key` has confirmed its last switch (or timeout).
+        Returns True if it is settled.
+        """
+        with self._lock:
+            entry = self._pending.get(key)
+        if entry is None:
+            return True
+        return entry['done'].wait(timeout)
+
+    def get_settle_time(self, model: str) -> float:
+        with self._lock:
+            return self._settle_times.get(model, self.DEFAULT_SETTLE_TIME)
+
+    def get_ready_in(self, key: str) -> float:
+        """
+        Seconds until the monitor behind `key` is expected to answer again (0 if it is settled).
+        """
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None or entry['done'].is_set():
+                return 0.0
+            expected = self._settle_times.get(entry['model'], self.DEFAULT_SETTLE_TIME)
+        return max(0.0, entry['started'] + expected - time.monotonic())
+
+    def _verify(self, monitor, key: str, entry: Dict, on_done):
+        # Start polling from a short floor rather than from the learned settle time, or the
+        # learned time could never drop below the first poll; back off up to poll_interval
+        delay = self.FIRST_POLL
+        if entry['done'].wait(delay):
+            return  # Superseded
+
+        confirmed = False
+        current = None
+        elapsed = 0.0
+        while not entry['done'].is_set():
+            with self.lock_for(monitor) if self.lock_for else contextlib.nullcontext():
+                sent = time.monotonic()
+                current = self.read_source(monitor)
+            if current == entry['target']:
+                # The monitor answered the request sent at `sent`; the read itself isn't settle time
+                confirmed = True
+                elapsed = sent - entry['started']
+                break
+            if time.monotonic() - entry['started'] > self.deadline:
+                break
+            delay = min(delay * 2, self.poll_interval)
+            entry['done'].wait(delay)
+
+        superseded = entry['done'].is_set()
+        if not confirmed:
+            elapsed = time.monotonic() - entry['started']
+        with self._lock:
+            if self._pending.get(key) is entry:
+                del self._pending[key]
+            if confirmed:
+                self._record(entry['model'], elapsed)
+        entry['done'].set()
+
+        if superseded:
+            return
+        if confirmed:
+            logger.info(f"Switch to 0x{entry['target']:02X} confirmed on {entry['model']} after {elapsed:.2f}s")
+        else:
+            logger.warning(f"{entry['model']} did not confirm switch to 0x{entry['target']:02X} "
+                           f"within {self.deadline:.0f}s (last read: {current})")
+        if on_done:
+            try:
+                on_done(confirmed, current, elapsed)
+            except Exception as e:
+                logger.error(f"Switch verification callback failed: {e}")
+
+    def _record(self, model: str, elapsed: float):
+        # Caller holds self._lock
+        previous = self._settle_times.get(model)
+        self._settle_times[model] = elapsed if previous is None else (1 - self.ALPHA) * previous + self.ALPHA * elapsed
+        self._save()
+
+    def _load(self) -> Dict[str, float]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            return {str(k): float(v) for k, v in data.items()}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable settle times {self.path}: {e}")
+            return {}
+
+    def _save(self):
+        try:
+            atomic_write(self.path, json.dumps(self._settle_times))
+        except Exception as e:
+            logger.warning(f"Failed to write settle times: {e}")
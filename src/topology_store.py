@@ -0,0 +1,62 @@
+import json
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from app_paths import atomic_write, cache_file
+
+logger = logging.getLogger(__name__)
+
+
+class TopologyStore:
+    """
+    The monitor list of the last scan on disk: identity, name, inputs and last known source.
+
+    The tray loads it at startup so the menu, status queries and hotkey targets are known
+    before the first scan has finished; that scan then confirms or replaces it. Monitor
+    handles can't be persisted, so entries loaded from here have no 'monitor_obj'.
+    """
+    STORE_FILE = "topology.json"
+    VERSION = 1
+    # What is kept of a scan entry
+    FIELDS = ('id', 'uid', 'name', 'bus', 'inputs', 'current_input')
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or cache_file(self.STORE_FILE)
+        self._lock = threading.Lock()
+        self._last: Optional[List[Dict]] = None
+
+    def load(self) -> List[Dict]:
+        """
+        Returns the stored monitors, or [] if there is no usable snapshot.
+        """
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or data.get('version') != self.VERSION:
+                raise ValueError("unknown format")
+            monitors = [{k: m.get(k) for k in self.FIELDS} for m in data['monitors']]
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable topology snapshot {self.path}: {e}")
+            return []
+        with self._lock:
+            self._last = monitors
+        return [dict(m) for m in monitors]
+
+    def save(self, monitors: List[Dict]) -> bool:
+        """
+        Stores the monitors if they differ from what is on disk. Returns True if it wrote.
+        """
+        monitors = [{k: m.get(k) for k in self.FIELDS} for m in monitors]
+        with self._lock:
+            if monitors == self._last:
+                return False
+            try:
+                atomic_write(self.path, json.dumps({'version': self.VERSION, 'monitors': monitors}))
+            except Exception as e:
+                logger.warning(f"Failed to write topology snapshot: {e}")
+                return False
+            self._last = monitors
+        return True